@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from vnnlib.aio import iter_commands_async, parse_file_async, read_vnnlib_simple_async
+from vnnlib.compat import FactoredResult, read_vnnlib_simple
+from vnnlib.errors import LimitExceededError, ParserError
+from vnnlib.limits import Limits
+from vnnlib.parser import parse_file
+
+
+@pytest.fixture
+def vnnlib_path(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        for i in range(1000):
+            f.write(f"(declare-const X_{i} Real)\n")
+        f.write("(declare-const Y_0 Real)\n")
+        for i in range(1000):
+            f.write(f"(assert (>= X_{i} 0.0))\n(assert (<= X_{i} 1.0))\n")
+        f.write("(assert (>= Y_0 0.5))\n")
+    return vnnlib_path
+
+
+def test_parse_file_async(vnnlib_path):
+    async def main():
+        with ThreadPoolExecutor(2) as executor:
+            return await asyncio.gather(
+                parse_file_async(vnnlib_path),
+                parse_file_async(vnnlib_path, executor=executor),
+            )
+
+    results = asyncio.run(main())
+    expected = parse_file(vnnlib_path)
+    assert results[0] == expected
+    assert results[1] == expected
+
+
+def test_read_vnnlib_simple_async(vnnlib_path):
+    result = asyncio.run(read_vnnlib_simple_async(vnnlib_path, 1000, 1))
+    expected = read_vnnlib_simple(vnnlib_path, 1000, 1)
+    assert result[0][0] == expected[0][0]
+    assert len(result[0][1]) == len(expected[0][1])
+
+
+def test_iter_commands_async(vnnlib_path):
+    async def main():
+        return [command async for command in iter_commands_async(vnnlib_path)]
+
+    assert tuple(asyncio.run(main())) == parse_file(vnnlib_path).commands
+
+
+def test_iter_commands_async_error(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write("(declare-const X_0 Real)\n(assert (>= X_1 0))\n")
+
+    async def main():
+        commands = []
+        with pytest.raises(ParserError):
+            async for command in iter_commands_async(vnnlib_path):
+                commands.append(command)
+        return commands
+
+    assert len(asyncio.run(main())) == 1
+
+
+def test_read_vnnlib_simple_async_options(vnnlib_path):
+    result = asyncio.run(
+        read_vnnlib_simple_async(vnnlib_path, 1000, 1, simplify=True, factored=True)
+    )
+    assert isinstance(result, FactoredResult)
+    with pytest.raises(LimitExceededError):
+        asyncio.run(
+            read_vnnlib_simple_async(vnnlib_path, 1000, 1, limits=Limits(max_bytes=10))
+        )
+
+
+def test_cancel(vnnlib_path, monkeypatch):
+    started = threading.Event()
+    stopped = threading.Event()
+    check = Limits.check
+
+    def slow_check(limits):
+        started.set()
+        deadline = time.perf_counter() + 5
+        while not limits.cancel_token.cancelled:
+            assert time.perf_counter() < deadline
+            time.sleep(0.01)
+        try:
+            check(limits)
+        finally:
+            stopped.set()
+
+    monkeypatch.setattr(Limits, "check", slow_check)
+
+    async def main():
+        task = asyncio.ensure_future(parse_file_async(vnnlib_path))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert stopped.wait(5)
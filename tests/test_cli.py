@@ -43,3 +43,84 @@ def test_unsupported_output_format(tmp_path):
         match="Currently only the VNN-COMP-1 output format is supported",
     ):
         _ = main([str(vnnlib_path), "-o", str(out_path)])
+
+
+def test_stats_and_profile(tmp_path, capsys):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n(declare-const Y_0 Real)\n(assert (>= X_0 -1))\n(assert (<= X_0 1))\n(assert (<= Y_0 -1))\n"
+        )
+    profile_path = tmp_path / "out.prof"
+    collapsed_path = tmp_path / "out.txt"
+
+    result = main(
+        [
+            str(vnnlib_path),
+            "--compat",
+            "--stats",
+            "--repeat",
+            "2",
+            "--profile",
+            str(profile_path),
+            "--profile-collapsed",
+            str(collapsed_path),
+        ]
+    )
+    assert result is None
+
+    output = capsys.readouterr().out
+    for phase in ("read", "decompress", "parse", "transform", "result", "total"):
+        assert f"\n{phase} " in output
+    assert "runs: 2" in output
+    assert "declared symbols: 2" in output
+
+    assert profile_path.stat().st_size > 0
+    with open(collapsed_path) as f:
+        lines = f.read().splitlines()
+    assert any("parse_file" in line for line in lines)
+    for line in lines:
+        stack, microseconds = line.rsplit(" ", 1)
+        assert int(microseconds) > 0
+
+
+def test_invalid_repeat(tmp_path):
+    with pytest.raises(SystemExit):
+        _ = main([str(tmp_path / "test.vnnlib"), "--compat", "--repeat", "0"])
+
+
+def test_check(tmp_path, capsys):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n(declare-const Y_0 Real)\n(assert (>= X_0 -1))\n(assert (<= X_0 1))\n(assert (<= Y_0 -1))\n"
+        )
+    counterexample_path = tmp_path / "cex.txt"
+    with open(counterexample_path, "w+") as f:
+        f.write("((X_0 0.5)\n (Y_0 -2.0))\n")
+
+    result = main([str(vnnlib_path), "--check", str(counterexample_path)])
+    assert result is None
+    assert "counterexample satisfies the spec" in capsys.readouterr().out
+
+    with open(counterexample_path, "w+") as f:
+        f.write("((X_0 0.5)\n (Y_0 0.0))\n")
+    with pytest.raises(SystemExit) as e:
+        main([str(vnnlib_path), "--check", str(counterexample_path)])
+    assert e.value.code == 1
+    assert "does not satisfy" in capsys.readouterr().out
+
+    with open(counterexample_path, "w+") as f:
+        f.write("((X_0 0.5))\n")
+    with pytest.raises(VnnLibError, match="no value for variable 'Y_0'"):
+        main([str(vnnlib_path), "--check", str(counterexample_path)])
+
+
+def test_spec_named_check(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open("check", "w+"):
+        pass
+
+    # check is an ordinary file name, whether or not the file exists
+    with pytest.raises(VnnLibError, match="Unsupported file type"):
+        _ = main(["check", "--compat"])
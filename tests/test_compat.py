@@ -1,6 +1,18 @@
+import bz2
+import gzip
+import lzma
+
+import numpy as np
 import pytest
 
-from vnnlib.compat import CompatTransformer, read_vnnlib_simple
+from vnnlib import compat
+from vnnlib.compat import (
+    CompatTransformer,
+    get_input_output_shapes,
+    get_num_inputs_outputs,
+    read_vnnlib_simple,
+)
+from vnnlib.errors import ParserError
 from vnnlib.parser import parse_file
 
 
@@ -428,3 +440,290 @@ def test_mul_vars(tmp_path):
 
     with pytest.raises(NotImplementedError):
         _ = read_vnnlib_simple(vnnlib_path, 1, 1)
+
+
+def test_stacked(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(declare-const Y_1 Real)\n"
+            "(declare-const Y_2 Real)\n"
+            "(assert (>= X_0 0))\n"
+            "(assert (<= X_0 1))\n"
+            "(assert (or\n"
+            "    (and (>= Y_1 Y_0))\n"
+            "    (and (>= Y_2 Y_0))\n"
+            "    (and (>= Y_1 Y_0) (>= Y_2 Y_0))\n"
+            "))\n"
+        )
+
+    legacy = read_vnnlib_simple(vnnlib_path, 1, 3)
+    stacked = read_vnnlib_simple(vnnlib_path, 1, 3, stacked=True)
+    assert len(stacked) == len(legacy) == 1
+    assert stacked[0][0] == legacy[0][0] == [[0, 1]]
+    assert len(stacked[0][1]) == 2
+
+    mat, rhs = stacked[0][1][0]
+    assert mat.shape == (2, 1, 3)
+    assert rhs.shape == (2, 1, 1)
+    assert np.array_equal(mat, np.stack([m for m, _ in legacy[0][1][:2]]))
+    assert np.array_equal(rhs, np.stack([r for _, r in legacy[0][1][:2]]))
+
+    mat, rhs = stacked[0][1][1]
+    assert mat.shape == (1, 2, 3)
+    assert rhs.shape == (1, 2, 1)
+    assert np.array_equal(mat[0], legacy[0][1][2][0])
+    assert np.array_equal(rhs[0], legacy[0][1][2][1])
+
+
+def test_stacked_empty_polytope(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(assert (or (and (>= X_0 0) (<= X_0 1)) (and (>= X_0 2) (<= X_0 3))))\n"
+        )
+
+    result = read_vnnlib_simple(vnnlib_path, 1, 1, stacked=True)
+    assert [box for box, _ in result] == [[[0, 1]], [[2, 3]]]
+    for _, polytopes in result:
+        ((mat, rhs),) = polytopes
+        assert mat.shape == (1, 0, 1)
+        assert rhs.shape == (1, 0, 1)
+
+
+def _write_image_spec(vnnlib_path):
+    with open(vnnlib_path, "w+") as f:
+        for c in range(2):
+            for h in range(2):
+                for w in range(3):
+                    f.write(f"(declare-const X_{c}_{h}_{w} Real)\n")
+        f.write("(declare-const Y_0_0 Real)\n(declare-const Y_0_1 Real)\n")
+        for c in range(2):
+            for h in range(2):
+                for w in range(3):
+                    value = 100 * c + 10 * h + w
+                    f.write(f"(assert (>= X_{c}_{h}_{w} {value}))\n")
+                    f.write(f"(assert (<= X_{c}_{h}_{w} {value + 1}))\n")
+        f.write("(assert (>= Y_0_1 Y_0_0))\n")
+
+
+def test_multi_index(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    _write_image_spec(vnnlib_path)
+
+    transformer = CompatTransformer("X", "Y")
+    result = transformer.transform(parse_file(vnnlib_path))
+    assert transformer.input_size == 12
+    assert transformer.output_size == 2
+    ((box, ((mat, rhs),)),) = result
+    lower = [100 * c + 10 * h + w for c in range(2) for h in range(2) for w in range(3)]
+    assert box == [[value, value + 1] for value in lower]
+    assert mat.tolist() == [[1, -1]]
+    assert rhs.tolist() == [[0]]
+
+
+def test_shaped(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    _write_image_spec(vnnlib_path)
+
+    ((box, polytopes),) = read_vnnlib_simple(vnnlib_path, 12, 2, shaped=True)
+    assert box.shape == (2, 2, 2, 3)
+    assert box[0, 1, 0, 2] == 102
+    assert box[1, 1, 0, 2] == 103
+    expected = np.array(read_vnnlib_simple(vnnlib_path, 12, 2)[0][0])
+    assert np.array_equal(box.reshape(2, -1).T, expected)
+
+    ((box, _),) = read_vnnlib_simple(
+        vnnlib_path, 12, 2, input_shape=(2, 6), shaped=True
+    )
+    assert box.shape == (2, 2, 6)
+    assert box[0, 1, 2] == 102
+
+
+def test_shaped_disjuncts(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        for i in range(2):
+            for j in range(2):
+                f.write(f"(declare-const X_{i}_{j} Real)\n")
+        f.write("(declare-const Y_0_0 Real)\n(declare-const Y_0_1 Real)\n")
+        f.write("(declare-const Y_1_0 Real)\n(declare-const Y_1_1 Real)\n")
+        f.write("(assert (>= X_0_0 0.0))\n")
+        f.write("(assert (or (and (<= X_1_1 1.0)) (and (<= X_1_1 2.0))))\n")
+        f.write("(assert (<= Y_0_1 Y_1_0))\n")
+
+    result = read_vnnlib_simple(vnnlib_path, 4, 4, shaped=True)
+    assert [box[:, 1, 1].tolist() for box, _ in result] == [
+        [-np.inf, 1.0],
+        [-np.inf, 2.0],
+    ]
+    for box, _ in result:
+        assert box[0, 0, 0] == 0.0
+        # the bounds are written in place, so the box is not copied when reshaped
+        assert not box.flags.owndata
+
+    (_, ((mat, _),)), _ = read_vnnlib_simple(vnnlib_path, 4, 4)
+    assert mat.tolist() == [[0, 1, -1, 0]]
+    (_, ((mat, _),)), _ = read_vnnlib_simple(vnnlib_path, 4, 6, output_shape=(2, 3))
+    assert mat.tolist() == [[0, 1, 0, -1, 0, 0]]
+
+
+def test_shaped_flat_names(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        for i in range(6):
+            f.write(f"(declare-const X_{i} Real)\n(assert (<= X_{i} {i}))\n")
+
+    ((box, _),) = read_vnnlib_simple(vnnlib_path, 6, 0, input_shape=(2, 3), shaped=True)
+    assert box.shape == (2, 2, 3)
+    assert np.all(np.isneginf(box[0]))
+    assert box[1].tolist() == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_inconsistent_indices(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write("(declare-const X_0 Real)\n(declare-const X_0_1 Real)\n")
+
+    with pytest.raises(RuntimeError):
+        CompatTransformer("X", "Y").transform(parse_file(vnnlib_path))
+
+
+def test_get_num_inputs_outputs(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    _write_image_spec(vnnlib_path)
+
+    assert get_num_inputs_outputs(vnnlib_path) == (12, 2)
+    assert get_input_output_shapes(vnnlib_path) == ((2, 2, 3), (1, 2))
+
+
+@pytest.mark.parametrize("suffix", ["", ".gz", ".bz2", ".xz"])
+def test_get_num_inputs_outputs_large(tmp_path, monkeypatch, suffix):
+    monkeypatch.setattr(compat, "_CHUNK_SIZE", 7)
+    text = "".join(
+        [
+            "; a comment (declare-const Y_99 Real)\n",
+            *(f"(declare-const\n  X_{i} Real)\n" for i in range(50)),
+            "(declare-const Y_0 Real) (declare-const Y_1 Real)\n",
+            "(assert (<= X_0 1.0))\n",
+            "(declare-const Y_2 Real)\n",
+        ]
+    )
+    vnnlib_path = tmp_path / f"test.vnnlib{suffix}"
+    open_func = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}.get(suffix, open)
+    with open_func(vnnlib_path, "wt") as f:
+        f.write(text)
+
+    assert get_num_inputs_outputs(vnnlib_path) == (50, 2)
+    assert get_num_inputs_outputs(vnnlib_path, early_stop=False) == (50, 3)
+
+
+def test_get_num_inputs_outputs_invalid(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write("(declare-const X_0 Real)\n(declare-const X_1)\n")
+
+    with pytest.raises(ParserError):
+        get_num_inputs_outputs(vnnlib_path)
+
+
+def _write_common_rows_spec(vnnlib_path):
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(declare-const Y_1 Real)\n"
+            "(assert (>= X_0 0))\n"
+            "(assert (<= Y_0 1))\n"
+            "(assert (<= Y_1 5))\n"
+            "(assert (or\n"
+            "    (and (<= Y_1 0))\n"
+            "    (and (<= Y_0 Y_1) (>= Y_0 3))\n"
+            "    (and (<= X_0 1) (<= Y_1 2))\n"
+            "))\n"
+        )
+
+
+def test_common_and_disjunct_rows(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    _write_common_rows_spec(vnnlib_path)
+
+    result = read_vnnlib_simple(vnnlib_path, 1, 2)
+    assert [box for box, _ in result] == [[[0, float("inf")]], [[0, 1]]]
+    (mat_1, rhs_1), (mat_2, rhs_2) = result[0][1]
+    assert mat_1.tolist() == [[1, 0], [0, 1], [0, 1]]
+    assert rhs_1.tolist() == [[1], [5], [0]]
+    assert mat_2.tolist() == [[1, 0], [0, 1], [1, -1], [-1, 0]]
+    assert rhs_2.tolist() == [[1], [5], [0], [-3]]
+    ((mat_3, rhs_3),) = result[1][1]
+    assert mat_3.tolist() == [[1, 0], [0, 1], [0, 1]]
+    assert rhs_3.tolist() == [[1], [5], [2]]
+
+
+def test_disjunct_rows_after_common_rows(tmp_path):
+    # regression test: the rows of each disjunct used to overwrite the common
+    # rows instead of being appended after them, so both disjuncts were read as
+    # ([[1, -1]], [[0]]), and the disjunction was lost
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(declare-const Y_1 Real)\n"
+            "(assert (>= X_0 0.0))\n"
+            "(assert (<= X_0 1.0))\n"
+            "(assert (<= Y_0 Y_1))\n"
+            "(assert (or (and (<= Y_0 0.5)) (and (>= Y_1 2.0))))\n"
+        )
+
+    ((box, ((mat_1, rhs_1), (mat_2, rhs_2))),) = read_vnnlib_simple(vnnlib_path, 1, 2)
+    assert box == [[0.0, 1.0]]
+    assert mat_1.tolist() == [[1, -1], [1, 0]]
+    assert rhs_1.tolist() == [[0], [0.5]]
+    assert mat_2.tolist() == [[1, -1], [0, -1]]
+    assert rhs_2.tolist() == [[0], [-2.0]]
+
+
+def test_factored(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    _write_common_rows_spec(vnnlib_path)
+
+    factored = read_vnnlib_simple(vnnlib_path, 1, 2, factored=True)
+    common_mat, common_rhs = factored.common
+    assert common_mat.tolist() == [[1, 0], [0, 1]]
+    assert common_rhs.tolist() == [[1], [5]]
+    (mat, rhs), _ = factored.polytopes[0][1]
+    assert mat.tolist() == [[0, 1]]
+    assert rhs.tolist() == [[0]]
+
+    legacy = read_vnnlib_simple(vnnlib_path, 1, 2)
+    expanded = factored.to_legacy()
+    assert [box for box, _ in expanded] == [box for box, _ in legacy]
+    for (_, polytopes), (_, legacy_polytopes) in zip(expanded, legacy):
+        for (mat, rhs), (legacy_mat, legacy_rhs) in zip(polytopes, legacy_polytopes):
+            assert np.array_equal(mat, legacy_mat)
+            assert np.array_equal(rhs, legacy_rhs)
+
+
+def test_factored_empty_polytope(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write("(declare-const X_0 Real)\n(assert (<= X_0 1))\n")
+
+    factored = read_vnnlib_simple(vnnlib_path, 1, 1, factored=True)
+    assert factored.common[0].shape == (0, 1)
+    ((box, ((mat, rhs),)),) = factored.polytopes
+    assert mat.shape == (0, 1)
+    assert rhs.shape == (0, 1)
+    ((legacy_box, ((legacy_mat, legacy_rhs),)),) = read_vnnlib_simple(vnnlib_path, 1, 1)
+    ((expanded_box, ((expanded_mat, expanded_rhs),)),) = factored.to_legacy()
+    assert expanded_box == legacy_box
+    assert expanded_mat.shape == legacy_mat.shape
+    assert expanded_rhs.shape == legacy_rhs.shape
+
+    with pytest.raises(ValueError):
+        CompatTransformer("X", "Y", stacked=True, factored=True)
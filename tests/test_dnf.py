@@ -0,0 +1,110 @@
+import itertools
+
+import pytest
+
+from vnnlib.dnf import count_clauses, iter_dnf
+from vnnlib.errors import ClauseLimitError
+from vnnlib.parser import CORE_IDS, FunctionApplication, Identifier, Sort, parse_file
+
+
+def _clause_strs(clauses):
+    def term_str(term):
+        if isinstance(term, FunctionApplication):
+            args = " ".join(term_str(t) for t in term.terms)
+            return f"({term.function.value} {args})"
+        return str(term.value)
+
+    return [tuple(term_str(literal) for literal in clause) for clause in clauses]
+
+
+def test_script_dnf(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(assert (>= X_0 0))\n"
+            "(assert (or (<= Y_0 0) (and (>= Y_0 1) (<= Y_0 2))))\n"
+        )
+
+    script = parse_file(vnnlib_path)
+    assert count_clauses(script) == 2
+    assert _clause_strs(iter_dnf(script)) == [
+        ("(>= X_0 0)", "(<= Y_0 0)"),
+        ("(>= X_0 0)", "(>= Y_0 1)", "(<= Y_0 2)"),
+    ]
+
+
+def test_negation(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const x Real)\n"
+            "(declare-const y Real)\n"
+            "(assert (not (and (>= x 0) (or (>= y 0) (not (<= y 2))))))\n"
+            "(assert (=> (>= x 1) (>= y 1)))\n"
+        )
+
+    script = parse_file(vnnlib_path)
+    assert count_clauses(script) == 4
+    assert _clause_strs(iter_dnf(script)) == [
+        ("(not (>= x 0))", "(not (>= x 1))"),
+        ("(not (>= x 0))", "(>= y 1)"),
+        ("(not (>= y 0))", "(<= y 2)", "(not (>= x 1))"),
+        ("(not (>= y 0))", "(<= y 2)", "(>= y 1)"),
+    ]
+
+
+def test_constants_ite_and_xor(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const x Real)\n"
+            "(assert (or false (ite (>= x 0) (<= x 1) (>= x -1))))\n"
+            "(assert (xor (>= x 0) true))\n"
+        )
+
+    script = parse_file(vnnlib_path)
+    clauses = list(iter_dnf(script))
+    assert len(clauses) <= count_clauses(script)
+    assert _clause_strs(clauses) == [
+        ("(>= x 0)", "(<= x 1)", "(not (>= x 0))"),
+        ("(not (>= x 0))", "(>= x -1.0)", "(not (>= x 0))"),
+    ]
+
+
+def test_count_without_expansion():
+    term = CORE_IDS["true"]
+    for i in range(64):
+        atom = FunctionApplication(CORE_IDS[">="], Identifier(f"x{i}", Sort("Real")))
+        term = FunctionApplication(
+            CORE_IDS["and"],
+            term,
+            FunctionApplication(CORE_IDS["or"], atom, atom),
+        )
+    assert count_clauses(term) == 2**64
+
+    clauses = iter_dnf(term, max_clauses=2**64)
+    assert len(list(itertools.islice(clauses, 10))) == 10
+
+    with pytest.raises(ClauseLimitError, match="more than the limit of 1000"):
+        _ = iter_dnf(term, max_clauses=1000)
+
+
+def test_long_conjunction(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        for i in range(1500):
+            f.write(f"(declare-const X_{i} Real)\n")
+        f.write("(declare-const Y_0 Real)\n(declare-const Y_1 Real)\n")
+        for i in range(1500):
+            f.write(f"(assert (>= X_{i} 0))\n(assert (<= X_{i} 1))\n")
+        f.write("(assert (or (<= Y_0 0) (<= Y_1 0)))\n")
+
+    clauses = list(iter_dnf(parse_file(vnnlib_path)))
+    assert len(clauses) == 2
+    assert [len(clause) for clause in clauses] == [3001, 3001]
+    assert _clause_strs([clauses[0][:2] + clauses[0][-1:]]) == [
+        ("(>= X_0 0)", "(<= X_0 1)", "(<= Y_0 0)")
+    ]
+    assert _clause_strs([clauses[1][-1:]]) == [("(<= Y_1 0)",)]
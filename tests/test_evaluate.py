@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+from vnnlib.evaluate import (
+    EvaluatorTransformer,
+    read_counterexample,
+    read_vnnlib_evaluator,
+)
+from vnnlib.parser import (
+    CORE_IDS,
+    Assert,
+    Constant,
+    FunctionApplication,
+    Identifier,
+    Script,
+    Sort,
+    VnnLibParser,
+)
+
+HEADER = (
+    "(declare-const X_0 Real)\n"
+    "(declare-const X_1 Real)\n"
+    "(declare-const Y_0 Real)\n"
+    "(declare-const Y_1 Real)\n"
+)
+
+
+def _compile(spec: str):
+    ast_node = VnnLibParser.parse(HEADER + spec, strict=False)
+    return EvaluatorTransformer().transform(ast_node)
+
+
+def test_box_and_disjunction(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            HEADER + "(assert (>= X_0 0.0))\n"
+            "(assert (<= X_0 1.0))\n"
+            "(assert (<= -1.0 X_1 1.0))\n"
+            "(assert (or (and (>= Y_0 Y_1)) (and (<= Y_1 -1.0))))\n"
+        )
+
+    evaluator = read_vnnlib_evaluator(vnnlib_path)
+    assert evaluator.num_inputs == 2
+    assert evaluator.num_outputs == 2
+    x = np.array([[0.5, 0.0], [0.5, 0.0], [0.5, 0.0], [2.0, 0.0], [0.5, -2.0]])
+    y = np.array([[1.0, 0.0], [0.0, 1.0], [0.0, -2.0], [1.0, 0.0], [1.0, 0.0]])
+    mask = evaluator(x, y)
+    assert mask.shape == (5,)
+    assert mask.tolist() == [True, False, True, False, False]
+    assert evaluator(x[0], y[0]).tolist() == [True]
+
+
+def test_arithmetic_and_connectives():
+    evaluator = _compile(
+        "(assert (=> (> X_0 0.0) (< (+ (* 2.0 X_0) (- X_1) (/ Y_0 4.0)) 1.0)))\n"
+        "(assert (xor (= Y_1 0.0) (not (= (ite (> X_1 0.0) Y_0 (- Y_0)) 1.0))))\n"
+    )
+    rng = np.random.default_rng(0)
+    x = rng.integers(-2, 3, size=(1000, 2)).astype(float)
+    y = rng.integers(-2, 3, size=(1000, 2)).astype(float)
+    expected = [
+        (not x0 > 0 or 2 * x0 - x1 + y0 / 4 < 1)
+        and ((y1 == 0) != (not (y0 if x1 > 0 else -y0) == 1))
+        for (x0, x1), (y0, y1) in zip(x, y)
+    ]
+    assert evaluator(x, y).tolist() == expected
+
+
+def test_constant_folding():
+    evaluator = _compile("(assert (< (+ 1.0 2.0) 4.0))\n(assert (<= Y_0 X_0))\n")
+    assert evaluator(
+        np.zeros((3, 2)), np.array([[-1, 0], [0, 0], [1, 0]])
+    ).tolist() == [
+        True,
+        True,
+        False,
+    ]
+    evaluator = _compile("(assert (> (+ 1.0 2.0) 4.0))\n(assert (<= Y_0 X_0))\n")
+    assert not evaluator(np.zeros((3, 2)), np.zeros((3, 2))).any()
+
+
+def test_multi_index():
+    ast_node = VnnLibParser.parse(
+        "".join(f"(declare-const X_{i}_{j} Real)\n" for i in range(2) for j in range(3))
+        + "(declare-const Y_0 Real)\n"
+        "(assert (<= X_1_2 X_0_1))\n",
+        strict=False,
+    )
+    evaluator = EvaluatorTransformer().transform(ast_node)
+    assert evaluator.variables["X_1_2"] == (0, 5)
+    x = np.zeros((2, 2, 3))
+    x[0, 1, 2] = 1.0
+    assert evaluator(x, np.zeros((2, 1))).tolist() == [False, True]
+
+
+def test_wrong_shape():
+    evaluator = _compile("(assert (<= Y_0 X_0))\n")
+    with pytest.raises(ValueError, match="expected 2 values per point in y, got 3"):
+        evaluator(np.zeros((1, 2)), np.zeros((1, 3)))
+    with pytest.raises(ValueError, match="different numbers of points"):
+        evaluator(np.zeros((1, 2)), np.zeros((2, 2)))
+
+
+def test_unknown_identifier():
+    script = Script(
+        Assert(
+            FunctionApplication(
+                CORE_IDS["<="], Identifier("Z_0", Sort("Real")), Constant(0.0)
+            )
+        )
+    )
+    with pytest.raises(NotImplementedError, match="Identifier 'Z_0'"):
+        EvaluatorTransformer().transform(script)
+
+
+def test_counterexample(tmp_path):
+    counterexample_path = tmp_path / "cex.txt"
+    with open(counterexample_path, "w+") as f:
+        f.write("sat\n((X_0 0.5)\n (X_1 -1e-3)\n (Y_0 1.0)\n (Y_1 0.25))\n")
+
+    values = read_counterexample(counterexample_path)
+    assert values == {"X_0": 0.5, "X_1": -1e-3, "Y_0": 1.0, "Y_1": 0.25}
+    evaluator = _compile("(assert (>= Y_0 Y_1))\n(assert (<= X_1 0.0))\n")
+    assert evaluator.check_assignment(values)
+    assert not evaluator.check_assignment({**values, "Y_1": 2.0})
+    del values["Y_1"]
+    with pytest.raises(ValueError, match="no value for variable 'Y_1'"):
+        evaluator.check_assignment(values)
@@ -0,0 +1,71 @@
+import pytest
+
+from vnnlib.errors import ParserError
+from vnnlib.incremental import ParserSession, split_commands
+from vnnlib.parser import VnnLibParser
+
+SPEC = (
+    "; a comment (with parentheses\n"
+    "(declare-const X_0 Real)\n"
+    "(declare-const Y_0 Real)\n"
+    "(assert (>= X_0 0))\n"
+    "(assert (<= X_0 1)) ; another comment)\n"
+    "(assert (<= Y_0 -1))\n"
+)
+
+
+def test_split_commands():
+    text = '(assert (= |a)b| "x("")"))  ; )\n(assert true)'
+    assert [text[start:end] for start, end in split_commands(text)] == [
+        '(assert (= |a)b| "x("")"))',
+        "(assert true)",
+    ]
+
+
+@pytest.mark.parametrize(
+    "text", ["(assert true", "(assert true))", "(assert true) x", '(assert "x)']
+)
+def test_split_commands_errors(text):
+    with pytest.raises(ParserError):
+        _ = split_commands(text)
+
+
+def test_session_reuses_commands():
+    session = ParserSession(strict=False)
+    script, diff = session.update(SPEC)
+    assert script == VnnLibParser.parse(SPEC, strict=False)
+    assert diff.added == [0, 1, 2, 3, 4]
+    assert diff.removed == []
+    assert diff.reused == 0
+
+    new_spec = SPEC.replace("(<= X_0 1)", "(<= X_0 2)")
+    new_script, diff = session.update(new_spec)
+    assert new_script == VnnLibParser.parse(new_spec, strict=False)
+    assert diff.added == [3]
+    assert diff.removed == [3]
+    assert diff.reparsed == []
+    assert diff.reused == 4
+    for i in (0, 1, 2, 4):
+        assert new_script.commands[i] is script.commands[i]
+
+    _, diff = session.update(new_spec)
+    assert not diff.changed
+    assert diff.reused == 5
+
+
+def test_session_checks_dependencies():
+    session = ParserSession(strict=False)
+    script, _ = session.update(SPEC)
+
+    new_spec = SPEC.replace("(declare-const Y_0 Real)", "(declare-const Y_0 Int)")
+    new_script, diff = session.update(new_spec)
+    assert diff.added == [1]
+    assert diff.removed == [1]
+    assert diff.reparsed == [4]
+    assert new_script.commands[2] is script.commands[2]
+    assert new_script.commands[4] is not script.commands[4]
+
+    with pytest.raises(ParserError, match="Undeclared identifier: 'Y_0'"):
+        _ = session.update(new_spec.replace("(declare-const Y_0 Int)", ""))
+    # a failed update leaves the session unchanged
+    assert session.script == new_script
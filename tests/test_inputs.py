@@ -0,0 +1,101 @@
+from vnnlib.compat import read_vnnlib_simple
+from vnnlib.inputs import read_vnnlib_inputs
+
+
+def test_box(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        for i in range(3):
+            f.write(f"(declare-const X_{i} Real)\n")
+        for i in range(10):
+            f.write(f"(declare-const Y_{i} Real)\n")
+        for i in range(3):
+            f.write(f"(assert (>= X_{i} {i}.0))\n(assert (<= X_{i} {i + 1}.0))\n")
+        disjuncts = " ".join(f"(and (>= Y_{i} Y_0))" for i in range(1, 10))
+        f.write(f"(assert (or {disjuncts}))\n")
+        f.write("(assert (<= Y_0 100.0))\n")
+
+    result = read_vnnlib_inputs(vnnlib_path)
+    assert not result.mixed
+    assert result.skipped == 2
+    ((box, ((mat, rhs),)),) = result.regions
+    assert box == [[0.0, 1.0], [1.0, 2.0], [2.0, 3.0]]
+    assert box == read_vnnlib_simple(vnnlib_path, 3, 10)[0][0]
+    assert mat.shape == (0, 3)
+    assert rhs.shape == (0, 1)
+
+
+def test_input_polytope(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const X_1 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(assert (>= X_0 0.0))\n"
+            "(assert (<= -X_1 1.0))\n"
+            "(assert (<= (+ X_0 X_1) 1.0))\n"
+            "(assert (or (and (>= (- X_0 X_1) 0.5)) (and (<= X_0 0.25))))\n"
+            "(assert (<= Y_0 0.0))\n"
+        )
+
+    result = read_vnnlib_inputs(vnnlib_path, 2)
+    assert result.skipped == 1
+    assert not result.mixed
+    (box_1, ((mat_1, rhs_1),)), (box_2, ((mat_2, rhs_2),)) = result.regions
+    assert box_1 == [[0.0, float("inf")], [-1.0, float("inf")]]
+    assert mat_1.tolist() == [[1.0, 1.0], [-1.0, 1.0]]
+    assert rhs_1.tolist() == [[1.0], [-0.5]]
+    assert box_2 == [[0.0, 0.25], [-1.0, float("inf")]]
+    assert mat_2.tolist() == [[1.0, 1.0]]
+    assert rhs_2.tolist() == [[1.0]]
+
+
+def test_mixed(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(declare-const Y_1 Real)\n"
+            "(assert (or\n"
+            "    (and (>= X_0 0.0) (<= X_0 1.0) (>= Y_0 Y_1))\n"
+            "    (and (>= X_0 1.0) (<= X_0 2.0) (>= Y_1 Y_0))\n"
+            "))\n"
+        )
+
+    result = read_vnnlib_inputs(vnnlib_path, 1)
+    assert result.mixed
+    assert result.skipped == 0
+    assert [box for box, _ in result.regions] == [
+        box for box, _ in read_vnnlib_simple(vnnlib_path, 1, 2)
+    ]
+    assert [box for box, _ in result.regions] == [[[0.0, 1.0]], [[1.0, 2.0]]]
+
+
+def test_variable_free_assertions(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(assert (>= X_0 0.0))\n"
+            "(assert (<= 0.0 1.0))\n"
+            "(assert true)\n"
+            "(assert (<= Y_0 0.0))\n"
+        )
+    result = read_vnnlib_inputs(vnnlib_path, 1)
+    assert result.skipped == 1
+    ((box, ((mat, rhs),)),) = result.regions
+    assert box == [[0.0, float("inf")]]
+    assert mat.shape == (0, 1)
+
+    # assertions without variables are kept, and make the inputs infeasible
+    for num_rows, assertion in enumerate(["(<= 1.0 0.0)", "false"], 1):
+        with open(vnnlib_path, "a") as f:
+            f.write(f"(assert {assertion})\n")
+        result = read_vnnlib_inputs(vnnlib_path, 1)
+        assert result.skipped == 1
+        ((box, ((mat, rhs),)),) = result.regions
+        assert mat.tolist() == [[0.0]] * num_rows
+        assert rhs.tolist() == [[-1.0]] * num_rows
@@ -0,0 +1,171 @@
+import numpy as np
+import pytest
+
+import vnnlib.interval
+from vnnlib.compat import read_vnnlib_simple
+from vnnlib.interval import (
+    FALSE,
+    TRUE,
+    UNKNOWN,
+    IntervalTransformer,
+    prune_polytopes,
+    triage,
+    triage_polytopes,
+)
+from vnnlib.parser import VnnLibParser
+
+HEADER = (
+    "(declare-const X_0 Real)\n"
+    "(declare-const X_1 Real)\n"
+    "(declare-const Y_0 Real)\n"
+    "(declare-const Y_1 Real)\n"
+)
+
+
+def _compile(spec: str):
+    ast_node = VnnLibParser.parse(HEADER + spec, strict=False)
+    return IntervalTransformer().transform(ast_node)
+
+
+@pytest.mark.parametrize(
+    "term,expected",
+    [
+        ("(<= X_0 1.0)", TRUE),
+        ("(<= X_0 0.5)", UNKNOWN),
+        ("(> X_0 1.0)", FALSE),
+        ("(<= (+ X_0 X_1) 3.0)", TRUE),
+        ("(<= (- X_0 X_1) -2.0)", UNKNOWN),
+        ("(< (- X_0 X_1) -2.0)", FALSE),
+        ("(>= (* X_0 X_1 -1.0) -2.0)", TRUE),
+        ("(<= (/ X_1 X_0) 0.0)", UNKNOWN),
+        ("(<= (/ X_0 X_1) 1.0)", TRUE),
+        ("(<= 0.0 X_0 1.0 X_1)", TRUE),
+        ("(= X_0 X_1)", UNKNOWN),
+        ("(= X_0 3.0)", FALSE),
+        ("(and (<= X_0 1.0) (<= X_0 0.5))", UNKNOWN),
+        ("(and (<= X_0 0.5) (> X_0 1.0))", FALSE),
+        ("(or (<= X_0 0.5) (<= X_0 1.0))", TRUE),
+        ("(not (> X_0 1.0))", TRUE),
+        ("(=> (> X_0 1.0) (<= X_0 0.5))", TRUE),
+        ("(xor (<= X_0 1.0) (> X_1 2.0))", TRUE),
+        ("(ite (<= X_0 1.0) (> X_1 0.0) (< X_1 0.0))", TRUE),
+        ("(<= (ite (<= X_0 0.5) X_0 X_1) 2.0)", TRUE),
+        ("(<= (ite (<= X_0 0.5) X_0 X_1) 1.0)", UNKNOWN),
+        ("(<= Y_0 1.0)", UNKNOWN),
+        ("(and (<= Y_0 1.0) (>= Y_0 2.0))", UNKNOWN),
+        ("(< 1.0 2.0)", TRUE),
+    ],
+)
+def test_terms(term, expected):
+    evaluator = _compile(f"(assert {term})\n")
+    truth = evaluator([[0.0, 1.0], [1.0, 2.0]])
+    assert truth.status() == expected
+
+
+def test_batch_and_output_bounds():
+    evaluator = _compile(
+        "(assert (<= 0.0 X_0 1.0))\n(assert (or (and (>= Y_0 Y_1)) (and (>= Y_1 1.0))))\n"
+    )
+    input_bounds = [[[0.0, 1.0], [0.0, 0.0]], [[0.5, 2.0], [0.0, 0.0]]]
+    output_bounds = [[[1.0, 2.0], [0.0, 0.5]], [[1.0, 2.0], [0.0, 0.5]]]
+    assert evaluator(input_bounds, output_bounds).status().tolist() == [TRUE, UNKNOWN]
+    output_bounds = [[0.0, 0.5], [0.6, 0.9]]
+    assert evaluator(input_bounds, output_bounds).status().tolist() == [FALSE, FALSE]
+    assert [
+        truth.status().tolist()
+        for truth in evaluator.evaluate_assertions(input_bounds, output_bounds)
+    ] == [[TRUE, UNKNOWN], [FALSE, FALSE]]
+    # an empty box satisfies nothing
+    assert evaluator([[1.0, 0.0], [0.0, 0.0]]).status() == FALSE
+
+
+def test_wrong_shape():
+    evaluator = _compile("(assert (<= Y_0 X_0))\n")
+    with pytest.raises(ValueError, match=r"expected output_bounds of shape \(2, 2\)"):
+        evaluator(np.zeros((2, 2)), np.zeros((3, 2)))
+
+
+def test_triage(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            HEADER + "(assert (>= X_0 0.0))\n"
+            "(assert (<= X_0 1.0))\n"
+            "(assert (>= X_1 0.0))\n"
+            "(assert (<= X_1 1.0))\n"
+            "(assert (>= Y_0 Y_1))\n"
+        )
+
+    assert triage(vnnlib_path) == "unknown"
+    assert triage(vnnlib_path, [[1.0, 2.0], [0.0, 1.0]]) == "sat"
+    assert triage(vnnlib_path, [[0.0, 1.0], [2.0, 3.0]]) == "unsat"
+    assert triage(vnnlib_path, input_bounds=[[0.0, 1.0], [2.0, 3.0]]) == "unsat"
+
+
+def test_triage_parses_once(tmp_path, monkeypatch):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(HEADER + "(assert (>= X_0 0.0))\n(assert (>= Y_0 Y_1))\n")
+    parsed = []
+    constrained = []
+    parse_file = vnnlib.interval.parse_file
+    input_constraints = vnnlib.interval._input_constraints
+
+    def recording_parse_file(*args, **kwargs):
+        parsed.append(parse_file(*args, **kwargs))
+        return parsed[-1]
+
+    def recording_input_constraints(script, *args, **kwargs):
+        constrained.append(script)
+        return input_constraints(script, *args, **kwargs)
+
+    # the references of vnnlib.interval are patched, since calls within a
+    # compiled parser module do not go through its module attributes
+    monkeypatch.setattr(vnnlib.interval, "parse_file", recording_parse_file)
+    monkeypatch.setattr(
+        vnnlib.interval, "_input_constraints", recording_input_constraints
+    )
+    assert triage(vnnlib_path) == "unknown"
+    assert len(parsed) == 1
+    assert len(constrained) == 1
+    assert constrained[0] is parsed[0]
+
+
+def test_triage_polytopes(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            HEADER + "(assert (or\n"
+            "    (and (>= X_0 0.0) (<= X_0 1.0) (>= X_1 0.0) (<= X_1 1.0) (>= Y_0 Y_1))\n"
+            "    (and (>= X_0 0.0) (<= X_0 1.0) (>= X_1 0.0) (<= X_1 1.0) (>= Y_1 Y_0) (<= Y_1 3.0))\n"
+            "    (and (>= X_0 1.0) (<= X_0 2.0) (>= X_1 0.0) (<= X_1 1.0) (>= Y_1 Y_0))\n"
+            "))\n"
+        )
+    result = read_vnnlib_simple(vnnlib_path, 2, 2)
+
+    output_bounds = [[1.0, 2.0], [0.0, 0.5]]
+    status = triage_polytopes(result, output_bounds)
+    assert [s.tolist() for s in status] == [[TRUE, FALSE], [FALSE]]
+    pruned = prune_polytopes(result, output_bounds)
+    assert len(pruned) == 1
+    assert pruned[0][0] == result[0][0]
+    assert pruned[0][1] == result[0][1][:1]
+
+    per_box_bounds = [[[0.0, 1.0], [0.0, 1.0]], [[0.0, 0.5], [1.0, 2.0]]]
+    status = triage_polytopes(result, per_box_bounds)
+    assert [s.tolist() for s in status] == [[UNKNOWN, UNKNOWN], [TRUE]]
+
+
+def test_triage_empty_polytopes():
+    # the legacy format has 1-d empty arrays for polytopes without rows
+    result = [
+        ([[0.0, 1.0]], [(np.array([]), np.array([]))]),
+        (
+            [[1.0, 2.0]],
+            [(np.array([]), np.array([])), (np.array([[1.0, 0.0]]), np.array([[0.0]]))],
+        ),
+    ]
+    status = triage_polytopes(result, [[1.0, 2.0], [0.0, 1.0]])
+    assert [s.tolist() for s in status] == [[TRUE], [TRUE, FALSE]]
+    pruned = prune_polytopes(result, [[1.0, 2.0], [0.0, 1.0]])
+    assert [len(polytopes) for _, polytopes in pruned] == [1, 1]
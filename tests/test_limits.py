@@ -0,0 +1,135 @@
+import gzip
+import time
+
+import pytest
+
+from vnnlib.compat import read_vnnlib_simple
+from vnnlib.errors import (
+    ClauseLimitError,
+    LimitExceededError,
+    ParseCancelledError,
+    VnnLibError,
+)
+from vnnlib.limits import CancelToken, Limits
+from vnnlib.parser import VnnLibParser, parse_file
+from vnnlib.stats import ParseStats
+
+
+def _write_spec(vnnlib_path, num_inputs=10, num_disjuncts=3, open_func=open):
+    with open_func(vnnlib_path, "wt") as f:
+        for i in range(num_inputs):
+            f.write(f"(declare-const X_{i} Real)\n")
+        f.write("(declare-const Y_0 Real)\n(declare-const Y_1 Real)\n")
+        for i in range(num_inputs):
+            f.write(f"(assert (>= X_{i} 0.0))\n(assert (<= X_{i} 1.0))\n")
+        disjuncts = " ".join(f"(and (<= Y_0 {i}.0))" for i in range(num_disjuncts))
+        f.write(f"(assert (or {disjuncts}))\n")
+        f.write(f"(assert (or {disjuncts}))\n")
+
+
+def test_errors():
+    assert issubclass(LimitExceededError, VnnLibError)
+    assert issubclass(ClauseLimitError, LimitExceededError)
+    assert issubclass(ParseCancelledError, VnnLibError)
+
+
+def test_no_limits_exceeded(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    _write_spec(vnnlib_path)
+    limits = Limits(
+        max_bytes=10_000,
+        max_tokens=1000,
+        max_depth=4,
+        max_nodes=1000,
+        max_disjuncts=9,
+        timeout=60,
+        cancel_token=CancelToken(),
+    )
+    result = read_vnnlib_simple(vnnlib_path, 10, 2, limits=limits)
+    expected = read_vnnlib_simple(vnnlib_path, 10, 2)
+    assert [box for box, _ in result] == [box for box, _ in expected]
+    assert len(result[0][1]) == len(expected[0][1]) == 9
+
+
+@pytest.mark.parametrize(
+    "limits",
+    [
+        Limits(max_bytes=100),
+        Limits(max_tokens=100),
+        Limits(max_depth=3),
+        Limits(max_nodes=100),
+        Limits(max_disjuncts=8),
+    ],
+)
+def test_limit_exceeded(tmp_path, limits):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    _write_spec(vnnlib_path)
+    with pytest.raises(LimitExceededError):
+        read_vnnlib_simple(vnnlib_path, 10, 2, limits=limits)
+
+
+def test_compressed_max_bytes(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib.gz"
+    _write_spec(vnnlib_path, num_inputs=1000, open_func=gzip.open)
+    assert vnnlib_path.stat().st_size < 10_000
+    with pytest.raises(LimitExceededError, match="10000 bytes"):
+        parse_file(vnnlib_path, limits=Limits(max_bytes=10_000))
+    assert parse_file(vnnlib_path, limits=Limits(max_bytes=100_000)) == (
+        parse_file(vnnlib_path)
+    )
+
+
+def test_timeout(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    _write_spec(vnnlib_path, num_inputs=1000)
+    with pytest.raises(LimitExceededError, match="time limit"):
+        parse_file(vnnlib_path, limits=Limits(timeout=0))
+
+
+def test_reused_timeout(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    _write_spec(vnnlib_path)
+    with open(vnnlib_path) as f:
+        text = f.read()
+    limits = Limits(timeout=0.5)
+    VnnLibParser.parse(text, limits=limits)
+    time.sleep(0.6)
+    # the clock is restarted for each parse
+    VnnLibParser.parse(text, limits=limits)
+    parse_file(vnnlib_path, limits=limits)
+
+
+def test_compressed_max_bytes_stats(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib.gz"
+    _write_spec(vnnlib_path, open_func=gzip.open)
+    stats = ParseStats()
+    parse_file(vnnlib_path, stats=stats, limits=Limits(max_bytes=100_000))
+    assert stats.bytes_read == vnnlib_path.stat().st_size
+    assert stats.decompression_time == stats.phase_times["decompress"] > 0
+
+
+def test_cancel(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    _write_spec(vnnlib_path, num_inputs=1000)
+    cancel_token = CancelToken()
+    limits = Limits(cancel_token=cancel_token)
+    parse_file(vnnlib_path, limits=limits)
+
+    cancel_token.cancel()
+    assert cancel_token.cancelled
+    with pytest.raises(ParseCancelledError):
+        parse_file(vnnlib_path, limits=limits)
+    with pytest.raises(ParseCancelledError):
+        VnnLibParser.parse("(declare-const X_0 Real)", limits=limits)
+    with pytest.raises(ParseCancelledError):
+        read_vnnlib_simple(
+            vnnlib_path, 1000, 2, limits=Limits(cancel_token=cancel_token)
+        )
+
+
+def test_text_max_bytes():
+    # max_bytes counts the encoded size of a text, not its characters
+    text = "; ééé\n(declare-const X_0 Real)\n"
+    VnnLibParser.parse(text, limits=Limits(max_bytes=len(text.encode())))
+    with pytest.raises(LimitExceededError):
+        VnnLibParser.parse(text, limits=Limits(max_bytes=len(text)))
@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from vnnlib.linear import LinearTransformer, read_vnnlib_linear
+from vnnlib.parser import parse_file
+
+
+def test_box_and_output(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(declare-const Y_1 Real)\n"
+            "(assert (>= X_0 0))\n"
+            "(assert (<= X_0 1))\n"
+            "(assert (>= Y_0 Y_1))\n"
+        )
+
+    result = read_vnnlib_linear(vnnlib_path)
+    assert result.variables == ["X_0", "Y_0", "Y_1"]
+    assert result.A.shape == (3, 3)
+    assert result.A.toarray().tolist() == [[-1, 0, 0], [1, 0, 0], [0, -1, 1]]
+    assert result.b.tolist() == [0, 1, 0]
+    assert result.sense.tolist() == ["<=", "<=", "<="]
+    assert result.conjuncts.tolist() == [0, 1, 2]
+    assert result.disjunctions == []
+
+
+def test_sparse_layout(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        for i in range(1000):
+            f.write(f"(declare-const X_{i} Real)\n")
+        f.write("(assert (<= (+ X_0 (* 2 X_999)) 3))\n")
+
+    result = read_vnnlib_linear(vnnlib_path)
+    assert result.A.shape == (1, 1000)
+    assert result.A.indptr.tolist() == [0, 2]
+    assert result.A.indices.tolist() == [0, 999]
+    assert result.A.data.tolist() == [1, 2]
+    assert result.A.dot(np.ones(1000)).tolist() == [3]
+    assert result.A.dot(np.ones((4, 1000))).tolist() == [[3]] * 4
+
+
+def test_strict_and_equality(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const a Real)\n"
+            "(declare-const b Real)\n"
+            "(assert (< a b))\n"
+            "(assert (> a -1))\n"
+            "(assert (= (- a b) -0.5))\n"
+        )
+
+    result = read_vnnlib_linear(vnnlib_path)
+    assert result.sense.tolist() == ["<", "<", "="]
+    assert result.A.toarray().tolist() == [[1, -1], [-1, 0], [1, -1]]
+    assert result.b.tolist() == [0, 1, -0.5]
+    assert result.is_satisfied([0.0, 0.5])
+    assert not result.is_satisfied([0.0, 0.25])
+    assert not result.is_satisfied([-1.0, -0.5])
+
+
+def test_disjunction_groups(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(assert (or (and (>= X_0 0.5) (>= Y_0 0)) (and (<= X_0 0.5) (<= Y_0 0))))\n"
+        )
+
+    result = read_vnnlib_linear(vnnlib_path)
+    assert result.conjuncts.tolist() == []
+    assert len(result.disjunctions) == 1
+    assert [group.tolist() for group in result.disjunctions[0]] == [[0, 1], [2, 3]]
+    assert result.is_satisfied([1.0, 1.0])
+    assert result.is_satisfied([0.0, -1.0])
+    assert not result.is_satisfied([0.0, 1.0])
+
+
+def test_negation_and_implication(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const x Real)\n"
+            "(declare-const y Real)\n"
+            "(assert (=> (>= x 0) (>= y 1)))\n"
+            "(assert (not (= y 2)))\n"
+        )
+
+    result = read_vnnlib_linear(vnnlib_path)
+    assert len(result.disjunctions) == 2
+    assert result.is_satisfied([-1.0, 2.5])
+    assert result.is_satisfied([1.0, 1.0])
+    assert not result.is_satisfied([1.0, 0.0])
+    assert not result.is_satisfied([-1.0, 2.0])
+
+
+def test_ite(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const x Real)\n"
+            "(declare-const y Real)\n"
+            "(assert (<= (ite (>= x 0) x (- x)) y))\n"
+        )
+
+    result = read_vnnlib_linear(vnnlib_path)
+    assert result.is_satisfied([-1.0, 1.0])
+    assert result.is_satisfied([2.0, 2.0])
+    assert not result.is_satisfied([-1.0, 0.5])
+    assert not result.is_satisfied([2.0, 1.5])
+
+
+def test_trivial_assertions(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const x Real)\n"
+            "(assert (or true (>= x 0)))\n"
+            "(assert (and (>= x 0) false))\n"
+        )
+
+    result = read_vnnlib_linear(vnnlib_path)
+    assert result.A.shape == (1, 1)
+    assert result.conjuncts.tolist() == []
+    assert result.disjunctions == [[]]
+    assert not result.is_satisfied([1.0])
+
+
+def test_error_nonlinear(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const x Real)\n"
+            "(declare-const y Real)\n"
+            "(assert (>= (* x y) 0))\n"
+        )
+
+    with pytest.raises(NotImplementedError, match="Nonlinear constraints"):
+        _ = LinearTransformer().transform(parse_file(vnnlib_path))
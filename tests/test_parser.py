@@ -1,4 +1,5 @@
 from vnnlib.parser import (
+    CORE_IDS,
     Assert,
     Constant,
     DeclareConst,
@@ -122,3 +123,23 @@ def test_negation_of_symbol(tmp_path):
     assert len(result.commands[1].term.terms) == 2
     assert isinstance(result.commands[1].term.terms[1], Constant)
     assert result.commands[1].term.terms[1].value == 0xBEEF
+
+
+def _nested_script(depth, last):
+    term = FunctionApplication(CORE_IDS["<="], Constant(last), Constant(0))
+    for i in range(depth):
+        function = CORE_IDS["or"] if i % 2 else CORE_IDS["and"]
+        term = FunctionApplication(
+            function,
+            FunctionApplication(CORE_IDS[">="], Constant(i), Constant(0)),
+            term,
+        )
+    return Script(Assert(term))
+
+
+def test_deep_equality_and_hash():
+    script = _nested_script(10000, 1)
+    assert script == _nested_script(10000, 1)
+    assert hash(script) == hash(_nested_script(10000, 1))
+    assert script != _nested_script(10000, 2)
+    assert len({script, _nested_script(10000, 1), _nested_script(10000, 2)}) == 2
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from vnnlib.compat import read_vnnlib_simple
+from vnnlib.partition import (
+    iter_partition,
+    partition_box,
+    partition_compat,
+    split_counts,
+)
+
+
+def test_split_counts_widest():
+    box = [[0, 4], [0, 1], [0, 2]]
+    assert split_counts(box, 1).tolist() == [1, 1, 1]
+    assert split_counts(box, 2).tolist() == [2, 1, 1]
+    assert split_counts(box, 4).tolist() == [4, 1, 1]
+    assert split_counts(box, 8).tolist() == [4, 1, 2]
+    assert split_counts(box, 6).tolist() == [3, 1, 2]
+    assert split_counts(box, 7).tolist() == [7, 1, 1]
+    assert split_counts(box, 4, dims=[1]).tolist() == [1, 4, 1]
+
+
+def test_split_counts_unbounded():
+    box = [[0, np.inf], [0, 1], [1, 1]]
+    assert split_counts(box, 4).tolist() == [1, 4, 1]
+    with pytest.raises(ValueError):
+        _ = split_counts([[0, np.inf]], 2)
+    with pytest.raises(ValueError):
+        _ = split_counts([[0, 1]], 0)
+
+
+def test_partition_box():
+    box = [[0.0, 1.0], [-1.0, 1.0]]
+    sub_boxes = partition_box(box, 4)
+    assert sub_boxes.shape == (4, 2, 2)
+    assert sub_boxes.tolist() == [
+        [[0.0, 0.5], [-1.0, 0.0]],
+        [[0.0, 0.5], [0.0, 1.0]],
+        [[0.5, 1.0], [-1.0, 0.0]],
+        [[0.5, 1.0], [0.0, 1.0]],
+    ]
+    out = np.zeros((4, 2, 2))
+    assert partition_box(box, 4, out=out) is out
+    assert out.tolist() == sub_boxes.tolist()
+
+    lazy_sub_boxes = list(iter_partition(box, 4, batch_size=3))
+    assert np.array(lazy_sub_boxes).tolist() == sub_boxes.tolist()
+
+
+def test_partition_covers_box():
+    box = [[0.1, 0.7], [-0.3, 0.2], [5.0, 5.0]]
+    sub_boxes = partition_box(box, 30)
+    assert sub_boxes.shape == (30, 3, 2)
+    assert sub_boxes[:, :, 0].min(axis=0).tolist() == [0.1, -0.3, 5.0]
+    assert sub_boxes[:, :, 1].max(axis=0).tolist() == [0.7, 0.2, 5.0]
+    volumes = np.prod(sub_boxes[:, :2, 1] - sub_boxes[:, :2, 0], axis=-1)
+    assert np.isclose(volumes.sum(), 0.6 * 0.5)
+
+
+def test_partition_compat(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(declare-const Y_1 Real)\n"
+            "(assert (>= X_0 0))\n"
+            "(assert (<= X_0 1))\n"
+            "(assert (or (and (>= X_0 0.5) (>= Y_0 Y_1)) (and (<= X_0 0.5) (<= Y_0 Y_1))))\n"
+        )
+
+    result = read_vnnlib_simple(vnnlib_path, 1, 2)
+    partitioned = list(partition_compat(result, 2))
+    assert len(partitioned) == 4
+    assert [box for box, _ in partitioned] == [
+        [[0.5, 0.75]],
+        [[0.75, 1.0]],
+        [[0.0, 0.25]],
+        [[0.25, 0.5]],
+    ]
+    assert partitioned[0][1] is result[0][1]
+    assert partitioned[2][1] is result[1][1]
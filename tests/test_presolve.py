@@ -0,0 +1,101 @@
+import numpy as np
+
+from vnnlib.compat import read_vnnlib_simple
+from vnnlib.presolve import PresolveReport, presolve
+
+
+def test_duplicate_and_dominated_rows(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(declare-const Y_1 Real)\n"
+            "(assert (>= X_0 0))\n"
+            "(assert (<= X_0 1))\n"
+            "(assert (<= Y_0 3))\n"
+            "(assert (<= Y_0 2))\n"
+            "(assert (<= (* 2 Y_0) 5))\n"
+            "(assert (>= Y_0 Y_1))\n"
+            "(assert (>= Y_0 Y_1))\n"
+        )
+
+    result, report = presolve(read_vnnlib_simple(vnnlib_path, 1, 2))
+    assert len(result) == 1
+    assert result[0][0] == [[0, 1]]
+    assert len(result[0][1]) == 1
+    mat, rhs = result[0][1][0]
+    assert mat.tolist() == [[1, 0], [-1, 1]]
+    assert rhs.tolist() == [[2], [0]]
+    assert report.duplicate_rows == 1
+    assert report.dominated_rows == 2
+
+
+def test_infeasible_and_duplicate_disjuncts(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(declare-const Y_1 Real)\n"
+            "(assert (>= X_0 0))\n"
+            "(assert (<= X_0 1))\n"
+            "(assert (or\n"
+            "    (and (>= Y_0 1) (<= Y_0 0))\n"
+            "    (and (>= Y_0 Y_1) (<= Y_1 2))\n"
+            "    (and (<= Y_1 2) (>= Y_0 Y_1))\n"
+            "))\n"
+        )
+
+    result, report = presolve(read_vnnlib_simple(vnnlib_path, 1, 2))
+    assert len(result) == 1
+    assert len(result[0][1]) == 1
+    assert result[0][1][0][0].tolist() == [[-1, 1], [0, 1]]
+    assert result[0][1][0][1].tolist() == [[0], [2]]
+    assert report.infeasible_disjuncts == 1
+    assert report.duplicate_disjuncts == 1
+
+
+def test_subsumed_and_empty():
+    result = [
+        (
+            [[0.0, 1.0]],
+            [
+                (np.array([[1.0, 0.0]]), np.array([[1.0]])),
+                (np.array([[0.0, 0.0]]), np.array([[1.0]])),
+            ],
+        ),
+        ([[1.0, 0.0]], [(np.array([[1.0, 0.0]]), np.array([[1.0]]))]),
+        ([[0.0, 2.0]], [(np.array([[0.0, 0.0]]), np.array([[-1.0]]))]),
+    ]
+
+    presolved, report = presolve(result)
+    assert len(presolved) == 1
+    assert presolved[0][0] == [[0.0, 1.0]]
+    assert len(presolved[0][1]) == 1
+    assert presolved[0][1][0][0].shape == (0, 2)
+    assert report.trivial_rows == 1
+    assert report.subsumed_disjuncts == 1
+    assert report.infeasible_disjuncts == 1
+    assert report.removed_boxes == 2
+
+
+def test_empty_legacy_polytope(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w+") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(assert (>= X_0 0.0))\n"
+            "(assert (<= X_0 1.0))\n"
+        )
+    result = read_vnnlib_simple(vnnlib_path, 1, 1)
+    ((_, ((mat, rhs),)),) = result
+    assert mat.shape == rhs.shape == (0,)
+
+    presolved, report = presolve(result)
+    assert len(presolved) == 1
+    assert presolved[0][0] == [[0.0, 1.0]]
+    ((mat, rhs),) = presolved[0][1]
+    assert mat.size == rhs.size == 0
+    assert report.as_dict() == PresolveReport().as_dict()
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from vnnlib.compat import read_vnnlib_simple
+from vnnlib.inputs import read_vnnlib_inputs
+from vnnlib.sampling import sample_box, sample_boxes, sample_regions
+
+BOX = [[0.0, 1.0], [-2.0, 2.0], [3.0, 3.0]]
+
+
+@pytest.mark.parametrize("method", ["uniform", "corner", "lhs"])
+def test_sample_box(method):
+    samples = sample_box(BOX, 1000, method=method, seed=0)
+    assert samples.shape == (1000, 3)
+    lo, hi = np.array(BOX).T
+    assert ((samples >= lo) & (samples <= hi)).all()
+    assert (samples == sample_box(BOX, 1000, method=method, seed=0)).all()
+    if method == "corner":
+        assert set(np.unique(samples[:, 1])) == {-2.0, 2.0}
+    if method == "lhs":
+        # each of the 1000 strata of each input has exactly one sample
+        strata = np.floor((samples[:, :2] - lo[:2]) / (hi[:2] - lo[:2]) * 1000)
+        assert (np.sort(strata, axis=0) == np.arange(1000)[:, None]).all()
+
+
+def test_out():
+    out = np.empty((100, 3), dtype=np.float32)
+    assert sample_box(BOX, out=out, seed=0) is out
+    assert ((out[:, 0] >= 0) & (out[:, 0] <= 1)).all()
+    with pytest.raises(ValueError, match=r"expected out of shape \(10, 3\)"):
+        sample_box(BOX, 10, out=out)
+    with pytest.raises(ValueError, match="either n or out must be given"):
+        sample_box(BOX)
+    with pytest.raises(ValueError, match="unbounded box"):
+        sample_box([[0.0, np.inf]], 10)
+    with pytest.raises(ValueError, match="unknown sampling method"):
+        sample_box(BOX, 10, method="sobol")
+
+
+def test_sample_boxes(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(assert (or\n"
+            "    (and (>= X_0 0.0) (<= X_0 1.0) (>= Y_0 0.0))\n"
+            "    (and (>= X_0 2.0) (<= X_0 5.0) (<= Y_0 0.0))\n"
+            "))\n"
+        )
+    result = read_vnnlib_simple(vnnlib_path, 1, 1)
+
+    samples = sample_boxes([box for box, _ in result], 10000, seed=0)
+    assert samples.shape == (10000, 1)
+    in_first = (samples >= 0.0) & (samples <= 1.0)
+    in_second = (samples >= 2.0) & (samples <= 5.0)
+    assert (in_first | in_second).all()
+    # boxes are chosen in proportion to their volume
+    assert 0.2 < in_first.mean() < 0.3
+
+
+@pytest.mark.parametrize("polytope_method", ["rejection", "hit_and_run"])
+def test_sample_regions(tmp_path, polytope_method):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const X_1 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(assert (>= X_0 0.0))\n"
+            "(assert (<= X_0 1.0))\n"
+            "(assert (>= X_1 0.0))\n"
+            "(assert (<= X_1 1.0))\n"
+            "(assert (<= (+ X_0 X_1) 0.5))\n"
+            "(assert (<= Y_0 0.0))\n"
+        )
+    regions = read_vnnlib_inputs(vnnlib_path).regions
+
+    samples = sample_regions(regions, 20000, seed=0, polytope_method=polytope_method)
+    assert samples.shape == (20000, 2)
+    assert (samples >= 0.0).all()
+    assert (samples.sum(axis=1) <= 0.5 + 1e-12).all()
+    # the mean of a uniform sample of the triangle is its centroid
+    assert np.allclose(samples.mean(axis=0), 0.5 / 3, atol=0.01)
+
+
+def test_sample_regions_without_polytopes():
+    regions = [(BOX, [(np.zeros((0, 3)), np.zeros((0, 1)))])]
+    samples = sample_regions(regions, 100, method="corner", seed=0)
+    assert set(np.unique(samples[:, 0])) == {0.0, 1.0}
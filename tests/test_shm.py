@@ -0,0 +1,129 @@
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pytest
+
+import vnnlib.shm
+from vnnlib.compat import read_vnnlib_simple
+from vnnlib.errors import ParserError
+from vnnlib.shm import (
+    attach_shared,
+    new_block_name,
+    submit_shared,
+    unlink_block,
+    write_shared,
+)
+
+SPEC = (
+    "(declare-const X_0 Real)\n"
+    "(declare-const X_1 Real)\n"
+    "(declare-const Y_0 Real)\n"
+    "(declare-const Y_1 Real)\n"
+    "(assert (>= X_0 0))\n"
+    "(assert (<= X_0 1))\n"
+    "(assert (>= X_1 -1))\n"
+    "(assert (<= X_1 1))\n"
+    "(assert (or (and (>= Y_0 Y_1)) (and (<= Y_0 0.5) (>= Y_1 0))))\n"
+)
+# the resource tracker and blocks that outlive their writer are POSIX only
+posix_only = pytest.mark.skipif(
+    os.name != "posix", reason="shared memory blocks are removed with their writer"
+)
+
+
+def assert_same_result(shared_result, result):
+    assert len(shared_result) == len(result)
+    for (box, polytopes), (expected_box, expected_polytopes) in zip(
+        shared_result, result
+    ):
+        assert box.tolist() == expected_box
+        assert len(polytopes) == len(expected_polytopes)
+        for (mat, rhs), (expected_mat, expected_rhs) in zip(
+            polytopes, expected_polytopes
+        ):
+            assert mat.dtype == expected_mat.dtype
+            assert np.array_equal(mat, expected_mat)
+            assert np.array_equal(rhs, expected_rhs)
+
+
+def test_write_and_attach(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write(SPEC)
+    result = read_vnnlib_simple(vnnlib_path, 2, 2)
+
+    descriptor = write_shared(result)
+    with attach_shared(descriptor) as shared:
+        assert_same_result(shared.result, result)
+        # the arrays are views of the block, not copies
+        assert not shared.result[0][0].flags.owndata
+    assert shared.closed
+    assert not unlink_block(descriptor.name)
+
+
+def test_write_and_attach_inline(tmp_path, monkeypatch):
+    monkeypatch.setattr(vnnlib.shm, "_SHARED_BLOCKS", False)
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write(SPEC)
+    result = read_vnnlib_simple(vnnlib_path, 2, 2)
+
+    descriptor = write_shared(result)
+    assert descriptor.data is not None
+    assert not unlink_block(descriptor.name)
+    with attach_shared(descriptor) as shared:
+        assert_same_result(shared.result, result)
+    assert shared.closed
+
+
+def test_submit_shared(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write(SPEC)
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with submit_shared(executor, vnnlib_path, 2, 2) as shared:
+            assert_same_result(shared.result, read_vnnlib_simple(vnnlib_path, 2, 2))
+
+        invalid_path = tmp_path / "invalid.vnnlib"
+        with open(invalid_path, "w") as f:
+            f.write("(assert (>= X_0 0))\n")
+        with pytest.raises(ParserError):
+            _ = submit_shared(executor, invalid_path, 2, 2)
+
+
+class CrashingExecutor(Executor):
+    """Creates the block it is asked to, and then fails as if the worker crashed."""
+
+    def submit(self, fn, *args, **kwargs):
+        name = args[-1]
+        shm = shared_memory.SharedMemory(name=name, create=True, size=8)
+        resource_tracker.unregister(getattr(shm, "_name", shm.name), "shared_memory")
+        shm.close()
+        self.name = name
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker crashed"))
+        return future
+
+
+@posix_only
+def test_submit_shared_crash(tmp_path):
+    executor = CrashingExecutor()
+    with pytest.raises(BrokenProcessPool):
+        _ = submit_shared(executor, tmp_path / "test.vnnlib", 2, 2)
+    assert not unlink_block(executor.name)
+
+
+@posix_only
+def test_unlink_block():
+    name = new_block_name()
+    shm = shared_memory.SharedMemory(name=name, create=True, size=8)
+    # as if the block was created by a worker that crashed
+    resource_tracker.unregister(getattr(shm, "_name", shm.name), "shared_memory")
+    shm.close()
+
+    assert unlink_block(name)
+    assert not unlink_block(name)
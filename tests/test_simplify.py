@@ -0,0 +1,137 @@
+import numpy as np
+
+from vnnlib.compat import read_vnnlib_simple
+from vnnlib.parser import (
+    CORE_IDS,
+    Assert,
+    Constant,
+    FunctionApplication,
+    Identifier,
+    Sort,
+    VnnLibParser,
+    parse_file,
+)
+from vnnlib.simplify import simplify
+
+
+def _simplify_term(text, declarations="(declare-const x Real)(declare-const y Real)"):
+    script = VnnLibParser.parse(f"{declarations}(assert {text})")
+    return simplify(script.commands[-1].term)
+
+
+def _term_str(term):
+    if isinstance(term, FunctionApplication):
+        args = " ".join(_term_str(t) for t in term.terms)
+        return f"({term.function.value} {args})"
+    return str(term.value)
+
+
+def test_constant_folding():
+    assert _simplify_term("(<= x (* 2.0 0.5))") == _simplify_term("(<= x 1.0)")
+    assert _term_str(_simplify_term("(<= x (+ 1.0 (- 3.0 1.0) (/ 1.0 4.0)))")) == (
+        "(<= x 3.25)"
+    )
+    assert _simplify_term("(<= (* 2.0 0.5) 1.0)") == CORE_IDS["true"]
+    assert _simplify_term("(< 2.0 1.0)") == CORE_IDS["false"]
+    assert _term_str(_simplify_term("(<= x (/ 1.0 0.0))")) == "(<= x (/ 1.0 0.0))"
+
+
+def test_deep_connectives():
+    # alternating connectives do not flatten, and are deduplicated by identity
+    x, y = Identifier("x", Sort("Real")), Identifier("y", Sort("Real"))
+    atom = FunctionApplication(CORE_IDS["<="], x, Constant(0.0))
+    term = FunctionApplication(CORE_IDS["<="], y, Constant(0.0))
+    for i in range(5000):
+        connective = CORE_IDS["or" if i % 2 else "and"]
+        term = FunctionApplication(connective, atom, term, atom)
+    simplified = simplify(term)
+    for _ in range(5000):
+        assert isinstance(simplified, FunctionApplication)
+        assert len(simplified.terms) == 2
+        simplified = simplified.terms[1]
+    assert _term_str(simplified) == "(<= y 0.0)"
+
+
+def test_arithmetic_identities():
+    assert _term_str(_simplify_term("(<= (+ x 0.0) y)")) == "(<= x y)"
+    assert _term_str(_simplify_term("(<= (- 0.0 x) y)")) == "(<= (- x) y)"
+    assert _term_str(_simplify_term("(<= (- (- x)) y)")) == "(<= x y)"
+    assert _term_str(_simplify_term("(<= (- x 0.0) (* 1.0 y))")) == "(<= x y)"
+    assert _term_str(_simplify_term("(<= (* 0.0 x) y)")) == "(<= 0.0 y)"
+    assert _term_str(_simplify_term("(<= (+ x (+ y 1.0) 2.0) 0.0)")) == (
+        "(<= (+ x y 3.0) 0.0)"
+    )
+    assert _term_str(_simplify_term("(<= (* 2.0 (* x 3.0)) 0.0)")) == (
+        "(<= (* 6.0 x) 0.0)"
+    )
+
+
+def test_boolean_simplification():
+    assert _term_str(
+        _simplify_term("(and (<= x 0.0) (and (<= y 0.0) true) (<= x 0.0))")
+    ) == ("(and (<= x 0.0) (<= y 0.0))")
+    assert _term_str(_simplify_term("(or (<= x 0.0) false (or (<= y 0.0)))")) == (
+        "(or (<= x 0.0) (<= y 0.0))"
+    )
+    assert _simplify_term("(and (<= x 0.0) (not (<= x 0.0)))") == CORE_IDS["false"]
+    assert _simplify_term("(or (<= x 0.0) (not (<= x 0.0)))") == CORE_IDS["true"]
+    assert _simplify_term("(or (<= x 0.0) (< 0.0 1.0))") == CORE_IDS["true"]
+    assert _term_str(_simplify_term("(not (not (<= x 0.0)))")) == "(<= x 0.0)"
+    assert _term_str(_simplify_term("(=> true (<= x 0.0))")) == "(<= x 0.0)"
+    assert _simplify_term("(=> false (<= x 0.0))") == CORE_IDS["true"]
+    assert _term_str(_simplify_term("(ite (< 0.0 1.0) (<= x 0.0) (<= y 0.0))")) == (
+        "(<= x 0.0)"
+    )
+
+
+def test_true_assertions_are_dropped():
+    script = simplify(
+        VnnLibParser.parse("(declare-const x Real)(assert (<= 0.0 1.0))(assert true)")
+    )
+    assert len(script.commands) == 1
+    assert simplify(Assert(CORE_IDS["true"])) == Assert(CORE_IDS["true"])
+    assert simplify(Constant(1.0)) == Constant(1.0)
+
+
+def test_parse_file_simplify(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write("(declare-const X_0 Real)\n(assert (<= X_0 (* 2.0 0.5)))\n")
+    assert parse_file(vnnlib_path, simplify=True) == VnnLibParser.parse(
+        "(declare-const X_0 Real)\n(assert (<= X_0 1.0))\n"
+    )
+
+
+def test_read_vnnlib_simple_simplify(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const X_1 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(declare-const Y_1 Real)\n"
+            "(assert (and (>= X_0 (- 0.0 1.0)) (<= X_0 (* 2.0 0.5))))\n"
+            "(assert (>= X_1 (+ 0.0 0.5)))\n"
+            "(assert (<= X_1 (* 3.0 0.5)))\n"
+            "(assert (or (and (<= (+ Y_0 0.0) (* 1.0 Y_1))) (and (<= Y_1 (- Y_0 0.0)))))\n"
+        )
+    expected = read_vnnlib_simple(vnnlib_path, 2, 2)
+    result = read_vnnlib_simple(vnnlib_path, 2, 2, simplify=True)
+    assert len(result) == len(expected) == 1
+    assert result[0][0] == expected[0][0] == [[-1.0, 1.0], [0.5, 1.5]]
+    for (mat, rhs), (expected_mat, expected_rhs) in zip(result[0][1], expected[0][1]):
+        assert np.array_equal(mat, expected_mat)
+        assert np.array_equal(rhs, expected_rhs)
+
+
+def test_read_vnnlib_simple_flattens_nested_and(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write(
+            "(declare-const X_0 Real)\n"
+            "(declare-const Y_0 Real)\n"
+            "(assert (and (>= X_0 0.0) (and (<= X_0 1.0) true)))\n"
+            "(assert (<= Y_0 0.0))\n"
+        )
+    result = read_vnnlib_simple(vnnlib_path, 1, 1, simplify=True)
+    assert result[0][0] == [[0.0, 1.0]]
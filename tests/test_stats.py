@@ -0,0 +1,65 @@
+import gzip
+
+from vnnlib.compat import CompatTransformer, read_vnnlib_simple
+from vnnlib.parser import VnnLibParser, parse_file
+from vnnlib.stats import ParseStats
+
+SPEC = (
+    "(declare-const X_0 Real)\n"
+    "(declare-const Y_0 Real)\n"
+    "(declare-const Y_1 Real)\n"
+    "(assert (>= X_0 0))\n"
+    "(assert (<= X_0 1))\n"
+    "(assert (or (and (>= Y_0 Y_1)) (and (>= Y_0 Y_1)) (and (>= Y_1 0))))\n"
+)
+
+
+def test_parse_stats():
+    stats = ParseStats()
+    ast_node = VnnLibParser.parse(SPEC, stats=stats)
+    assert ast_node == VnnLibParser.parse(SPEC)
+    assert stats.token_counts["LPAREN"] == stats.token_counts["RPAREN"] == 15
+    assert stats.token_counts["NUMERAL"] == 3
+    assert stats.token_counts["EOF"] == 1
+    assert stats.num_tokens == sum(stats.token_counts.values())
+    assert stats.max_depth == 4
+    assert stats.declared_symbols == ["X_0", "Y_0", "Y_1"]
+    # the script, 6 commands, 2 bounds of 4 nodes, and a disjunction of 20 nodes
+    assert stats.num_nodes == 1 + 6 + 2 * 4 + 20
+    assert set(stats.phase_times) == {"parse"}
+
+
+def test_file_stats(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib.gz"
+    with gzip.open(vnnlib_path, "wt") as f:
+        f.write(SPEC)
+
+    stats = ParseStats()
+    result = read_vnnlib_simple(vnnlib_path, 1, 2, stats=stats)
+    assert len(result) == 1
+    assert len(result[0][1]) == 3
+    assert stats.bytes_read == vnnlib_path.stat().st_size
+    assert stats.decompression_time == stats.phase_times["decompress"] > 0
+    assert set(stats.phase_times) == {
+        "read",
+        "decompress",
+        "parse",
+        "transform",
+        "result",
+    }
+    assert stats.phase_times["result"] <= stats.phase_times["transform"]
+    assert stats.disjuncts_before_dedupe == 3
+    assert stats.disjuncts_after_dedupe == 2
+    assert stats.as_dict()["num_declared_symbols"] == 3
+
+
+def test_stats_callback(tmp_path):
+    vnnlib_path = tmp_path / "test.vnnlib"
+    with open(vnnlib_path, "w") as f:
+        f.write(SPEC)
+
+    calls = []
+    stats = ParseStats(callback=lambda phase, stats: calls.append(phase))
+    ast_node = parse_file(vnnlib_path, stats=stats)
+    _ = CompatTransformer("X", "Y", stats=stats).transform(ast_node)
+    assert calls == ["read", "decompress", "parse", "result", "transform"]
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from vnnlib.compat import CompatTransformer
+from vnnlib.errors import TokenizerError
+from vnnlib.parser import VnnLibParser
+from vnnlib.template import TemplateCache, scan_literals
+
+TEMPLATE = (
+    "; epsilon = {eps}\n"
+    "(declare-const X_0 Real)\n"
+    "(declare-const X_1 Real)\n"
+    "(declare-const Y_0 Real)\n"
+    "(declare-const Y_1 Real)\n"
+    "(assert (>= X_0 {lo}))\n"
+    "(assert (<= X_0 {hi}))\n"
+    "(assert (>= X_1 #x{hex}))\n"
+    "(assert (<= X_1 {int}))\n"
+    "(assert (or (and (>= Y_0 Y_1)) (and (<= (* {coef} Y_1) {hi}))))\n"
+)
+
+
+def compile_full(text, strict=True):
+    return CompatTransformer("X", "Y").transform(VnnLibParser.parse(text, strict))
+
+
+def assert_same_result(result, expected):
+    assert len(result) == len(expected)
+    for (box, polytopes), (expected_box, expected_polytopes) in zip(result, expected):
+        assert box == expected_box
+        assert len(polytopes) == len(expected_polytopes)
+        for (mat, rhs), (expected_mat, expected_rhs) in zip(
+            polytopes, expected_polytopes
+        ):
+            assert np.array_equal(mat, expected_mat)
+            assert np.array_equal(rhs, expected_rhs)
+
+
+def test_scan_literals():
+    digest, kinds, values = scan_literals(
+        TEMPLATE.format(eps=1, lo="0.5", hi="-1", hex="1f", int="3", coef="2.0")
+    )
+    assert kinds == "dnxidn"
+    assert values == [0.5, -1.0, 31, 3, 2.0, -1.0]
+
+    # only the values of the literals differ, and whitespace is ignored
+    other_digest, _, _ = scan_literals(
+        TEMPLATE.format(
+            eps=2, lo="0.25", hi="1.5", hex="0", int="7", coef="3.5"
+        ).replace(" ", "  ")
+    )
+    assert other_digest == digest
+
+    # the kinds of the literals are part of the structure
+    other_digest, _, _ = scan_literals(
+        TEMPLATE.format(eps=1, lo="0.5", hi="-1", hex="1f", int="3.0", coef="2.0")
+    )
+    assert other_digest != digest
+
+    assert scan_literals('(assert (= X_0 "1"))') is None
+    assert scan_literals("(assert (<= X_0 1e))") is None
+
+
+def test_template_cache():
+    cache = TemplateCache()
+    for lo, hi, hex_value, int_value, coef in [
+        ("0.5", "1.0", "1f", "3", "2.0"),
+        ("0.0", "-0.5", "0", "7", "-1.5"),
+        ("-2.5", "2.5", "ff", "0", "4.0"),
+    ]:
+        text = TEMPLATE.format(
+            eps=lo, lo=lo, hi=hi, hex=hex_value, int=int_value, coef=coef
+        )
+        assert_same_result(cache.compile(text), compile_full(text))
+    assert cache.misses == 1
+    assert cache.hits == 2
+
+    text = TEMPLATE.replace("X_1 #x", "X_0 #x").format(
+        eps=1, lo="0.5", hi="1.0", hex="1f", int="3", coef="2.0"
+    )
+    assert_same_result(cache.compile(text), compile_full(text))
+    assert cache.misses == 2
+
+
+def test_template_cache_strict():
+    cache = TemplateCache(maxsize=1)
+    text = TEMPLATE.format(eps=1, lo="0.5", hi="1e-1", hex="1f", int="3", coef="2")
+    assert_same_result(cache.compile(text, strict=False), compile_full(text, False))
+    with pytest.raises(TokenizerError):
+        _ = cache.compile(text, strict=True)
+    assert cache.misses == 2
+
+
+def test_template_read_vnnlib_simple(tmp_path):
+    cache = TemplateCache()
+    for i, eps in enumerate(["0.1", "0.2"]):
+        vnnlib_path = tmp_path / f"test_{i}.vnnlib"
+        with open(vnnlib_path, "w") as f:
+            f.write(
+                TEMPLATE.format(eps=eps, lo=eps, hi="1.0", hex="1", int="3", coef="2")
+            )
+        result = cache.read_vnnlib_simple(vnnlib_path, 2, 2)
+        assert result[0][0] == [[float(eps), 1.0], [1, 3]]
+    assert cache.hits == 1
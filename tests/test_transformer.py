@@ -0,0 +1,91 @@
+import sys
+
+from vnnlib.parser import (
+    CORE_IDS,
+    Assert,
+    Constant,
+    DeclareConst,
+    FunctionApplication,
+    Identifier,
+    Script,
+)
+from vnnlib.transformer import AstNodeTransformer, Discard
+
+
+class _CountingTransformer(AstNodeTransformer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.order = []
+
+    def transform_Constant(self, value):
+        self.order.append(value)
+        return value
+
+    def transform_Identifier(self, value):
+        return value
+
+    def transform_FunctionApplication(self, function, *terms):
+        assert function == "+"
+        return sum(terms)
+
+    def transform_DeclareConst(self, symbol, sort):
+        return Discard
+
+    def transform_Assert(self, term):
+        return term
+
+    def transform_Script(self, *commands):
+        return list(commands)
+
+
+def test_default_transform():
+    script = Script(
+        DeclareConst("X_0", "Real"),
+        Assert(FunctionApplication(CORE_IDS["+"], Constant(1), Constant(2))),
+    )
+    result = AstNodeTransformer().transform(script)
+    assert result == [("X_0", "Real"), (((("+",), (1,), (2,)),))]
+
+
+def test_post_order():
+    script = Script(
+        DeclareConst("X_0", "Real"),
+        Assert(
+            FunctionApplication(
+                CORE_IDS["+"],
+                Constant(1),
+                FunctionApplication(CORE_IDS["+"], Constant(2), Constant(3)),
+                Constant(4),
+            )
+        ),
+    )
+    transformer = _CountingTransformer()
+    assert transformer.transform(script) == [10]
+    assert transformer.order == [1, 2, 3, 4]
+
+
+def test_empty_script():
+    transformer = _CountingTransformer()
+    assert transformer.transform(Script()) == []
+
+
+def test_deep_nesting():
+    depth = 10 * sys.getrecursionlimit()
+    term = Constant(1)
+    for _ in range(depth):
+        term = FunctionApplication(CORE_IDS["+"], term, Constant(1))
+    result = _CountingTransformer().transform(Script(Assert(term)))
+    assert result == [depth + 1]
+
+
+def test_dispatch_table_is_per_class():
+    assert (
+        _CountingTransformer._dispatch_table is not AstNodeTransformer._dispatch_table
+    )
+    assert (
+        _CountingTransformer()._dispatch_table is _CountingTransformer()._dispatch_table
+    )
+    assert _CountingTransformer._dispatch_table[Identifier][1] is (
+        _CountingTransformer.transform_Identifier
+    )
+    assert AstNodeTransformer._dispatch_table[Identifier][1] is None
@@ -0,0 +1,132 @@
+import io
+import warnings
+
+import pytest
+
+from vnnlib.parser import (
+    CORE_IDS,
+    Assert,
+    Constant,
+    DeclareConst,
+    FunctionApplication,
+    Script,
+    VnnLibParser,
+)
+from vnnlib.writer import dump, dumps, format_constant, format_symbol
+
+SPEC = (
+    "; a comment\n"
+    "(declare-const X_0 Real)\n"
+    "(declare-const Y_0 Real)\n"
+    "(declare-const |odd symbol| Real)\n"
+    "(assert (>= X_0   (-   0.5)))\n"
+    "(assert (<= X_0 1e-7))\n"
+    "(assert (or (and (>= Y_0 #x10) (<= Y_0 #b101)) (<= (* 2.50 Y_0) |odd symbol|)))\n"
+    '(assert (= "a ""quoted"" string" "b"))\n'
+)
+
+
+def _parse(text):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return VnnLibParser.parse(text, strict=False)
+
+
+def test_round_trip():
+    script = _parse(SPEC)
+    text = dumps(script)
+    assert text.splitlines()[3] == "(assert (>= X_0 (- 0.5)))"
+    assert text.splitlines()[4] == "(assert (<= X_0 0.0000001))"
+    assert _parse(text) == script
+    assert VnnLibParser.parse(text, strict=True) == script
+
+
+def test_round_trip_minified():
+    script = _parse(SPEC)
+    text = dumps(script, minify=True)
+    assert "\n" not in text
+    assert text.startswith("(declare-const X_0 Real)(declare-const Y_0 Real)")
+    assert "(assert(or(and(>= Y_0 16)(<= Y_0 5))(<=(* 2.5 Y_0)|odd symbol|)))" in text
+    assert _parse(text) == script
+    assert len(text) < len(SPEC)
+
+
+def test_negative_constants():
+    script = Script(
+        DeclareConst("X_0", "Real"),
+        Assert(FunctionApplication(CORE_IDS[">="], Constant(-3), Constant(-0.5))),
+    )
+    text = dumps(script)
+    assert text.splitlines()[1] == "(assert (>= (- 3) (- 0.5)))"
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        parsed = VnnLibParser.parse(text, strict=True)
+    minus_3, minus_half = parsed.commands[1].term.terms
+    assert minus_3 == FunctionApplication(CORE_IDS["-"], Constant(3))
+    assert isinstance(minus_3.terms[0].value, int)
+    assert minus_half == FunctionApplication(CORE_IDS["-"], Constant(0.5))
+    assert dumps(parsed) == text
+
+
+def test_round_trip_non_strict():
+    # VNN-COMP specs often use negative literals, which are only parsed
+    # without strict mode
+    script = _parse(
+        "(declare-const X_0 Real)\n"
+        "(assert (>= X_0 -0.5))\n"
+        "(assert (<= X_0 -3))\n"
+        "(assert (<= -X_0 1.0))\n"
+    )
+    assert script.commands[1].term.terms[1] == Constant(-0.5)
+    text = dumps(script, strict=False)
+    assert text.splitlines()[1:3] == [
+        "(assert (>= X_0 -0.5))",
+        "(assert (<= X_0 -3.0))",
+    ]
+    assert _parse(text) == script
+    assert _parse(dumps(script, minify=True, strict=False)) == script
+    # strict text does not parse to the same constants
+    assert _parse(dumps(script)) != script
+
+
+def test_dump_in_chunks():
+    terms = [
+        FunctionApplication(CORE_IDS["+"], Constant(i), Constant(i))
+        for i in range(5000)
+    ]
+    script = Script(
+        DeclareConst("x", "Real"),
+        Assert(
+            FunctionApplication(
+                CORE_IDS["<="],
+                FunctionApplication(CORE_IDS["+"], *terms),
+                Constant(1.0),
+            )
+        ),
+    )
+    file = io.StringIO()
+    dump(script, file)
+    assert _parse(file.getvalue()) == script
+
+
+def test_deep_nesting():
+    term = Constant(1)
+    for _ in range(10000):
+        term = FunctionApplication(CORE_IDS["-"], term)
+    text = dumps(Script(Assert(FunctionApplication(CORE_IDS[">="], term, Constant(0)))))
+    assert text.startswith("(assert (>= (- (- (-")
+    assert text.endswith("1" + ")" * 10000 + " 0))\n")
+
+
+def test_format():
+    assert format_constant(1) == "1"
+    assert format_constant(1.0) == "1.0"
+    assert format_constant(1e16) == "10000000000000000.0"
+    assert format_constant(0.1) == "0.1"
+    assert format_constant(-2.5) == "-2.5"
+    assert format_symbol("X_0") == "X_0"
+    assert format_symbol("0x") == "|0x|"
+    with pytest.raises(ValueError):
+        _ = format_constant(float("inf"))
+    with pytest.raises(ValueError):
+        _ = format_symbol("a|b")
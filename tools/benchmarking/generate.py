@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+import argparse
+import bz2
+import dataclasses
+import gzip
+import io
+import lzma
+import math
+import pathlib
+import random
+from typing import Callable
+
+LITERAL_FORMATS = ("decimal", "hex", "binary", "exponent", "mixed")
+COMPRESSIONS = {
+    "none": (open, ""),
+    "gz": (gzip.open, ".gz"),
+    "bz2": (bz2.open, ".bz2"),
+    "xz": (lzma.open, ".xz"),
+}
+
+
+@dataclasses.dataclass
+class SpecConfig:
+    num_inputs: int = 10
+    num_outputs: int = 5
+    num_disjuncts: int = 4
+    depth: int = 1
+    literals: str = "decimal"
+    seed: int = 0
+
+    @property
+    def strict(self) -> bool:
+        """Whether the generated spec can be parsed in strict mode."""
+        return self.literals not in ("exponent", "mixed")
+
+
+@dataclasses.dataclass
+class ParsedArgs:
+    output: pathlib.Path
+    num_inputs: int
+    num_outputs: int
+    num_disjuncts: int
+    depth: int
+    literals: str
+    compression: str
+    seed: int
+
+
+def parse_args(args: list[str] | None = None) -> ParsedArgs:
+    parser = argparse.ArgumentParser(
+        description="Generate a deterministic synthetic VNN-LIB spec."
+    )
+    parser.add_argument("output", type=pathlib.Path)
+    parser.add_argument("--num_inputs", type=int, default=10)
+    parser.add_argument("--num_outputs", type=int, default=5)
+    parser.add_argument("--num_disjuncts", type=int, default=4)
+    parser.add_argument(
+        "--depth", type=int, default=1, help="the nesting depth of the disjunction"
+    )
+    parser.add_argument("--literals", choices=LITERAL_FORMATS, default="decimal")
+    parser.add_argument("--compression", choices=COMPRESSIONS, default="none")
+    parser.add_argument("--seed", type=int, default=0)
+    return ParsedArgs(**vars(parser.parse_args(args)))
+
+
+class _LiteralWriter:
+    def __init__(self, literals: str, rng: random.Random):
+        self.literals = literals
+        self.rng = rng
+
+    def _choose_format(self) -> str:
+        if self.literals == "mixed":
+            return self.rng.choice(LITERAL_FORMATS[:-1])
+        return self.literals
+
+    def bound(self, value: float) -> str:
+        return _format_literal(self._choose_format(), value, round)
+
+    def interval(self, lower: float, upper: float) -> tuple[str, str]:
+        """Format both bounds of a variable in the same literal format.
+
+        Hexadecimal and binary bounds are rounded outwards, so that the
+        interval is never empty.
+        """
+        literal_format = self._choose_format()
+        return (
+            _format_literal(literal_format, lower, math.floor),
+            _format_literal(literal_format, upper, math.ceil),
+        )
+
+
+def _format_literal(
+    literal_format: str, value: float, to_int: Callable[[float], int]
+) -> str:
+    # hexadecimal and binary literals are non-negative integers, so values
+    # are clipped at 0 and scaled from [0, 1] to [0, 255]
+    if literal_format == "hex":
+        return f"#x{to_int(max(value, 0.0) * 255):x}"
+    if literal_format == "binary":
+        return f"#b{to_int(max(value, 0.0) * 255):b}"
+    if literal_format == "exponent":
+        return f"{value:.6e}"
+    return f"{value:.9f}"
+
+
+def _write_disjunction(
+    f: io.TextIOBase, disjuncts: list[str], depth: int, indent: str
+) -> None:
+    if depth <= 1 or len(disjuncts) <= 1:
+        f.write(f"{indent}(or\n")
+        for disjunct in disjuncts:
+            f.write(f"{indent}    {disjunct}\n")
+        f.write(f"{indent})\n")
+        return
+    half = (len(disjuncts) + 1) // 2
+    f.write(f"{indent}(or\n")
+    _write_disjunction(f, disjuncts[:half], depth - 1, indent + "    ")
+    _write_disjunction(f, disjuncts[half:], depth - 1, indent + "    ")
+    f.write(f"{indent})\n")
+
+
+def write_spec(f: io.TextIOBase, config: SpecConfig) -> None:
+    """Write a VNN-COMP style robustness spec.
+
+    The spec has an input box around a random center, and a disjunction of
+    ``num_disjuncts`` conjunctions comparing a target output against the others.
+    """
+    rng = random.Random(config.seed)
+    literals = _LiteralWriter(config.literals, rng)
+
+    f.write(f"; synthetic spec {config}\n")
+    for i in range(config.num_inputs):
+        f.write(f"(declare-const X_{i} Real)\n")
+    f.write("\n")
+    for i in range(config.num_outputs):
+        f.write(f"(declare-const Y_{i} Real)\n")
+    f.write("\n; input box\n")
+    for i in range(config.num_inputs):
+        center = rng.random()
+        epsilon = rng.uniform(0.001, 0.1)
+        lower, upper = literals.interval(center - epsilon, center + epsilon)
+        f.write(f"(assert (<= X_{i} {upper}))\n")
+        f.write(f"(assert (>= X_{i} {lower}))\n")
+    f.write("\n; output property\n")
+    target = rng.randrange(config.num_outputs)
+    others = [j for j in range(config.num_outputs) if j != target] or [target]
+    disjuncts = []
+    for k in range(config.num_disjuncts):
+        j = others[k % len(others)]
+        threshold = literals.bound(rng.uniform(-1.0, 1.0))
+        disjuncts.append(f"(and (>= Y_{j} Y_{target}) (>= Y_{j} {threshold}))")
+    if disjuncts:
+        f.write("(assert\n")
+        _write_disjunction(f, disjuncts, config.depth, "    ")
+        f.write(")\n")
+
+
+def generate_spec(config: SpecConfig) -> str:
+    f = io.StringIO()
+    write_spec(f, config)
+    return f.getvalue()
+
+
+def generate_file(
+    path: pathlib.Path, config: SpecConfig, compression: str = "none"
+) -> pathlib.Path:
+    """Write a spec to ``path``, adding the suffix of the compression format."""
+    open_func, suffix = COMPRESSIONS[compression]
+    if suffix and path.suffix != suffix:
+        path = path.with_name(path.name + suffix)
+    with open_func(path, "wt") as f:
+        write_spec(f, config)
+    return path
+
+
+def main(args: list[str] | None = None):
+    parsed_args = parse_args(args)
+    config = SpecConfig(
+        num_inputs=parsed_args.num_inputs,
+        num_outputs=parsed_args.num_outputs,
+        num_disjuncts=parsed_args.num_disjuncts,
+        depth=parsed_args.depth,
+        literals=parsed_args.literals,
+        seed=parsed_args.seed,
+    )
+    print(generate_file(parsed_args.output, config, parsed_args.compression))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+import argparse
+import dataclasses
+import gc
+import json
+import pathlib
+import sys
+import tempfile
+import tracemalloc
+import warnings
+from typing import Any
+
+from generate import COMPRESSIONS, SpecConfig, generate_file
+
+from vnnlib.compat import CompatTransformer
+from vnnlib.parser import Assert, FunctionApplication, Script, VnnLibParser
+from vnnlib.tokenizer import tokenize
+
+
+@dataclasses.dataclass
+class ParsedArgs:
+    specs: list[pathlib.Path]
+    output: pathlib.Path | None
+    scales: list[int]
+    num_outputs: int
+    num_disjuncts: int
+    compression: str
+    strict: bool
+    seed: int
+    compare: pathlib.Path | None
+    tolerance: float
+
+
+def parse_args(args: list[str] | None = None) -> ParsedArgs:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure the memory used by each phase of parsing, for the given specs"
+            " or for synthetic specs of increasing size."
+        )
+    )
+    parser.add_argument("specs", type=pathlib.Path, nargs="*")
+    parser.add_argument("-o", "--output", type=pathlib.Path)
+    parser.add_argument(
+        "--scales",
+        type=lambda s: [int(n) for n in s.split(",")],
+        default=[100, 1000, 10000, 100000],
+        help="comma separated numbers of inputs (default: 100,1000,10000,100000)",
+    )
+    parser.add_argument("--num_outputs", type=int, default=10)
+    parser.add_argument("--num_disjuncts", type=int, default=9)
+    parser.add_argument("--compression", choices=COMPRESSIONS, default="none")
+    parser.add_argument(
+        "--strict",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="whether to parse strictly (default: False)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--compare",
+        type=pathlib.Path,
+        help="a previous report to compare against, failing on memory regressions",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="the allowed relative increase in memory for --compare (default: 0.1)",
+    )
+    return ParsedArgs(**vars(parser.parse_args(args)))
+
+
+def count_nodes(ast_node: Script) -> dict[str, dict[str, int]]:
+    """Count the nodes of an AST by type, with their shallow size in bytes."""
+    counts: dict[str, dict[str, int]] = {}
+    # identifiers are shared between nodes, so each one is only counted once
+    seen: set[int] = set()
+    stack: list[Any] = [ast_node]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        node_counts = counts.setdefault(type(node).__name__, {"count": 0, "bytes": 0})
+        node_counts["count"] += 1
+        node_counts["bytes"] += sys.getsizeof(node)
+        if isinstance(node, FunctionApplication):
+            stack.append(node.function)
+            stack.extend(node.terms)
+        elif isinstance(node, Assert):
+            stack.append(node.term)
+        elif isinstance(node, Script):
+            stack.extend(node.commands)
+    return counts
+
+
+def measure(path: pathlib.Path, strict: bool) -> dict[str, Any]:
+    """Measure the peak and retained memory of each phase of parsing a spec.
+
+    Each phase keeps the results of the previous phases alive, as the
+    tokenizer and parser would in a single pass, so the retained memory of a
+    phase is the memory of everything created up to the end of that phase.
+    """
+    open_func = open
+    for compressed_open_func, suffix in COMPRESSIONS.values():
+        if suffix and path.suffix == suffix:
+            open_func = compressed_open_func
+
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    phases = {}
+
+    def record(phase: str) -> None:
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        phases[phase] = {"peak": peak - baseline, "retained": current - baseline}
+        tracemalloc.reset_peak()
+
+    with open_func(path, "rt") as f:
+        text = f.read()
+    record("read")
+    tokens = list(tokenize(text, strict=strict))
+    record("tokenize")
+    ast_node = VnnLibParser.parse_tokens(iter(tokens))
+    record("parse")
+    result = CompatTransformer("X", "Y").transform(ast_node)
+    record("transform")
+    tracemalloc.stop()
+
+    return {
+        "spec": str(path),
+        "bytes": len(text.encode()),
+        "tokens": len(tokens),
+        "commands": len(ast_node.commands),
+        "disjuncts": sum(len(polytopes) for _, polytopes in result),
+        "phases": phases,
+        "nodes": count_nodes(ast_node),
+    }
+
+
+def find_regressions(
+    reports: list[dict[str, Any]], baseline: list[dict[str, Any]], tolerance: float
+) -> list[str]:
+    """Compare the memory of each phase against a baseline report.
+
+    Specs are matched by file name, so that reports of generated specs in
+    different temporary directories can be compared.
+    """
+    baseline_reports = {pathlib.Path(r["spec"]).name: r for r in baseline}
+    regressions = []
+    for report in reports:
+        name = pathlib.Path(report["spec"]).name
+        if name not in baseline_reports:
+            continue
+        baseline_phases = baseline_reports[name]["phases"]
+        for phase, memory in report["phases"].items():
+            for metric in ("peak", "retained"):
+                old = baseline_phases.get(phase, {}).get(metric)
+                new = memory[metric]
+                if old is not None and new > old * (1 + tolerance):
+                    regressions.append(
+                        f"{name} {phase} {metric}: {old} -> {new} bytes"
+                        f" ({new / old - 1:+.1%})"
+                    )
+    return regressions
+
+
+def main(args: list[str] | None = None):
+    parsed_args = parse_args(args)
+    warnings.simplefilter("ignore")
+
+    reports = []
+    with tempfile.TemporaryDirectory() as working_dir:
+        specs = parsed_args.specs
+        if not specs:
+            for num_inputs in parsed_args.scales:
+                config = SpecConfig(
+                    num_inputs=num_inputs,
+                    num_outputs=parsed_args.num_outputs,
+                    num_disjuncts=parsed_args.num_disjuncts,
+                    seed=parsed_args.seed,
+                )
+                specs.append(
+                    generate_file(
+                        pathlib.Path(working_dir) / f"spec_{num_inputs}.vnnlib",
+                        config,
+                        parsed_args.compression,
+                    )
+                )
+        for path in specs:
+            print(f"measuring {path.name}...", file=sys.stderr)
+            reports.append(measure(path, parsed_args.strict))
+
+    if parsed_args.output:
+        with open(parsed_args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+    else:
+        print(json.dumps(reports, indent=2))
+
+    if parsed_args.compare:
+        with open(parsed_args.compare) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(reports, baseline, parsed_args.tolerance)
+        for regression in regressions:
+            print(f"memory regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,9 @@ import matplotlib.style
 import numpy as np
 import pandas as pd
 
+COLUMN_NAMES = ("benchmark", "sub_benchmark", "onnx_file", "vnnlib_file", "time")
+PHASES = ("read", "decompress", "tokenize", "parse", "transform", "result")
+
 
 @dataclasses.dataclass
 class ParsedArgs:
@@ -28,6 +31,49 @@ def parse_args(args: list[str] | None = None) -> ParsedArgs:
     return ParsedArgs(**vars(parser.parse_args(args)))
 
 
+def read_results(path: pathlib.Path) -> pd.DataFrame:
+    """Read the results of ``run.py``, with per phase times if they were recorded."""
+    results_df = pd.read_csv(path, header=None)
+    column_names = COLUMN_NAMES
+    if len(results_df.columns) == len(COLUMN_NAMES) + len(PHASES):
+        column_names = COLUMN_NAMES + PHASES
+    results_df.columns = list(column_names)
+    return results_df
+
+
+def plot_phases(results_df: pd.DataFrame, output_dir: pathlib.Path) -> None:
+    phases = [
+        phase
+        for phase in PHASES
+        if f"{phase}_old" in results_df and f"{phase}_new" in results_df
+    ]
+    if not phases:
+        return
+
+    totals_df = pd.DataFrame(
+        {
+            "old": [results_df[f"{phase}_old"].sum() / 1e9 for phase in phases],
+            "new": [results_df[f"{phase}_new"].sum() / 1e9 for phase in phases],
+        },
+        index=phases,
+    )
+    ax: matplotlib.axes.Axes = totals_df.T.plot.bar(stacked=True, figsize=(10, 8))
+    ax.set_ylabel("total time (s)")
+    ax.figure.savefig(output_dir / "phase_breakdown.png", bbox_inches="tight")
+    ax.figure.clear()
+
+    speedup_df = pd.DataFrame(
+        {
+            phase: results_df[f"{phase}_old"] / results_df[f"{phase}_new"]
+            for phase in phases
+        }
+    ).replace([np.inf, -np.inf], np.nan)
+    ax = speedup_df.boxplot(figsize=(10, 8))
+    ax.set_ylabel("speedup")
+    ax.figure.savefig(output_dir / "phase_speedup_box.png", bbox_inches="tight")
+    ax.figure.clear()
+
+
 def main(args: list[str] | None = None):
     parsed_args = parse_args(args)
 
@@ -40,12 +86,11 @@ def main(args: list[str] | None = None):
 
     matplotlib.style.use("fivethirtyeight")
 
-    column_names = ("benchmark", "sub_benchmark", "onnx_file", "vnnlib_file", "time")
-    old_results_df = pd.read_csv(parsed_args.old_results, names=column_names)
-    new_results_df = pd.read_csv(parsed_args.new_results, names=column_names)
+    old_results_df = read_results(parsed_args.old_results)
+    new_results_df = read_results(parsed_args.new_results)
 
     results_df = new_results_df.merge(
-        old_results_df, on=column_names[:-1], suffixes=("_new", "_old")
+        old_results_df, on=list(COLUMN_NAMES[:-1]), suffixes=("_new", "_old")
     )
     results_df["speedup"] = results_df["time_old"] / results_df["time_new"]
 
@@ -102,6 +147,8 @@ def main(args: list[str] | None = None):
     ax.figure.savefig(output_dir / "speedup_box_logx.png", bbox_inches="tight")
     ax.figure.clear()
 
+    plot_phases(results_df, output_dir)
+
 
 if __name__ == "__main__":
     main()
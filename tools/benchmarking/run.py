@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 import argparse
+import bz2
 import csv
 import dataclasses
+import gzip
+import lzma
 import os
 import pathlib
 import shlex
@@ -9,6 +12,7 @@ import subprocess as sp
 import sys
 import tempfile
 import time
+import warnings
 
 BENCHMARK_URLS = {
     "vnncomp2022": "https://github.com/ChristopherBrix/vnncomp2022_benchmarks",
@@ -16,10 +20,24 @@ BENCHMARK_URLS = {
 }
 
 
+PHASES = ("read", "decompress", "tokenize", "parse", "transform", "result")
+DECOMPRESSORS = {
+    ".gz": gzip.decompress,
+    ".gzip": gzip.decompress,
+    ".bz2": bz2.decompress,
+    ".bzip2": bz2.decompress,
+    ".xz": lzma.decompress,
+}
+
+
 @dataclasses.dataclass
 class ParsedArgs:
     benchmark: list[str]
     output: pathlib.Path | None
+    in_process: bool
+    repeat: int
+    warmup: int
+    strict: bool
     command: list[str]
 
 
@@ -27,6 +45,30 @@ def parse_args(args: list[str] | None = None) -> ParsedArgs:
     parser = argparse.ArgumentParser()
     parser.add_argument("-b", "--benchmark", action="append", default=[])
     parser.add_argument("-o", "--output", type=pathlib.Path)
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="time each phase of parsing in this process instead of running COMMAND",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=1,
+        help="number of timed runs per instance for --in-process (default: 1)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=0,
+        help="number of untimed runs per instance for --in-process (default: 0)",
+    )
+    parser.add_argument(
+        "--strict",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="whether to parse strictly for --in-process (default: False)",
+    )
     parser.add_argument("command", nargs=argparse.REMAINDER)
     return ParsedArgs(**vars(parser.parse_args(args)))
 
@@ -61,40 +103,126 @@ def prepare_benchmark(benchmark_name: str) -> None:
             raise RuntimeError("gunzip failed")
 
 
-def run_benchmark(
-    benchmark: str, command: list[str]
-) -> list[tuple[str, str, str, str, int]]:
+def iter_instances(benchmark: str):
     benchmarks_dir = pathlib.Path(benchmark) / "benchmarks"
-    results = []
     for sub_benchmark in benchmarks_dir.iterdir():
         if not (sub_benchmark / "instances.csv").exists():
             continue
         with open(sub_benchmark / "instances.csv", newline="") as csvfile:
             reader = csv.reader(csvfile)
             for row in reader:
-                formatted_command = [
-                    arg.format(
-                        onnx_file=sub_benchmark / row[0],
-                        vnnlib_file=sub_benchmark / row[1],
-                    )
-                    for arg in command
-                ]
-                print(" ".join(formatted_command), file=sys.stderr)
-                start_t = time.perf_counter_ns()
-                proc = sp.run(formatted_command, stdout=sp.PIPE, stderr=sp.STDOUT)
-                end_t = time.perf_counter_ns()
-                if proc.returncode != 0:
-                    print(proc.stdout.decode(), file=sys.stderr)
-                    raise RuntimeError("Process failed.")
-                results.append(
-                    (
-                        benchmark,
-                        sub_benchmark.name,
-                        (sub_benchmark / row[0]).name,
-                        (sub_benchmark / row[1]).name,
-                        end_t - start_t,
-                    )
-                )
+                yield sub_benchmark, row
+
+
+def time_phases(vnnlib_file: pathlib.Path, strict: bool) -> dict[str, int]:
+    """Run the compat pipeline on a file once, timing each phase separately.
+
+    Times are in nanoseconds. Interpreter startup and import time are excluded.
+    """
+    from vnnlib.compat import CompatTransformer
+    from vnnlib.parser import VnnLibParser
+    from vnnlib.tokenizer import tokenize
+    from vnnlib.transformer import Discard
+
+    times = {}
+    start_t = time.perf_counter_ns()
+    with open(vnnlib_file, "rb") as f:
+        data = f.read()
+    end_t = time.perf_counter_ns()
+    times["read"] = end_t - start_t
+
+    start_t = time.perf_counter_ns()
+    decompress = DECOMPRESSORS.get(vnnlib_file.suffix)
+    if decompress is not None:
+        data = decompress(data)
+    text = data.decode()
+    end_t = time.perf_counter_ns()
+    times["decompress"] = end_t - start_t
+
+    start_t = time.perf_counter_ns()
+    tokens = list(tokenize(text, strict=strict))
+    end_t = time.perf_counter_ns()
+    times["tokenize"] = end_t - start_t
+
+    if hasattr(VnnLibParser, "parse_tokens"):
+        start_t = time.perf_counter_ns()
+        ast_node = VnnLibParser.parse_tokens(iter(tokens))
+        end_t = time.perf_counter_ns()
+        times["parse"] = end_t - start_t
+    else:
+        # older versions can only parse text, so estimate the time to parse
+        # by subtracting the time to tokenize
+        start_t = time.perf_counter_ns()
+        ast_node = VnnLibParser.parse(text, strict=strict)
+        end_t = time.perf_counter_ns()
+        times["parse"] = max(end_t - start_t - times["tokenize"], 0)
+
+    start_t = time.perf_counter_ns()
+    transformer = CompatTransformer("X", "Y")
+    commands = [transformer.transform(command) for command in ast_node.commands]
+    end_t = time.perf_counter_ns()
+    times["transform"] = end_t - start_t
+
+    start_t = time.perf_counter_ns()
+    _ = transformer.transform_Script(*(c for c in commands if c is not Discard))
+    end_t = time.perf_counter_ns()
+    times["result"] = end_t - start_t
+    return times
+
+
+def run_benchmark_in_process(
+    benchmark: str, repeat: int, warmup: int, strict: bool
+) -> list[tuple]:
+    warnings.simplefilter("ignore")
+    results = []
+    for sub_benchmark, row in iter_instances(benchmark):
+        vnnlib_file = sub_benchmark / row[1]
+        print(f"timing {vnnlib_file}", file=sys.stderr)
+        for _ in range(warmup):
+            _ = time_phases(vnnlib_file, strict)
+        phase_times = [time_phases(vnnlib_file, strict) for _ in range(repeat)]
+        best_times = [min(times[phase] for times in phase_times) for phase in PHASES]
+        results.append(
+            (
+                benchmark,
+                sub_benchmark.name,
+                (sub_benchmark / row[0]).name,
+                vnnlib_file.name,
+                sum(best_times),
+                *best_times,
+            )
+        )
+    return results
+
+
+def run_benchmark(
+    benchmark: str, command: list[str]
+) -> list[tuple[str, str, str, str, int]]:
+    results = []
+    for sub_benchmark, row in iter_instances(benchmark):
+        formatted_command = [
+            arg.format(
+                onnx_file=sub_benchmark / row[0],
+                vnnlib_file=sub_benchmark / row[1],
+            )
+            for arg in command
+        ]
+        print(" ".join(formatted_command), file=sys.stderr)
+        start_t = time.perf_counter_ns()
+        proc = sp.run(formatted_command, stdout=sp.PIPE, stderr=sp.STDOUT)
+        end_t = time.perf_counter_ns()
+        if proc.returncode != 0:
+            print(proc.stdout.decode(), file=sys.stderr)
+            raise RuntimeError("Process failed.")
+        results.append(
+            (
+                benchmark,
+                sub_benchmark.name,
+                (sub_benchmark / row[0]).name,
+                (sub_benchmark / row[1]).name,
+                end_t - start_t,
+            )
+        )
     return results
 
 
@@ -109,7 +237,17 @@ def main(args: list[str] | None = None):
         results = []
         for benchmark in parsed_args.benchmark:
             prepare_benchmark(benchmark)
-            results.extend(run_benchmark(benchmark, parsed_args.command))
+            if parsed_args.in_process:
+                results.extend(
+                    run_benchmark_in_process(
+                        benchmark,
+                        parsed_args.repeat,
+                        parsed_args.warmup,
+                        parsed_args.strict,
+                    )
+                )
+            else:
+                results.extend(run_benchmark(benchmark, parsed_args.command))
 
         if output_path:
             with open(output_path, "w") as csvfile:
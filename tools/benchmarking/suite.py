@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+import argparse
+import csv
+import dataclasses
+import pathlib
+import sys
+import tempfile
+import time
+import warnings
+from typing import Any, Callable
+
+from generate import COMPRESSIONS, LITERAL_FORMATS, SpecConfig, generate_file
+
+from vnnlib.compat import CompatTransformer, read_vnnlib_simple
+from vnnlib.parser import VnnLibParser
+from vnnlib.tokenizer import tokenize
+
+STAGES = ("tokenize", "parse", "transform", "read_vnnlib_simple")
+COLUMNS = (
+    "num_inputs",
+    "stage",
+    "bytes",
+    "commands",
+    "tokens",
+    "time",
+    "mb_per_s",
+    "commands_per_s",
+)
+
+
+@dataclasses.dataclass
+class ParsedArgs:
+    output: pathlib.Path | None
+    plot: pathlib.Path | None
+    scales: list[int]
+    num_outputs: int
+    num_disjuncts: int
+    depth: int
+    literals: str
+    compression: str
+    repeat: int
+    seed: int
+
+
+def parse_args(args: list[str] | None = None) -> ParsedArgs:
+    parser = argparse.ArgumentParser(
+        description="Benchmark vnnlib on synthetic specs of increasing size."
+    )
+    parser.add_argument("-o", "--output", type=pathlib.Path)
+    parser.add_argument(
+        "--plot", type=pathlib.Path, help="directory to save scaling curves to"
+    )
+    parser.add_argument(
+        "--scales",
+        type=lambda s: [int(n) for n in s.split(",")],
+        default=[100, 1000, 10000, 100000],
+        help="comma separated numbers of inputs (default: 100,1000,10000,100000)",
+    )
+    parser.add_argument("--num_outputs", type=int, default=10)
+    parser.add_argument("--num_disjuncts", type=int, default=9)
+    parser.add_argument("--depth", type=int, default=1)
+    parser.add_argument("--literals", choices=LITERAL_FORMATS, default="decimal")
+    parser.add_argument("--compression", choices=COMPRESSIONS, default="none")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    return ParsedArgs(**vars(parser.parse_args(args)))
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start_t = time.perf_counter_ns()
+        result = func()
+        end_t = time.perf_counter_ns()
+        best = min(best, (end_t - start_t) / 1e9)
+    return best, result
+
+
+def run_scale(
+    path: pathlib.Path, config: SpecConfig, repeat: int
+) -> list[dict[str, Any]]:
+    strict = config.strict
+    source = _read_text(path)
+    num_bytes = len(source.encode())
+
+    tokenize_time, tokens = best_time(
+        lambda: list(tokenize(source, strict=strict)), repeat
+    )
+    parse_time, ast_node = best_time(
+        lambda: VnnLibParser.parse(source, strict=strict), repeat
+    )
+    transform_time, _ = best_time(
+        lambda: CompatTransformer("X", "Y").transform(ast_node), repeat
+    )
+    read_time, _ = best_time(
+        lambda: read_vnnlib_simple(path, config.num_inputs, config.num_outputs),
+        repeat,
+    )
+
+    num_commands = len(ast_node.commands)
+    rows = []
+    for stage, seconds in zip(
+        STAGES, (tokenize_time, parse_time, transform_time, read_time)
+    ):
+        rows.append(
+            {
+                "num_inputs": config.num_inputs,
+                "stage": stage,
+                "bytes": num_bytes,
+                "commands": num_commands,
+                "tokens": len(tokens),
+                "time": seconds,
+                "mb_per_s": num_bytes / 1e6 / seconds,
+                "commands_per_s": num_commands / seconds,
+            }
+        )
+    return rows
+
+
+def _read_text(path: pathlib.Path) -> str:
+    for open_func, suffix in COMPRESSIONS.values():
+        if suffix and path.suffix == suffix:
+            with open_func(path, "rt") as f:
+                return f.read()
+    with open(path) as f:
+        return f.read()
+
+
+def plot_scaling(results: list[dict[str, Any]], output_dir: pathlib.Path) -> None:
+    import matplotlib.pyplot as plt
+
+    output_dir.mkdir(exist_ok=True, parents=True)
+    for metric, ylabel in (("time", "time (s)"), ("mb_per_s", "throughput (MB/s)")):
+        fig, ax = plt.subplots(figsize=(10, 8))
+        for stage in STAGES:
+            stage_results = [r for r in results if r["stage"] == stage]
+            ax.plot(
+                [r["bytes"] for r in stage_results],
+                [r[metric] for r in stage_results],
+                marker="o",
+                label=stage,
+            )
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("spec size (bytes)")
+        ax.set_ylabel(ylabel)
+        ax.legend()
+        fig.savefig(output_dir / f"scaling_{metric}.png", bbox_inches="tight")
+        plt.close(fig)
+
+
+def main(args: list[str] | None = None):
+    parsed_args = parse_args(args)
+    warnings.simplefilter("ignore")
+
+    results = []
+    with tempfile.TemporaryDirectory() as working_dir:
+        for num_inputs in parsed_args.scales:
+            config = SpecConfig(
+                num_inputs=num_inputs,
+                num_outputs=parsed_args.num_outputs,
+                num_disjuncts=parsed_args.num_disjuncts,
+                depth=parsed_args.depth,
+                literals=parsed_args.literals,
+                seed=parsed_args.seed,
+            )
+            path = generate_file(
+                pathlib.Path(working_dir) / f"spec_{num_inputs}.vnnlib",
+                config,
+                parsed_args.compression,
+            )
+            print(f"benchmarking {path.name}...", file=sys.stderr)
+            results.extend(run_scale(path, config, parsed_args.repeat))
+
+    if parsed_args.output:
+        with open(parsed_args.output, "w", newline="") as csvfile:
+            csvwriter = csv.DictWriter(csvfile, fieldnames=COLUMNS)
+            csvwriter.writeheader()
+            csvwriter.writerows(results)
+    else:
+        print(",".join(COLUMNS))
+        for result in results:
+            print(",".join(str(result[column]) for column in COLUMNS))
+
+    if parsed_args.plot:
+        plot_scaling(results, parsed_args.plot)
+
+
+if __name__ == "__main__":
+    main()
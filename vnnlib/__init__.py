@@ -1,4 +1,5 @@
 from .__version__ import __version__
 from .parser import VnnLibParser, parse_file
+from .transformer import AstNodeTransformer
 
 __all__ = ["AstNodeTransformer", "VnnLibParser", "parse_file"]
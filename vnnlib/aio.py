@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .compat import Box, FactoredResult, read_vnnlib_simple
+from .errors import ParseCancelledError
+from .limits import CancelToken, Limits
+from .parser import AstNode, Command, VnnLibParser, _read_text, parse_file
+from .tokenizer import tokenize
+
+# how many commands are sent to the event loop at a time
+_BATCH_SIZE = 256
+
+
+def _with_cancel_token(limits: Optional[Limits]) -> Limits:
+    # the limits of the caller are copied rather than changed, unless they
+    # already have a cancel token, which is then cancelled with the task
+    if limits is None:
+        return Limits(cancel_token=CancelToken())
+    if limits.cancel_token is not None:
+        return limits
+    limits = copy.copy(limits)
+    limits.cancel_token = CancelToken()
+    return limits
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+async def _run(executor: Optional[Executor], func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    # cancel tokens cannot be sent to other processes, so work in a process
+    # pool is only cancelled if it has not started yet
+    limits: Optional[Limits] = kwargs.get("limits")
+    if not isinstance(executor, ProcessPoolExecutor):
+        limits = kwargs["limits"] = _with_cancel_token(limits)
+    future = loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+    try:
+        # the work is shielded, so that it can be stopped with the cancel token
+        # and its result or exception retrieved once it has stopped
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        if limits is not None and limits.cancel_token is not None:
+            limits.cancel_token.cancel()
+        future.add_done_callback(_consume_exception)
+        raise
+
+
+async def parse_file_async(
+    filename: Union[str, Path],
+    strict=True,
+    executor: Optional[Executor] = None,
+    **kwargs,
+) -> AstNode:
+    """Parse a file like :func:`vnnlib.parser.parse_file`, without blocking the event loop.
+
+    Reading, decompressing, and parsing the file run in ``executor``, or the
+    default executor of the event loop if it is not given, and the other
+    keyword arguments are passed to :func:`vnnlib.parser.parse_file`. If the
+    task is cancelled, work in a thread executor stops soon after, through
+    the cancel token of ``limits``.
+    """
+    return await _run(executor, parse_file, filename, strict, **kwargs)
+
+
+async def read_vnnlib_simple_async(
+    vnnlib_filename: Union[str, Path],
+    num_inputs: int,
+    num_outputs: int,
+    executor: Optional[Executor] = None,
+    **kwargs,
+) -> Union[List[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]], FactoredResult]:
+    """Read a spec like :func:`vnnlib.compat.read_vnnlib_simple`, without blocking the event loop.
+
+    The other keyword arguments are passed to
+    :func:`vnnlib.compat.read_vnnlib_simple`, and cancelling works as in
+    :func:`parse_file_async`.
+    """
+    return await _run(
+        executor, read_vnnlib_simple, vnnlib_filename, num_inputs, num_outputs, **kwargs
+    )
+
+
+async def iter_commands_async(
+    filename: Union[str, Path], strict=True, executor: Optional[Executor] = None
+) -> AsyncIterator[Command]:
+    """Parse a file in the background, yielding each command as it is parsed.
+
+    Commands are sent from the parser to the event loop in batches. Parsing
+    stops if the iterator is closed early. Since the commands are passed
+    through memory, ``executor`` must run work in threads of this process.
+    """
+    if isinstance(executor, ProcessPoolExecutor):
+        raise TypeError("commands can only be streamed from a thread executor")
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[Tuple[List[Command], Optional[BaseException], bool]]
+    queue = asyncio.Queue()
+    cancel_token = CancelToken()
+
+    def send(commands: List[Command], error=None, done=False) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, (commands, error, done))
+
+    def produce() -> None:
+        batch: List[Command] = []
+        try:
+            text = _read_text(Path(filename), None)
+            tokens = Limits(cancel_token=cancel_token).limit_tokens(
+                tokenize(text, strict=strict)
+            )
+            for command in VnnLibParser.iter_parse_tokens(tokens):
+                batch.append(command)
+                if len(batch) >= _BATCH_SIZE:
+                    send(batch)
+                    batch = []
+            send(batch, done=True)
+        except ParseCancelledError:
+            pass
+        except BaseException as e:
+            # commands parsed before the error are still yielded
+            send(batch, error=e, done=True)
+
+    future = loop.run_in_executor(executor, produce)
+    try:
+        while True:
+            commands, error, done = await queue.get()
+            for command in commands:
+                yield command
+            if error is not None:
+                raise error
+            if done:
+                break
+    finally:
+        cancel_token.cancel()
+        await asyncio.wait([future])
+
+
+__all__ = ["iter_commands_async", "parse_file_async", "read_vnnlib_simple_async"]
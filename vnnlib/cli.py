@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 import argparse
+import cProfile
 import pickle
+import pstats
 import sys
+import time
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from .__version__ import __version__
 from .compat import CompatTransformer
 from .errors import VnnLibError
+from .evaluate import read_counterexample, read_vnnlib_evaluator
 from .parser import parse_file
+from .stats import ParseStats
+
+Function = Tuple[str, int, str]
 
 
 def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -23,6 +30,13 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser.add_argument(
         "--compat", action="store_true", help="Use the VNN-COMP-1 output format"
     )
+    parser.add_argument(
+        "--check",
+        type=Path,
+        metavar="COUNTEREXAMPLE",
+        help="Check whether a VNN-COMP counterexample, as a list of (name value)"
+        " pairs, satisfies the spec",
+    )
     if sys.version_info >= (3, 9, 0):
         parser.add_argument(
             "--strict",
@@ -46,22 +60,174 @@ def parse_args(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser.add_argument(
         "-o", "--output", type=str, help="The path to save the compiled output"
     )
-    return parser.parse_args(args)
+    parser.add_argument(
+        "--simplify",
+        action="store_true",
+        help="Simplify the spec before compiling it",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print a summary of the time and size of each phase",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        help="The path to save cProfile statistics of the whole pipeline to",
+    )
+    parser.add_argument(
+        "--profile-collapsed",
+        type=Path,
+        help="The path to save the profile to as collapsed stacks, for flame graphs",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="The number of times to run the pipeline (default: 1)",
+    )
+    parsed_args = parser.parse_args(args)
+    if parsed_args.repeat < 1:
+        parser.error("argument --repeat: must be at least 1")
+    return parsed_args
+
+
+def check(parsed_args: argparse.Namespace) -> None:
+    """Check a counterexample against a spec, exiting with status 1 if it is invalid."""
+    evaluator = read_vnnlib_evaluator(parsed_args.file)
+    values = read_counterexample(parsed_args.check)
+    try:
+        satisfied = evaluator.check_assignment(values)
+    except ValueError as e:
+        raise VnnLibError(f"Invalid counterexample: {e}") from e
+    if satisfied:
+        print(f"counterexample satisfies the spec: {parsed_args.file}")
+    else:
+        print(f"counterexample does not satisfy the spec: {parsed_args.file}")
+        raise SystemExit(1)
+
+
+def _function_name(function: Function) -> str:
+    filename, line, name = function
+    if filename == "~":
+        # built-in functions have no file
+        return name
+    return f"{Path(filename).name}:{line}({name})"
+
+
+def write_collapsed_stacks(profile: pstats.Stats, file: Any) -> None:
+    """Write a profile as collapsed stacks, with times in microseconds.
+
+    cProfile only records the callers of each function, not full stacks, so
+    stacks are reconstructed by splitting the time of each function between
+    its callees in proportion to the time spent in each of them.
+    """
+    # mypy does not know about the stats attribute of pstats.Stats
+    raw_stats: Dict[Function, Any] = profile.stats  # type: ignore
+    callees: Dict[Function, List[Tuple[Function, float]]] = {}
+    roots = []
+    for function, (_, _, _, _, callers) in raw_stats.items():
+        if not callers:
+            roots.append(function)
+        for caller, (_, _, _, cumulative_time) in callers.items():
+            callees.setdefault(caller, []).append((function, cumulative_time))
+
+    stacks: Dict[str, float] = {}
+    pending: List[Tuple[Tuple[Function, ...], float]] = [
+        ((root,), raw_stats[root][3]) for root in roots
+    ]
+    while pending:
+        stack, total_time = pending.pop()
+        function = stack[-1]
+        _, _, self_time, cumulative_time, _ = raw_stats[function]
+        if cumulative_time <= 0:
+            continue
+        scale = total_time / cumulative_time
+        key = ";".join(_function_name(f) for f in stack)
+        stacks[key] = stacks.get(key, 0.0) + self_time * scale
+        for callee, callee_time in callees.get(function, []):
+            if callee not in stack:
+                pending.append((stack + (callee,), callee_time * scale))
+    for key, total_time in sorted(stacks.items()):
+        microseconds = round(total_time * 1e6)
+        if microseconds > 0:
+            file.write(f"{key} {microseconds}\n")
+
+
+def format_stats(runs: List[Tuple[float, ParseStats]]) -> str:
+    """Summarize the stats of repeated runs of the pipeline."""
+    phases: List[str] = []
+    for _, stats in runs:
+        phases.extend(phase for phase in stats.phase_times if phase not in phases)
+    lines = [f"{'phase':<12}{'min (s)':>12}{'mean (s)':>12}"]
+    for phase in phases + ["total"]:
+        if phase == "total":
+            times = [total_time for total_time, _ in runs]
+        else:
+            times = [stats.phase_times.get(phase, 0.0) for _, stats in runs]
+        lines.append(f"{phase:<12}{min(times):>12.6f}{sum(times) / len(times):>12.6f}")
+
+    stats = runs[-1][1]
+    token_counts = ", ".join(
+        f"{token_type}={count}"
+        for token_type, count in sorted(stats.token_counts.items())
+    )
+    lines.extend(
+        [
+            f"runs: {len(runs)}",
+            f"bytes read: {stats.bytes_read}",
+            f"tokens: {stats.num_tokens} ({token_counts})",
+            f"nodes: {stats.num_nodes}",
+            f"max depth: {stats.max_depth}",
+            f"declared symbols: {len(stats.declared_symbols)}",
+            "disjuncts: "
+            f"{stats.disjuncts_before_dedupe} ({stats.disjuncts_after_dedupe} unique)",
+        ]
+    )
+    return "\n".join(lines)
 
 
 def main(args: Optional[Sequence[str]] = None) -> None:
     parsed_args = parse_args(args)
+    if parsed_args.check is not None:
+        return check(parsed_args)
     file: Path = parsed_args.file
     print(f"parsing file: {parsed_args.file}")
-    print(parsed_args)
 
     if parsed_args.compat:
         if ".vnnlib" in file.suffixes:
-            ast_node = parse_file(file, strict=parsed_args.strict)
-            result = CompatTransformer("X", "Y").transform(ast_node)
+            profiler = None
+            if parsed_args.profile or parsed_args.profile_collapsed:
+                profiler = cProfile.Profile()
+            runs = []
+            for _ in range(parsed_args.repeat):
+                stats = ParseStats() if parsed_args.stats else None
+                if profiler is not None:
+                    profiler.enable()
+                start_t = time.perf_counter()
+                ast_node = parse_file(
+                    file,
+                    strict=parsed_args.strict,
+                    stats=stats,
+                    simplify=parsed_args.simplify,
+                )
+                result = CompatTransformer("X", "Y", stats=stats).transform(ast_node)
+                end_t = time.perf_counter()
+                if profiler is not None:
+                    profiler.disable()
+                if stats is not None:
+                    runs.append((end_t - start_t, stats))
             if parsed_args.output:
                 with open(parsed_args.output, "wb+") as f:
                     pickle.dump(result, f)
+            if profiler is not None:
+                if parsed_args.profile:
+                    profiler.dump_stats(parsed_args.profile)
+                if parsed_args.profile_collapsed:
+                    with open(parsed_args.profile_collapsed, "w") as f:
+                        write_collapsed_stacks(pstats.Stats(profiler), f)
+            if runs:
+                print(format_stats(runs))
         else:
             raise VnnLibError(f"Unsupported file type: {file.suffix}")
     else:
@@ -3,13 +3,21 @@ from __future__ import annotations
 import operator
 import pathlib
 import re
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
-from .parser import Real, parse_file
+from .errors import ParserError
+from .limits import Limits
+from .parser import OPENERS, AstNode, Real, parse_file
+from .stats import ParseStats
 from .transformer import AstNodeTransformer
 
+# the coefficients and right hand side of a row of an output polytope
+PolytopeRow = Tuple[List[Real], List[Real]]
+# an input box, as a list of [lower, upper] pairs, or as a (2, *shape) array
+Box = Union[List[List[Real]], np.ndarray]
+
 
 class CompatTransformer(AstNodeTransformer):
     def __init__(
@@ -18,16 +26,40 @@ class CompatTransformer(AstNodeTransformer):
         output_name: str,
         input_size: Optional[int] = None,
         output_size: Optional[int] = None,
+        stats: Optional[ParseStats] = None,
+        stacked: bool = False,
+        input_shape: Optional[Tuple[int, ...]] = None,
+        output_shape: Optional[Tuple[int, ...]] = None,
+        shaped: bool = False,
+        limits: Optional[Limits] = None,
+        factored: bool = False,
     ) -> None:
         super().__init__()
+        if stacked and factored:
+            raise ValueError("the stacked and factored output modes cannot be combined")
         self.input_name = input_name
         self.output_name = output_name
+        self.stats = stats
+        self.stacked = stacked
+        self.shaped = shaped
+        self.limits = limits
+        self.factored = factored
 
+        if input_size is None and input_shape is not None:
+            input_size = int(np.prod(input_shape))
+        if output_size is None and output_shape is not None:
+            output_size = int(np.prod(output_shape))
         self.input_size = input_size or 0
         self.output_size = output_size or 0
+        self.input_shape = input_shape
+        self.output_shape = output_shape
 
         self.infer_input_size = input_size is None
         self.infer_output_size = output_size is None
+        # the largest index in each dimension of the declared variables, plus one
+        self._input_extent: Optional[List[int]] = None
+        self._output_extent: Optional[List[int]] = None
+        self._flat_indices: Dict[Tuple[int, ...], int] = {}
 
         self._io_name_pattern = re.compile(f"{self.input_name}|{self.output_name}")
         self._id_map: Dict[str, int] = {self.input_name: 0, self.output_name: 1}
@@ -36,10 +68,19 @@ class CompatTransformer(AstNodeTransformer):
         self._num_assertions = 0
         self._disjunctions: List[Dict[Tuple[int, ...], Real]] = [{}]
 
+    def transform(self, node: AstNode):
+        if self.stats is None:
+            return super().transform(node)
+        with self.stats.phase("transform"):
+            return super().transform(node)
+
     def transform_Assert(
         self,
         term: Union[List[Dict[Tuple[int, ...], Real]], Dict[Tuple[int, ...], Real]],
     ) -> List[Dict[Tuple[int, ...], Real]]:
+        limits = self.limits
+        if limits is not None:
+            limits.check()
         if isinstance(term, list):
             if len(term) == 1:
                 row_offset = self._num_assertions
@@ -50,14 +91,20 @@ class CompatTransformer(AstNodeTransformer):
                 self._num_assertions += max_row + (1 if len(term[0]) else 0)
             elif len(self._disjunctions) == 1:
                 assert len(self._disjunctions[0]) == 0, "please open a bug report"
+                if limits is not None:
+                    limits.check_disjuncts(len(term))
                 new_disjunctions = []
                 for disjunct in term:
                     new_disjunct = disjunct.copy()
                     new_disjunctions.append(new_disjunct)
                 self._disjunctions = new_disjunctions
             else:
+                if limits is not None:
+                    limits.check_disjuncts(len(term) * len(self._disjunctions))
                 new_disjunctions = []
                 for disjunct in term:
+                    if limits is not None:
+                        limits.check()
                     row_offset = max(disjunct, default=(-1,))[0] + 1
                     for _disjunct in self._disjunctions:
                         new_disjunct = disjunct.copy()
@@ -81,12 +128,14 @@ class CompatTransformer(AstNodeTransformer):
         return {(0, -1, -1): value}
 
     def transform_DeclareConst(self, symbol: str, sort: str) -> None:
-        if self.infer_input_size and symbol.startswith(f"{self.input_name}_"):
-            _, index = symbol.split("_")
-            self.input_size = max(self.input_size, int(index) + 1)
-        elif self.infer_output_size and symbol.startswith(f"{self.output_name}_"):
-            _, index = symbol.split("_")
-            self.output_size = max(self.output_size, int(index) + 1)
+        if symbol.startswith(f"{self.input_name}_"):
+            self._input_extent = _extend(self._input_extent, symbol)
+            if self.infer_input_size:
+                self.input_size = _product(self._input_extent)
+        elif symbol.startswith(f"{self.output_name}_"):
+            self._output_extent = _extend(self._output_extent, symbol)
+            if self.infer_output_size:
+                self.output_size = _product(self._output_extent)
         self._id_map[symbol] = len(self._id_map)
 
     def transform_FunctionApplication(
@@ -155,7 +204,7 @@ class CompatTransformer(AstNodeTransformer):
                 assert isinstance(term, dict)
                 for (row, *index), value in term.items():
                     assert row == 0
-                    assert len(index) == 2, "please open a bug report"
+                    assert len(index) >= 2, "please open a bug report"
                     conjuncts[(i, *index)] = value
             return [conjuncts]
         elif symbol == "or":
@@ -190,15 +239,74 @@ class CompatTransformer(AstNodeTransformer):
 
     def transform_Script(
         self, *commands
-    ) -> List[Tuple[List[List[Real]], List[Tuple[np.ndarray, np.ndarray]]]]:
-        common_box = [[float("-inf"), float("inf")] for _ in range(self.input_size)]
-        common_polytope: List[Tuple[List[float], List[float]]] = []
+    ) -> Union[List[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]], FactoredResult]:
+        if self.stats is None:
+            return self._build_output()
+        with self.stats.phase("result"):
+            result = self._build_output()
+        self.stats.disjuncts_before_dedupe += len(self._disjunctions)
+        self.stats.disjuncts_after_dedupe += len(
+            {
+                (np.asarray(box).tobytes(), mat.tobytes(), rhs.tobytes())
+                for box, polytopes in (
+                    result.polytopes if isinstance(result, FactoredResult) else result
+                )
+                for mat, rhs in _iter_polytopes(polytopes, self.stacked)
+            }
+        )
+        return result
+
+    def _build_output(
+        self,
+    ) -> Union[List[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]], FactoredResult]:
+        common_box, common_polytope = self._common_constraints()
+        groups = self._group_by_box(common_box)
+        if self.factored:
+            return FactoredResult(
+                _rows_to_arrays(common_polytope, self.output_size),
+                self._shape_boxes(
+                    [
+                        (
+                            box,
+                            [
+                                _rows_to_arrays(polytope, self.output_size)
+                                for polytope in polytopes
+                            ],
+                        )
+                        for box, polytopes in groups
+                    ]
+                ),
+            )
+        if self.stacked:
+            return self._shape_boxes(
+                self._build_stacked_result(common_polytope, groups)
+            )
+        return self._shape_boxes(self._build_result(common_polytope, groups))
+
+    def _new_box(self) -> Box:
+        if not self.shaped:
+            return [[float("-inf"), float("inf")] for _ in range(self.input_size)]
+        # bounds are scattered into a (2, n) array through its (n, 2) transpose,
+        # so that the box is reshaped to (2, *input_shape) without a copy
+        bounds = np.empty((2, self.input_size))
+        bounds[0] = -np.inf
+        bounds[1] = np.inf
+        return bounds.T
+
+    def _copy_box(self, box: Box) -> Box:
+        if isinstance(box, np.ndarray):
+            return box.T.copy().T
+        return [interval.copy() for interval in box]
+
+    def _common_constraints(self) -> Tuple[Box, List[PolytopeRow]]:
+        common_box = self._new_box()
+        common_polytope: List[PolytopeRow] = []
         input_box_rows = set()
         output_polytope_rows = set()
         rhs: Union[float, int] = 0
-        for (row, var_type, index), value in sorted(
-            self._assertions.items(), key=operator.itemgetter(0)
-        ):
+        for key, value in sorted(self._assertions.items(), key=operator.itemgetter(0)):
+            row, var_type = key[0], key[1]
+            index = key[2] if len(key) == 3 else self._flat_index(key)
             assert var_type != 1 or row not in input_box_rows
             if var_type == -1:
                 rhs = value
@@ -222,69 +330,387 @@ class CompatTransformer(AstNodeTransformer):
                 common_polytope[polytope_row][0][index] = value
                 continue
             raise RuntimeError(f"unexpected variable type {var_type}")
-        results: Dict[
-            str, Tuple[List[List[float]], List[Tuple[np.ndarray, np.ndarray]]]
-        ] = {}
-        for disjunct in self._disjunctions:
-            box = [interval.copy() for interval in common_box]
-            polytope = [[lhs.copy(), rhs.copy()] for lhs, rhs in common_polytope]
-            input_box_rows = set()
-            disjunct_output_polytope_rows: Dict[int, int] = {}
-            rhs = 0
-            for (row, var_type, index), value in sorted(
-                disjunct.items(), key=operator.itemgetter(0)
-            ):
-                assert var_type != 1 or row not in input_box_rows
-                if var_type == -1:
-                    rhs = value
-                    continue
-                if var_type == 0:
-                    input_box_rows.add(row)
-                    if value > 0:
-                        box[index][1] = min(-rhs / value, box[index][1])
-                    elif value < 0:
-                        box[index][0] = max(-rhs / value, box[index][0])
+        return common_box, common_polytope
+
+    def _disjunct_constraints(
+        self, disjunct: Dict[Tuple[int, ...], Real], common_box: Box
+    ) -> Tuple[Box, List[PolytopeRow]]:
+        # returns the box of the disjunct, which is only copied from the common
+        # box if the disjunct constrains the inputs, and the polytope rows of the
+        # disjunct, without the common rows
+        box = common_box
+        polytope: List[PolytopeRow] = []
+        input_box_rows = set()
+        disjunct_output_polytope_rows: Dict[int, int] = {}
+        rhs: Union[float, int] = 0
+        for key, value in sorted(disjunct.items(), key=operator.itemgetter(0)):
+            row, var_type = key[0], key[1]
+            index = key[2] if len(key) == 3 else self._flat_index(key)
+            assert var_type != 1 or row not in input_box_rows
+            if var_type == -1:
+                rhs = value
+                continue
+            if var_type == 0:
+                input_box_rows.add(row)
+                if box is common_box:
+                    box = self._copy_box(common_box)
+                if value > 0:
+                    box[index][1] = min(-rhs / value, box[index][1])
+                elif value < 0:
+                    box[index][0] = max(-rhs / value, box[index][0])
+                rhs = 0
+                continue
+            if var_type == 1:
+                if row not in disjunct_output_polytope_rows:
+                    disjunct_output_polytope_rows[row] = len(
+                        disjunct_output_polytope_rows
+                    )
+                polytope_row = disjunct_output_polytope_rows[row]
+                if len(polytope) <= polytope_row:
+                    polytope.append(([0 for _ in range(self.output_size)], [-rhs]))
                     rhs = 0
-                    continue
-                if var_type == 1:
-                    if row not in disjunct_output_polytope_rows:
-                        disjunct_output_polytope_rows[row] = len(
-                            disjunct_output_polytope_rows
-                        )
-                    polytope_row = disjunct_output_polytope_rows[row]
-                    if len(polytope) <= polytope_row:
-                        polytope.append([[0 for _ in range(self.output_size)], [-rhs]])
-                        rhs = 0
-                    polytope[polytope_row][0][index] = value
-                    continue
-                raise RuntimeError(f"unexpected variable type {var_type}")
-            box_str = np.asarray(box).data.hex()
-            polytope_arr = (
-                np.array([lhs for lhs, _ in polytope]),
-                np.array([rhs for _, rhs in polytope]),
+                polytope[polytope_row][0][index] = value
+                continue
+            raise RuntimeError(f"unexpected variable type {var_type}")
+        return box, polytope
+
+    def _shape(self, var_type: int) -> Tuple[int, ...]:
+        if var_type == 0:
+            shape, extent, size = self.input_shape, self._input_extent, self.input_size
+        else:
+            shape, extent, size = (
+                self.output_shape,
+                self._output_extent,
+                self.output_size,
             )
-            if box_str not in results:
-                results[box_str] = (box, [polytope_arr])
+        if shape is not None:
+            return shape
+        if extent is not None and _product(extent) == size:
+            return tuple(extent)
+        return (size,)
+
+    def _flat_index(self, key: Tuple[int, ...]) -> int:
+        # the C order index of a variable with several indices, such as X_0_3_17
+        index = key[1:]
+        flat_index = self._flat_indices.get(index)
+        if flat_index is None:
+            shape = self._shape(index[0])
+            if len(shape) != len(index) - 1:
+                # the names are indexed differently than the given shape
+                extent = self._input_extent if index[0] == 0 else self._output_extent
+                assert extent is not None
+                shape = tuple(extent)
+            flat_index = int(np.ravel_multi_index(index[1:], shape))
+            self._flat_indices[index] = flat_index
+        return flat_index
+
+    def _shape_boxes(
+        self, result: Sequence[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]]
+    ) -> List[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]]:
+        if not self.shaped:
+            return list(result)
+        shape = self._shape(0)
+        # the transpose of each box is a contiguous (2, n) array, so this is a view
+        return [
+            (np.asarray(box).T.reshape(2, *shape), polytopes)
+            for box, polytopes in result
+        ]
+
+    def _group_by_box(
+        self, common_box: Box
+    ) -> List[Tuple[Box, List[List[PolytopeRow]]]]:
+        groups: Dict[str, Tuple[Box, List[List[PolytopeRow]]]] = {}
+        for disjunct in self._disjunctions:
+            box, polytope = self._disjunct_constraints(disjunct, common_box)
+            box_str = np.asarray(box).data.hex()
+            if box_str not in groups:
+                groups[box_str] = (box, [polytope])
             else:
-                results[box_str][1].append(polytope_arr)
-        return list(results.values())
+                groups[box_str][1].append(polytope)
+        return list(groups.values())
+
+    def _build_result(
+        self,
+        common_polytope: List[PolytopeRow],
+        groups: List[Tuple[Box, List[List[PolytopeRow]]]],
+    ) -> List[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]]:
+        common_lhs = [lhs for lhs, _ in common_polytope]
+        common_rhs = [rhs for _, rhs in common_polytope]
+        return [
+            (
+                box,
+                [
+                    (
+                        np.array(common_lhs + [lhs for lhs, _ in polytope]),
+                        np.array(common_rhs + [rhs for _, rhs in polytope]),
+                    )
+                    for polytope in polytopes
+                ],
+            )
+            for box, polytopes in groups
+        ]
+
+    def _build_stacked_result(
+        self,
+        common_polytope: List[PolytopeRow],
+        groups: List[Tuple[Box, List[List[PolytopeRow]]]],
+    ) -> List[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]]:
+        common_lhs = [lhs for lhs, _ in common_polytope]
+        common_rhs = [rhs for _, rhs in common_polytope]
+        results = []
+        for box, polytopes in groups:
+            shapes: Dict[int, List[List[PolytopeRow]]] = {}
+            for polytope in polytopes:
+                shapes.setdefault(len(polytope), []).append(polytope)
+            stacked_polytopes = []
+            for num_rows, group in shapes.items():
+                shape = (len(group), len(common_polytope) + num_rows)
+                mat = np.array(
+                    [common_lhs + [lhs for lhs, _ in polytope] for polytope in group]
+                )
+                rhs = np.array(
+                    [common_rhs + [rhs for _, rhs in polytope] for polytope in group]
+                )
+                stacked_polytopes.append(
+                    (
+                        mat.reshape(*shape, self.output_size),
+                        rhs.reshape(*shape, 1),
+                    )
+                )
+            results.append((box, stacked_polytopes))
+        return results
+
+
+class FactoredResult:
+    """A compat result with the constraints shared by all disjuncts stored once.
+
+    ``common`` holds the output polytope rows ``(mat, rhs)`` that every
+    disjunct has, with shapes ``(rows, num_outputs)`` and ``(rows, 1)``.
+    ``polytopes`` has the format of :func:`read_vnnlib_simple`, with each box
+    and the additional rows of each of its disjuncts, so that the polytope of
+    a disjunct is the common rows followed by its own rows.
+    """
+
+    __slots__ = ("common", "polytopes")
+
+    def __init__(
+        self,
+        common: Tuple[np.ndarray, np.ndarray],
+        polytopes: List[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]],
+    ) -> None:
+        self.common = common
+        self.polytopes = polytopes
+
+    def to_legacy(self) -> List[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]]:
+        """Expand the common rows into every disjunct, as in :func:`read_vnnlib_simple`."""
+        common_mat, common_rhs = self.common
+        results = []
+        for box, polytopes in self.polytopes:
+            legacy_polytopes = []
+            for mat, rhs in polytopes:
+                if len(common_mat) == 0 and len(mat) == 0:
+                    # empty polytopes are returned as empty 1-d arrays
+                    legacy_polytopes.append((np.array([]), np.array([])))
+                else:
+                    legacy_polytopes.append(
+                        (
+                            np.concatenate([common_mat, mat]),
+                            np.concatenate([common_rhs, rhs]),
+                        )
+                    )
+            results.append((box, legacy_polytopes))
+        return results
+
+    def __repr__(self) -> str:
+        return (
+            f"FactoredResult(common_rows={len(self.common[0])},"
+            f" boxes={len(self.polytopes)})"
+        )
+
+
+def _rows_to_arrays(
+    polytope: List[PolytopeRow], num_outputs: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    mat = np.array([lhs for lhs, _ in polytope])
+    rhs = np.array([rhs for _, rhs in polytope])
+    return mat.reshape(len(polytope), num_outputs), rhs.reshape(len(polytope), 1)
+
+
+def _extend(extent: Optional[List[int]], symbol: str) -> List[int]:
+    _, *str_index = symbol.split("_")
+    index = [int(i) for i in str_index]
+    if extent is None:
+        return [i + 1 for i in index]
+    if len(index) != len(extent):
+        raise RuntimeError(
+            f"expected {len(extent)} indices for variable {symbol!r}, got {len(index)}"
+        )
+    return [max(e, i + 1) for e, i in zip(extent, index)]
+
+
+def _product(values: List[int]) -> int:
+    result = 1
+    for value in values:
+        result *= value
+    return result
+
+
+def _iter_polytopes(
+    polytopes: List[Tuple[np.ndarray, np.ndarray]], stacked: bool
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    if not stacked:
+        yield from polytopes
+        return
+    for mat, rhs in polytopes:
+        yield from zip(mat, rhs)
+
+
+# comments, complete declarations, and the start of any other command
+_HEADER_PATTERN = re.compile(
+    rb";[^\n\r]*"
+    rb"|\(\s*declare-const\s+([^\s()|;]+)\s+([^\s()|;]+)\s*\)"
+    rb"|\(\s*([^\s()|;]+)"
+)
+_CHUNK_SIZE = 1 << 16
+
+
+def _scan_io_extents(
+    vnnlib_filename: Union[str, pathlib.Path],
+    input_name: str,
+    output_name: str,
+    early_stop: bool,
+) -> Tuple[Optional[List[int]], Optional[List[int]]]:
+    # the declarations are found with a regular expression over chunks of raw
+    # bytes, and the part of a chunk that may hold an incomplete command is
+    # carried over to the next chunk
+    path = pathlib.Path(vnnlib_filename)
+    input_prefix = f"{input_name}_"
+    output_prefix = f"{output_name}_"
+    input_extent: Optional[List[int]] = None
+    output_extent: Optional[List[int]] = None
+    with OPENERS.get(path.suffix, open)(path, "rb") as f:
+        buffer = b""
+        while True:
+            chunk = f.read(_CHUNK_SIZE)
+            eof = not chunk
+            buffer += chunk
+            position = 0
+            for match in _HEADER_PATTERN.finditer(buffer):
+                command = match.group(3)
+                if not eof and (
+                    match.end() == len(buffer) or command == b"declare-const"
+                ):
+                    break
+                position = match.end()
+                symbol_bytes = match.group(1)
+                if symbol_bytes is not None:
+                    symbol = symbol_bytes.decode()
+                    if symbol.startswith(input_prefix):
+                        input_extent = _extend(input_extent, symbol)
+                    elif symbol.startswith(output_prefix):
+                        output_extent = _extend(output_extent, symbol)
+                elif command == b"declare-const":
+                    raise ParserError(
+                        f"Invalid declaration: {match.group().decode()!r}"
+                    )
+                elif command is not None and early_stop:
+                    return input_extent, output_extent
+            if eof:
+                return input_extent, output_extent
+            buffer = buffer[position:]
+
+
+def get_input_output_shapes(
+    vnnlib_filename: Union[str, pathlib.Path],
+    input_name: str = "X",
+    output_name: str = "Y",
+    early_stop=True,
+) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Get the shapes of the input and output of a spec without parsing it.
+
+    Only ``declare-const`` commands are read, with the shapes inferred from the
+    indices of the declared variables as in :class:`CompatTransformer`, so
+    ``X_0_3_17`` contributes to a 3-dimensional input shape. Compressed files
+    are decompressed as they are read. If ``early_stop`` is True, reading stops
+    at the first command that is not a declaration, which assumes that all
+    variables are declared before they are used in assertions.
+    """
+    input_extent, output_extent = _scan_io_extents(
+        vnnlib_filename, input_name, output_name, early_stop
+    )
+    return tuple(input_extent or (0,)), tuple(output_extent or (0,))
+
+
+def get_num_inputs_outputs(
+    vnnlib_filename: Union[str, pathlib.Path],
+    input_name: str = "X",
+    output_name: str = "Y",
+    early_stop=True,
+) -> Tuple[int, int]:
+    """Get the number of inputs and outputs of a spec without parsing it.
+
+    See :func:`get_input_output_shapes` for how the file is read.
+    """
+    input_shape, output_shape = get_input_output_shapes(
+        vnnlib_filename, input_name, output_name, early_stop
+    )
+    return _product(list(input_shape)), _product(list(output_shape))
 
 
 def read_vnnlib_simple(
-    vnnlib_filename: Union[str, pathlib.Path], num_inputs: int, num_outputs: int
-) -> List[Tuple[List[List[Real]], List[Tuple[np.ndarray, np.ndarray]]]]:
+    vnnlib_filename: Union[str, pathlib.Path],
+    num_inputs: int,
+    num_outputs: int,
+    stats: Optional[ParseStats] = None,
+    simplify=False,
+    stacked=False,
+    input_shape: Optional[Tuple[int, ...]] = None,
+    shaped=False,
+    limits: Optional[Limits] = None,
+    factored=False,
+    output_shape: Optional[Tuple[int, ...]] = None,
+) -> Union[List[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]], FactoredResult]:
     """process in a vnnlib file. You can get num_inputs and num_outputs using get_num_inputs_outputs().
 
     output a list containing 2-tuples:
         1. input ranges (box), list of pairs for each input variable
         2. specification, provided as a list of pairs (mat, rhs), as in: mat * y <= rhs, where y is the output.
                           Each element in the list is a term in a disjunction for the specification.
+
+    If stats is given, statistics about parsing and transforming the file are collected into it.
+    If simplify is True, the spec is simplified before it is transformed.
+    If stacked is True, the disjuncts of each box are grouped by their number of rows, and
+    each group is returned as a single pair (mat, rhs) of shapes (k, rows, num_outputs) and (k, rows, 1).
+    Inputs with several indices, such as X_0_3_17, are flattened in C order of input_shape, which is inferred
+    from the declared inputs if it is not given. If shaped is True, each box is returned as an array of shape
+    (2, *input_shape) of lower and upper bounds.
+    If limits is given, reading the file raises a LimitExceededError as soon as one of its limits is exceeded.
+    If factored is True, a FactoredResult is returned, with the output constraints that are shared by all
+    disjuncts stored once, which can be converted back to this format with FactoredResult.to_legacy().
+    Outputs with several indices, such as Y_0_3, are flattened in C order of output_shape in the same way.
     """
-    ast_node = parse_file(vnnlib_filename, strict=False)
-    result = CompatTransformer("X", "Y", num_inputs, num_outputs).transform(ast_node)
+    ast_node = parse_file(
+        vnnlib_filename, strict=False, stats=stats, simplify=simplify, limits=limits
+    )
+    result = CompatTransformer(
+        "X",
+        "Y",
+        num_inputs,
+        num_outputs,
+        stats=stats,
+        stacked=stacked,
+        input_shape=input_shape,
+        output_shape=output_shape,
+        shaped=shaped,
+        limits=limits,
+        factored=factored,
+    ).transform(ast_node)
     return result
 
 
 __all__ = [
+    "FactoredResult",
+    "get_input_output_shapes",
+    "get_num_inputs_outputs",
     "read_vnnlib_simple",
 ]
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import itertools
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+from .errors import ClauseLimitError
+from .parser import (
+    CORE_IDS,
+    Assert,
+    AstNode,
+    FunctionApplication,
+    Identifier,
+    Script,
+    Term,
+)
+from .transformer import AstNodeTransformer
+
+Clause = Tuple[Term, ...]
+# the number of clauses in the DNF of a term and of its negation
+ClauseCount = Tuple[int, int]
+
+_CONNECTIVES = frozenset(("and", "or", "not", "=>", "xor", "ite"))
+_ATOM_COUNT: ClauseCount = (1, 1)
+
+
+class ClauseCounter(AstNodeTransformer):
+    """Counts the clauses of the DNF of a script without expanding it.
+
+    The count is an upper bound, since clauses that would be deduplicated or are
+    trivially unsatisfiable are still counted.
+    """
+
+    def transform_Assert(self, term) -> ClauseCount:
+        return _as_count(term)
+
+    def transform_Constant(self, value) -> None:
+        return None
+
+    def transform_DeclareConst(self, symbol: str, sort: str) -> None:
+        return None
+
+    def transform_FunctionApplication(self, function: str, *terms) -> ClauseCount:
+        if function not in _CONNECTIVES:
+            return _ATOM_COUNT
+        counts = [_as_count(term) for term in terms]
+        if function == "and":
+            return _product(pos for pos, _ in counts), sum(neg for _, neg in counts)
+        if function == "or":
+            return sum(pos for pos, _ in counts), _product(neg for _, neg in counts)
+        if function == "not":
+            ((pos, neg),) = counts
+            return neg, pos
+        if function == "=>":
+            pos, neg = counts[-1]
+            for pos_i, neg_i in reversed(counts[:-1]):
+                pos, neg = neg_i + pos, pos_i * neg
+            return pos, neg
+        if function == "xor":
+            result = counts[0]
+            for count in counts[1:]:
+                result = _xor_count(result, count)
+            return result
+        if function == "ite":
+            (pos_c, neg_c), (pos_a, neg_a), (pos_b, neg_b) = counts
+            return pos_c * pos_a + neg_c * pos_b, (neg_c + neg_a) * (pos_c + neg_b)
+        raise RuntimeError(f"unexpected connective {function!r}")
+
+    def transform_Identifier(self, value: str) -> str:
+        return value
+
+    def transform_Script(self, *commands) -> int:
+        return _product(count[0] for count in commands if count is not None)
+
+
+def _as_count(term) -> ClauseCount:
+    if term == "true":
+        return 1, 0
+    if term == "false":
+        return 0, 1
+    if isinstance(term, tuple):
+        return term
+    return _ATOM_COUNT
+
+
+def _product(values) -> int:
+    result = 1
+    for value in values:
+        result *= value
+    return result
+
+
+def _xor_count(lhs: ClauseCount, rhs: ClauseCount) -> ClauseCount:
+    (pos_a, neg_a), (pos_b, neg_b) = lhs, rhs
+    return pos_a * neg_b + neg_a * pos_b, (neg_a + pos_b) * (pos_a + neg_b)
+
+
+def count_clauses(node: AstNode) -> int:
+    """Cheaply count the clauses in the DNF of a script or assertion."""
+    count = ClauseCounter().transform(node)
+    if isinstance(node, Script):
+        return count
+    return _as_count(count)[0]
+
+
+def _literal(term: Term, negate: bool) -> Clause:
+    if negate:
+        return (FunctionApplication(CORE_IDS["not"], term),)
+    return (term,)
+
+
+def _iter_conjunction(terms: Sequence[Term], negate: bool) -> Iterator[Clause]:
+    # the product of the clauses of each term, with an explicit stack of
+    # iterators, so that long conjunctions do not reach the recursion limit
+    if not terms:
+        yield ()
+        return
+    num_terms = len(terms)
+    iterators = [_iter_term(terms[0], negate)]
+    heads: List[Clause] = []
+    while iterators:
+        head = next(iterators[-1], None)
+        if head is None:
+            iterators.pop()
+            if heads:
+                heads.pop()
+            continue
+        if len(iterators) == num_terms:
+            yield tuple(itertools.chain.from_iterable(heads)) + head
+            continue
+        heads.append(head)
+        iterators.append(_iter_term(terms[len(iterators)], negate))
+
+
+def _iter_disjunction(terms: Sequence[Term], negate: bool) -> Iterator[Clause]:
+    for term in terms:
+        yield from _iter_term(term, negate)
+
+
+def _iter_term(term: Term, negate: bool) -> Iterator[Clause]:
+    if not isinstance(term, FunctionApplication):
+        if isinstance(term, Identifier) and term.value in ("true", "false"):
+            if (term.value == "true") != negate:
+                yield ()
+            return
+        yield _literal(term, negate)
+        return
+    function = term.function.value
+    terms = term.terms
+    if function == "and":
+        if negate:
+            yield from _iter_disjunction(terms, negate)
+        else:
+            yield from _iter_conjunction(terms, negate)
+    elif function == "or":
+        if negate:
+            yield from _iter_conjunction(terms, negate)
+        else:
+            yield from _iter_disjunction(terms, negate)
+    elif function == "not":
+        yield from _iter_term(terms[0], not negate)
+    elif function == "=>":
+        *premises, conclusion = terms
+        negated_premises = [FunctionApplication(CORE_IDS["not"], p) for p in premises]
+        yield from _iter_term(
+            FunctionApplication(CORE_IDS["or"], *negated_premises, conclusion), negate
+        )
+    elif function == "ite":
+        condition, then_term, else_term = terms
+        yield from _iter_term(
+            FunctionApplication(
+                CORE_IDS["or"],
+                FunctionApplication(CORE_IDS["and"], condition, then_term),
+                FunctionApplication(
+                    CORE_IDS["and"],
+                    FunctionApplication(CORE_IDS["not"], condition),
+                    else_term,
+                ),
+            ),
+            negate,
+        )
+    elif function == "xor":
+        result = terms[0]
+        for rhs in terms[1:]:
+            result = _xor(result, rhs)
+        yield from _iter_term(result, negate)
+    else:
+        yield _literal(term, negate)
+
+
+def _xor(lhs: Term, rhs: Term) -> Term:
+    return FunctionApplication(
+        CORE_IDS["or"],
+        FunctionApplication(
+            CORE_IDS["and"], lhs, FunctionApplication(CORE_IDS["not"], rhs)
+        ),
+        FunctionApplication(
+            CORE_IDS["and"], FunctionApplication(CORE_IDS["not"], lhs), rhs
+        ),
+    )
+
+
+def iter_dnf(
+    node: Union[Script, Assert, Term], max_clauses: Optional[int] = None
+) -> Iterator[Clause]:
+    """Lazily generate the clauses of the disjunctive normal form of a spec.
+
+    Each clause is a tuple of literals, which are either atoms (such as
+    comparisons) or negated atoms, and the spec holds iff any clause holds.
+    If ``max_clauses`` is given, the clauses are counted before any expansion,
+    and a ``ClauseLimitError`` is raised if there may be more than allowed.
+    """
+    if max_clauses is not None:
+        num_clauses = count_clauses(node)
+        if num_clauses > max_clauses:
+            raise ClauseLimitError(
+                f"DNF may have up to {num_clauses} clauses, "
+                f"more than the limit of {max_clauses}"
+            )
+    if isinstance(node, Script):
+        terms = [
+            command.term for command in node.commands if isinstance(command, Assert)
+        ]
+        return _iter_conjunction(terms, False)
+    if isinstance(node, Assert):
+        return _iter_term(node.term, False)
+    return _iter_term(node, False)
+
+
+__all__ = ["ClauseCounter", "count_clauses", "iter_dnf"]
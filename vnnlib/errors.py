@@ -10,4 +10,23 @@ class ParserError(VnnLibError):
     pass
 
 
-__all__ = ["ParserError", "TokenizerError", "VnnLibError"]
+class LimitExceededError(VnnLibError):
+    pass
+
+
+class ClauseLimitError(LimitExceededError):
+    pass
+
+
+class ParseCancelledError(VnnLibError):
+    pass
+
+
+__all__ = [
+    "ClauseLimitError",
+    "LimitExceededError",
+    "ParseCancelledError",
+    "ParserError",
+    "TokenizerError",
+    "VnnLibError",
+]
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import functools
+import operator
+import pathlib
+import re
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from .compat import _extend, _product
+from .parser import parse_file
+from .transformer import AstNodeTransformer
+
+_ARITHMETIC: Dict[str, Callable[[Any, Any], Any]] = {
+    "+": operator.add,
+    "*": operator.mul,
+    "/": np.true_divide,
+}
+_COMPARISONS: Dict[str, Callable[[Any, Any], Any]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "=": operator.eq,
+}
+_CONNECTIVES: Dict[str, Callable[[Any, Any], Any]] = {
+    "and": np.logical_and,
+    "or": np.logical_or,
+    "xor": np.logical_xor,
+}
+# a value in a VNN-COMP counterexample, such as (X_0 0.5)
+_ASSIGNMENT_PATTERN = re.compile(r"\(\s*([^\s()]+)\s+([^\s()]+)\s*\)")
+
+
+def _lift(func: Callable[..., Any], terms) -> Any:
+    # a compiled term is either a constant, or a function of the batches (x, y),
+    # and constant subterms are folded when the spec is compiled
+    if not any(callable(term) for term in terms):
+        return func(*terms)
+    evaluables = [
+        term if callable(term) else (lambda x, y, value=term: value) for term in terms
+    ]
+    if len(evaluables) == 1:
+        (evaluable,) = evaluables
+        return lambda x, y: func(evaluable(x, y))
+    if len(evaluables) == 2:
+        lhs, rhs = evaluables
+        return lambda x, y: func(lhs(x, y), rhs(x, y))
+    return lambda x, y: func(*(evaluable(x, y) for evaluable in evaluables))
+
+
+def _reduce(func: Callable[[Any, Any], Any]) -> Callable[..., Any]:
+    return lambda *values: functools.reduce(func, values)
+
+
+def _chain(func: Callable[[Any, Any], Any]) -> Callable[..., Any]:
+    def chained(*values):
+        if len(values) == 2:
+            return func(*values)
+        return functools.reduce(
+            np.logical_and, (func(a, b) for a, b in zip(values, values[1:]))
+        )
+
+    return chained
+
+
+def _subtract(*values):
+    if len(values) == 1:
+        return -values[0]
+    return functools.reduce(operator.sub, values)
+
+
+def _implies(*values):
+    result = values[-1]
+    for value in reversed(values[:-1]):
+        result = np.logical_or(np.logical_not(value), result)
+    return result
+
+
+def _ite(condition, then_value, else_value):
+    return np.where(condition, then_value, else_value)
+
+
+_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "-": _subtract,
+    "not": np.logical_not,
+    "=>": _implies,
+    "ite": _ite,
+    **{name: _reduce(func) for name, func in _ARITHMETIC.items()},
+    **{name: _chain(func) for name, func in _COMPARISONS.items()},
+    **{name: _reduce(func) for name, func in _CONNECTIVES.items()},
+}
+
+
+class BatchEvaluator:
+    """Evaluates a spec over batches of inputs and outputs.
+
+    ``evaluator(x, y)`` returns a boolean mask of shape ``(N,)`` that is True
+    for each pair ``(x[i], y[i])`` that satisfies every assertion, where ``x``
+    has shape ``(N, num_inputs)`` and ``y`` has shape ``(N, num_outputs)``. A
+    batch may also have shape ``(N, *shape)``, which is flattened in C order,
+    and a single point of shape ``(num_inputs,)`` is treated as a batch of one.
+    """
+
+    __slots__ = "num_inputs", "num_outputs", "variables", "_assertions"
+
+    def __init__(
+        self,
+        num_inputs: int,
+        num_outputs: int,
+        variables: Dict[str, Tuple[int, int]],
+        assertions: List[Any],
+    ):
+        self.num_inputs = num_inputs
+        self.num_outputs = num_outputs
+        # the variable type (0 for inputs and 1 for outputs) and column of each name
+        self.variables = variables
+        self._assertions = assertions
+
+    def __call__(self, x, y=None) -> np.ndarray:
+        x = _as_batch(x, self.num_inputs, "x")
+        num_points = x.shape[0]
+        if y is None:
+            y = np.zeros((num_points, 0))
+        y = _as_batch(y, self.num_outputs, "y")
+        if y.shape[0] != num_points:
+            raise ValueError(
+                f"x and y have different numbers of points: {num_points} and {y.shape[0]}"
+            )
+        mask = np.ones(num_points, dtype=bool)
+        for assertion in self._assertions:
+            mask &= assertion(x, y) if callable(assertion) else bool(assertion)
+            if not mask.any():
+                break
+        return mask
+
+    def check_assignment(self, values: Mapping[str, float]) -> bool:
+        """Check whether a single assignment of values to variables satisfies the spec."""
+        x = np.zeros((1, self.num_inputs))
+        y = np.zeros((1, self.num_outputs))
+        for name, (var_type, column) in self.variables.items():
+            if name not in values:
+                raise ValueError(f"no value for variable {name!r}")
+            (x, y)[var_type][0, column] = values[name]
+        return bool(self(x, y)[0])
+
+    def __repr__(self) -> str:
+        return (
+            f"BatchEvaluator(num_inputs={self.num_inputs},"
+            f" num_outputs={self.num_outputs}, assertions={len(self._assertions)})"
+        )
+
+
+def _as_batch(array, size: int, name: str) -> np.ndarray:
+    array = np.asarray(array, dtype=float)
+    if array.ndim <= 1:
+        array = array.reshape(1, -1)
+    array = array.reshape(array.shape[0], -1)
+    if array.shape[1] != size:
+        raise ValueError(
+            f"expected {size} values per point in {name}, got {array.shape[1]}"
+        )
+    return array
+
+
+class EvaluatorTransformer(AstNodeTransformer):
+    """Compiles a script into a :class:`BatchEvaluator`.
+
+    Each term is compiled into a function of the batches ``x`` and ``y``
+    that uses NumPy broadcasting, so every point of a batch is evaluated at
+    once. Subterms without variables are evaluated when the spec is compiled.
+    Variables are named like the inputs and outputs of
+    :func:`vnnlib.compat.read_vnnlib_simple`, such as ``X_0`` or ``Y_0_3``.
+    """
+
+    def __init__(self, input_name: str = "X", output_name: str = "Y") -> None:
+        super().__init__()
+        self.input_name = input_name
+        self.output_name = output_name
+        self._names: Dict[str, Tuple[int, Tuple[int, ...]]] = {}
+        self._extents: List[Optional[List[int]]] = [None, None]
+        # filled in once every variable is declared, since the column of a
+        # variable with several indices depends on the extent of every index
+        self._columns: Dict[str, Tuple[int, int]] = {}
+
+    def transform_Assert(self, term) -> Any:
+        return term
+
+    def transform_Constant(self, value) -> Any:
+        if isinstance(value, str):
+            raise NotImplementedError(
+                f"Constant {value!r} is not supported by the evaluator"
+            )
+        return value
+
+    def transform_DeclareConst(self, symbol: str, sort: str) -> None:
+        if symbol.startswith(f"{self.input_name}_"):
+            var_type = 0
+        elif symbol.startswith(f"{self.output_name}_"):
+            var_type = 1
+        else:
+            raise NotImplementedError(
+                f"Constant {symbol!r} is neither an input nor an output"
+            )
+        self._extents[var_type] = _extend(self._extents[var_type], symbol)
+        index = tuple(int(i) for i in symbol.split("_")[1:])
+        self._names[symbol] = (var_type, index)
+
+    def transform_FunctionApplication(self, function: str, *terms) -> Any:
+        func = _FUNCTIONS.get(function)
+        if func is None:
+            raise NotImplementedError(
+                f"Function {function!r} is not supported by the evaluator"
+            )
+        return _lift(func, terms)
+
+    def transform_Identifier(self, value: str) -> Any:
+        if value in self._names:
+            columns = self._columns
+
+            def variable(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+                var_type, column = columns[value]
+                return (x, y)[var_type][:, column]
+
+            return variable
+        if value == "true" or value == "false":
+            return value == "true"
+        if value in _FUNCTIONS:
+            return value
+        raise NotImplementedError(
+            f"Identifier {value!r} is not supported by the evaluator"
+        )
+
+    def transform_Script(self, *commands) -> BatchEvaluator:
+        sizes = [_product(extent) if extent else 0 for extent in self._extents]
+        for name, (var_type, index) in self._names.items():
+            extent = self._extents[var_type]
+            assert extent is not None
+            column = int(np.ravel_multi_index(index, extent))
+            self._columns[name] = (var_type, column)
+        assertions = [command for command in commands if command is not None]
+        return BatchEvaluator(sizes[0], sizes[1], dict(self._columns), assertions)
+
+
+def read_vnnlib_evaluator(
+    vnnlib_filename: Union[str, pathlib.Path],
+    strict: bool = False,
+    input_name: str = "X",
+    output_name: str = "Y",
+) -> BatchEvaluator:
+    """Compile a vnnlib file into a :class:`BatchEvaluator`."""
+    ast_node = parse_file(vnnlib_filename, strict=strict)
+    return EvaluatorTransformer(input_name, output_name).transform(ast_node)
+
+
+def read_counterexample(filename: Union[str, pathlib.Path]) -> Dict[str, float]:
+    """Read the values of a counterexample in the VNN-COMP format.
+
+    The file contains a list of ``(name value)`` pairs, such as
+    ``((X_0 0.5) (Y_0 -1.0))``, optionally preceded by ``sat``.
+    """
+    with open(filename) as f:
+        text = f.read()
+    return {name: float(value) for name, value in _ASSIGNMENT_PATTERN.findall(text)}
+
+
+__all__ = [
+    "BatchEvaluator",
+    "EvaluatorTransformer",
+    "read_counterexample",
+    "read_vnnlib_evaluator",
+]
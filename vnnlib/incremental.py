@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Set, Tuple, Union
+
+from .errors import ParserError
+from .parser import (
+    Assert,
+    Command,
+    DeclareConst,
+    FunctionApplication,
+    Identifier,
+    Script,
+    VnnLibParser,
+    _read_text,
+)
+from .tokenizer import EOF, tokenize
+
+# parentheses, and the comments, string literals, and quoted symbols they may be
+# hidden in, with unterminated strings and quoted symbols matching a single quote
+_SPECIAL = re.compile(r'[()]|;[^\n\r]*|"(?:[^"]|"")*"|\|[^|]*\||["|]')
+_COMMENT = re.compile(r";[^\n\r]*")
+
+
+def _simple_command_pattern(max_depth: int) -> str:
+    text = r'[^()";|]*'
+    pattern = r"\(" + text + r"\)"
+    for _ in range(max_depth - 1):
+        pattern = r"\(" + text + "(?:" + pattern + text + r")*\)"
+    return pattern
+
+
+# a command nested at most 5 deep, without string literals or quoted symbols,
+# preceded by whitespace and comments, which can be matched in a single step
+_SIMPLE_COMMAND = re.compile(r"(?:\s|;[^\n\r]*)*(" + _simple_command_pattern(5) + ")")
+
+# the declared symbols a command refers to, with their sorts
+Dependencies = FrozenSet[Tuple[str, str]]
+
+
+def split_commands(text: str) -> List[Tuple[int, int]]:
+    """Find the start and end offsets of each top-level command in a spec.
+
+    Parentheses in comments, string literals, and quoted symbols are ignored.
+    """
+    spans: List[Tuple[int, int]] = []
+    position = 0
+    while position >= 0:
+        match = _SIMPLE_COMMAND.match(text, position)
+        if match is not None:
+            spans.append(match.span(1))
+            position = match.end()
+        else:
+            position = _scan_command(text, position, spans)
+    return spans
+
+
+def _scan_command(text: str, position: int, spans: List[Tuple[int, int]]) -> int:
+    # find the next command character by character, returning the position
+    # after it, or -1 if the text ends first
+    depth = 0
+    start = position
+    for match in _SPECIAL.finditer(text, position):
+        c = match.group()
+        if c == "(":
+            if depth == 0:
+                _check_gap(text[position : match.start()])
+                start = match.start()
+            depth += 1
+        elif c == ")":
+            if depth == 0:
+                raise ParserError("Unexpected token: ')'")
+            depth -= 1
+            if depth == 0:
+                spans.append((start, match.end()))
+                return match.end()
+        elif c == '"':
+            raise ParserError("Unexpected end of file in string literal")
+        elif c == "|":
+            raise ParserError("Unexpected end of file in quoted symbol")
+    if depth != 0:
+        raise ParserError("Unexpected end of file, expected ')'")
+    _check_gap(text[position:])
+    return -1
+
+
+def _check_gap(gap: str) -> None:
+    stripped = _COMMENT.sub("", gap).strip()
+    if stripped:
+        raise ParserError(f"Unexpected token outside of a command: {stripped!r}")
+
+
+def _dependencies(command: Command, sorts: Dict[str, str]) -> Dependencies:
+    if not isinstance(command, Assert):
+        return frozenset()
+    symbols = set()
+    stack = [command.term]
+    while stack:
+        term = stack.pop()
+        if isinstance(term, FunctionApplication):
+            stack.extend(term.terms)
+        elif isinstance(term, Identifier) and term.value in sorts:
+            symbols.add((term.value, sorts[term.value]))
+    return frozenset(symbols)
+
+
+def _diff(old_keys: List[str], new_keys: List[str]) -> Tuple[List[int], List[int]]:
+    # edits usually touch a few commands, so only the commands between the
+    # common prefix and suffix are compared as multisets
+    end = min(len(old_keys), len(new_keys))
+    prefix = 0
+    while prefix < end and old_keys[prefix] == new_keys[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < end - prefix
+        and old_keys[len(old_keys) - suffix - 1] == new_keys[len(new_keys) - suffix - 1]
+    ):
+        suffix += 1
+    old_middle = range(prefix, len(old_keys) - suffix)
+    new_middle = range(prefix, len(new_keys) - suffix)
+    old_counts = Counter(old_keys[i] for i in old_middle)
+    new_counts = Counter(new_keys[i] for i in new_middle)
+    added = []
+    for i in new_middle:
+        if old_counts[new_keys[i]] > 0:
+            old_counts[new_keys[i]] -= 1
+        else:
+            added.append(i)
+    removed = []
+    for i in old_middle:
+        if new_counts[old_keys[i]] > 0:
+            new_counts[old_keys[i]] -= 1
+        else:
+            removed.append(i)
+    return added, removed
+
+
+class ScriptDiff:
+    """The commands that changed between two versions of a script.
+
+    ``added`` holds the indices of commands in the new script whose text was
+    not in the old script, and ``removed`` holds the indices of commands in the
+    old script whose text is not in the new script. ``reparsed`` holds the
+    indices of commands in the new script that were parsed again even though
+    their text did not change, because a symbol they refer to was changed.
+    """
+
+    __slots__ = ("added", "removed", "reparsed", "reused")
+
+    def __init__(
+        self, added: List[int], removed: List[int], reparsed: List[int], reused: int
+    ) -> None:
+        self.added = added
+        self.removed = removed
+        self.reparsed = reparsed
+        self.reused = reused
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed)
+
+    def __repr__(self) -> str:
+        return (
+            f"ScriptDiff(added={self.added}, removed={self.removed},"
+            f" reparsed={self.reparsed}, reused={self.reused})"
+        )
+
+
+class ParserSession:
+    """Parses successive versions of a spec, reusing unchanged commands.
+
+    The source is split into top-level commands, and the text of each command
+    is hashed. Commands whose text was seen in the previous version are reused
+    without being parsed again, as long as every declared symbol they refer to
+    is still declared before them with the same sort. All other commands are
+    parsed, in order, with the symbols declared so far.
+    """
+
+    def __init__(self, strict=True) -> None:
+        self.strict = strict
+        self.script = Script()
+        # commands are keyed by their text, which is hashed by the dict
+        self._keys: List[str] = []
+        self._cache: Dict[str, Tuple[Command, Dependencies]] = {}
+
+    def update(self, text: str) -> Tuple[Script, ScriptDiff]:
+        parser = VnnLibParser(iter(()))
+        sorts: Dict[str, str] = {}
+        declared: Set[Tuple[str, str]] = set()
+        commands: List[Command] = []
+        keys = [text[start:end] for start, end in split_commands(text)]
+        old_cache = self._cache
+        cache: Dict[str, Tuple[Command, Dependencies]] = {}
+        reparsed = []
+        reused = 0
+        for key in keys:
+            entry = cache.get(key) or old_cache.get(key)
+            if entry is not None and entry[1] <= declared:
+                command, dependencies = entry
+                reused += 1
+            else:
+                if entry is not None:
+                    reparsed.append(len(commands))
+                command = self._parse_command(parser, key)
+                dependencies = _dependencies(command, sorts)
+            if isinstance(command, DeclareConst):
+                declared.discard((command.symbol, sorts.get(command.symbol)))
+                declared.add((command.symbol, command.sort))
+                sorts[command.symbol] = command.sort
+                parser.identifiers[command.symbol] = Identifier(
+                    command.symbol, parser.lookup_sort(command.sort)
+                )
+            cache[key] = (command, dependencies)
+            commands.append(command)
+
+        added, removed = _diff(self._keys, keys)
+
+        self.script = Script(*commands)
+        self._keys = keys
+        self._cache = cache
+        return self.script, ScriptDiff(added, removed, reparsed, reused)
+
+    def update_file(self, filename: Union[str, Path]) -> Tuple[Script, ScriptDiff]:
+        return self.update(_read_text(Path(filename), None))
+
+    def _parse_command(self, parser: VnnLibParser, command_text: str) -> Command:
+        parser.token_stream = tokenize(command_text, strict=self.strict)
+        parser.advance_token_stream()
+        command = parser.parse_command()
+        if parser.curr_token != EOF:
+            raise ParserError(f"Unexpected token: {parser.curr_token[1]!r}")
+        return command
+
+
+__all__ = ["ParserSession", "ScriptDiff", "split_commands"]
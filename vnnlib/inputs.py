@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import pathlib
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from .compat import Box, CompatTransformer
+from .parser import (
+    Assert,
+    AstNode,
+    FunctionApplication,
+    Identifier,
+    Real,
+    Script,
+    VnnLibParser,
+    _read_text,
+)
+from .tokenizer import Token, tokenize
+
+_COMPARISONS = frozenset(("<=", ">="))
+
+Polytope = Tuple[np.ndarray, np.ndarray]
+
+
+class InputConstraints:
+    """The input region of a spec, without its output constraints.
+
+    ``regions`` has the format of :func:`vnnlib.compat.read_vnnlib_simple`,
+    except that each polytope ``(mat, rhs)`` constrains the inputs, as in
+    ``mat @ x <= rhs``, with the rows of constraints on more than one input.
+    The input region is the union over the regions of each box intersected
+    with any of its polytopes. Duplicate polytopes are removed, so a box
+    whose disjuncts differ only in their outputs has a single polytope.
+
+    ``mixed`` is True if an assertion constrained both inputs and outputs, in
+    which case the region is the projection of the spec onto the inputs.
+    ``skipped`` is the number of assertions without inputs that were skipped.
+    """
+
+    __slots__ = ("regions", "mixed", "skipped")
+
+    def __init__(
+        self,
+        regions: List[Tuple[Box, List[Polytope]]],
+        mixed: bool,
+        skipped: int,
+    ) -> None:
+        self.regions = regions
+        self.mixed = mixed
+        self.skipped = skipped
+
+    def __repr__(self) -> str:
+        return (
+            f"InputConstraints(boxes={len(self.regions)}, mixed={self.mixed},"
+            f" skipped={self.skipped})"
+        )
+
+
+class _AssertionFilter:
+    # drops the tokens of assertions that refer to outputs but not to any
+    # input, so that no AST nodes are allocated for them, and counts them,
+    # while assertions without variables, such as (assert false), are kept
+    def __init__(self, input_name: str, output_name: str) -> None:
+        self.input_prefixes = (f"{input_name}_", f"-{input_name}_")
+        self.output_prefixes = (f"{output_name}_", f"-{output_name}_")
+        self.skipped = 0
+
+    def filter(self, token_stream: Iterator[Token]) -> Iterator[Token]:
+        input_prefixes = self.input_prefixes
+        output_prefixes = self.output_prefixes
+        command: List[Token] = []
+        depth = 0
+        uses_inputs = False
+        uses_outputs = False
+        for token in token_stream:
+            token_type = token[0]
+            if token_type == "EOF" or (depth == 0 and token_type != "LPAREN"):
+                # let the parser report anything unexpected
+                yield from command
+                command = []
+                yield token
+                continue
+            command.append(token)
+            if token_type == "LPAREN":
+                depth += 1
+            elif token_type == "RPAREN":
+                depth -= 1
+                if depth == 0:
+                    if (
+                        uses_inputs
+                        or not uses_outputs
+                        or len(command) < 2
+                        or command[1][1] != "assert"
+                    ):
+                        yield from command
+                    else:
+                        self.skipped += 1
+                    command = []
+                    uses_inputs = False
+                    uses_outputs = False
+            elif token_type == "SYMBOL":
+                if token[1].startswith(input_prefixes):
+                    uses_inputs = True
+                elif token[1].startswith(output_prefixes):
+                    uses_outputs = True
+
+
+class InputTransformer(CompatTransformer):
+    """Compiles only the input constraints of a spec.
+
+    Comparisons that refer to an output are treated as ``true``, which
+    projects the spec onto its inputs. Single-input comparisons become box
+    bounds, and comparisons of several inputs become polytope rows.
+    """
+
+    def __init__(
+        self, input_name: str, output_name: str, input_size: Optional[int] = None
+    ) -> None:
+        super().__init__(input_name, output_name, input_size, 0)
+        self.mixed = False
+        # the variable types seen in the current assertion
+        self._var_types: Set[int] = set()
+
+    def transform_Assert(self, term):
+        if 0 in self._var_types and 1 in self._var_types:
+            self.mixed = True
+        self._var_types = set()
+        if term == "true":
+            term = {}
+        elif term == "false":
+            # the row 1 <= 0, which no input satisfies
+            term = {(0, -1, -1): 1}
+        return super().transform_Assert(term)
+
+    def transform_FunctionApplication(self, symbol: str, *terms):
+        result = super().transform_FunctionApplication(symbol, *terms)
+        if symbol in _COMPARISONS:
+            assert isinstance(result, dict)
+            var_types = {key[1] for key in result}
+            self._var_types |= var_types
+            if 1 in var_types:
+                return {}
+        return result
+
+    def transform_Script(self, *commands) -> List[Tuple[Box, List[Polytope]]]:
+        common_box = [[float("-inf"), float("inf")] for _ in range(self.input_size)]
+        common_rows = self._split_rows(self._assertions, common_box)
+        regions: Dict[str, Tuple[Box, Dict[bytes, Polytope]]] = {}
+        for disjunct in self._disjunctions:
+            box = [interval.copy() for interval in common_box]
+            rows = common_rows + self._split_rows(disjunct, box)
+            mat = np.array([lhs for lhs, _ in rows]).reshape(len(rows), self.input_size)
+            rhs = np.array([rhs for _, rhs in rows], dtype=float).reshape(len(rows), 1)
+            box_str = np.asarray(box).data.hex()
+            if box_str not in regions:
+                regions[box_str] = (box, {})
+            regions[box_str][1].setdefault(mat.tobytes() + rhs.tobytes(), (mat, rhs))
+        return [(box, list(polytopes.values())) for box, polytopes in regions.values()]
+
+    def _split_rows(
+        self, entries: Dict[Tuple[int, ...], Real], box: List[List[Real]]
+    ) -> List[Tuple[List[Real], Real]]:
+        # tightens the box with single-input rows, and returns the other rows
+        constants: Dict[int, Real] = {}
+        coefficients: Dict[int, Dict[int, Real]] = {}
+        for key, value in entries.items():
+            row, var_type = key[0], key[1]
+            if var_type == -1:
+                constants[row] = value
+            elif var_type == 0:
+                index = key[2] if len(key) == 3 else self._flat_index(key)
+                coefficients.setdefault(row, {})[index] = value
+        rows: List[Tuple[List[Real], Real]] = []
+        for row in sorted(coefficients.keys() | constants.keys()):
+            rhs = -constants.get(row, 0)
+            row_coefficients = {
+                i: c for i, c in coefficients.get(row, {}).items() if c != 0
+            }
+            if not row_coefficients:
+                # a row without inputs, such as (<= 1.0 0.0), is kept as the
+                # row 0 <= rhs only if no input satisfies it
+                if rhs < 0:
+                    rows.append(([0.0] * self.input_size, rhs))
+            elif len(row_coefficients) == 1:
+                ((index, value),) = row_coefficients.items()
+                if value > 0:
+                    box[index][1] = min(rhs / value, box[index][1])
+                else:
+                    box[index][0] = max(rhs / value, box[index][0])
+            else:
+                lhs = [0.0] * self.input_size
+                for index, value in row_coefficients.items():
+                    lhs[index] = value
+                rows.append((lhs, rhs))
+        return rows
+
+
+def _variable_types(
+    term: AstNode, input_name: str, output_name: str
+) -> Tuple[bool, bool]:
+    # whether a term refers to any input, and to any output
+    input_prefix = f"{input_name}_"
+    output_prefix = f"{output_name}_"
+    uses_inputs = False
+    uses_outputs = False
+    stack = [term]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, FunctionApplication):
+            stack.extend(node.terms)
+        elif isinstance(node, Identifier):
+            if node.value.startswith(input_prefix):
+                uses_inputs = True
+            elif node.value.startswith(output_prefix):
+                uses_outputs = True
+    return uses_inputs, uses_outputs
+
+
+def _input_constraints(
+    script: Script,
+    num_inputs: Optional[int] = None,
+    input_name: str = "X",
+    output_name: str = "Y",
+) -> InputConstraints:
+    # the input constraints of a spec that is already parsed, with assertions
+    # skipped as in read_vnnlib_inputs
+    commands = []
+    skipped = 0
+    for command in script.commands:
+        if isinstance(command, Assert):
+            uses_inputs, uses_outputs = _variable_types(
+                command.term, input_name, output_name
+            )
+            if uses_outputs and not uses_inputs:
+                skipped += 1
+                continue
+        commands.append(command)
+    transformer = InputTransformer(input_name, output_name, num_inputs)
+    regions = transformer.transform(Script(*commands))
+    return InputConstraints(regions, transformer.mixed, skipped)
+
+
+def read_vnnlib_inputs(
+    vnnlib_filename: Union[str, pathlib.Path],
+    num_inputs: Optional[int] = None,
+    input_name: str = "X",
+    output_name: str = "Y",
+) -> InputConstraints:
+    """Read only the input constraints of a spec, for tools that never use the outputs.
+
+    Assertions that refer to outputs but not to any input are skipped as they
+    are tokenized, before they are parsed, so specs with many output disjuncts
+    load much faster than with :func:`vnnlib.compat.read_vnnlib_simple`.
+    """
+    text = _read_text(pathlib.Path(vnnlib_filename), None)
+    assertion_filter = _AssertionFilter(input_name, output_name)
+    ast_node = VnnLibParser.parse_tokens(
+        assertion_filter.filter(tokenize(text, strict=False))
+    )
+    transformer = InputTransformer(input_name, output_name, num_inputs)
+    regions = transformer.transform(ast_node)
+    return InputConstraints(regions, transformer.mixed, assertion_filter.skipped)
+
+
+__all__ = ["InputConstraints", "InputTransformer", "read_vnnlib_inputs"]
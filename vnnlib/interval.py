@@ -0,0 +1,481 @@
+from __future__ import annotations
+
+import functools
+import pathlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .compat import Box, _extend, _product
+from .evaluate import _lift
+from .inputs import _input_constraints
+from .parser import Script, parse_file
+from .transformer import AstNodeTransformer
+
+# the status of a term over a box, as returned by Truth.status
+TRUE = 1
+FALSE = 0
+UNKNOWN = -1
+
+
+class Interval:
+    """The bounds ``[lo, hi]`` of a real term, as scalars or arrays over a batch of boxes."""
+
+    __slots__ = "lo", "hi"
+
+    def __init__(self, lo, hi) -> None:
+        self.lo = lo
+        self.hi = hi
+
+    def __repr__(self) -> str:
+        return f"Interval({self.lo!r}, {self.hi!r})"
+
+
+class Truth:
+    """The possible values of a boolean term, for three-valued logic.
+
+    A term is true for every point of a box if it can not be false, false for
+    every point if it can not be true, and unknown if it can be either.
+    """
+
+    __slots__ = "may_be_true", "may_be_false"
+
+    def __init__(self, may_be_true, may_be_false) -> None:
+        self.may_be_true = may_be_true
+        self.may_be_false = may_be_false
+
+    def status(self) -> np.ndarray:
+        """Return ``TRUE``, ``FALSE``, or ``UNKNOWN`` for each box."""
+        return np.where(
+            self.may_be_true,
+            np.where(self.may_be_false, UNKNOWN, TRUE),
+            FALSE,
+        ).astype(np.int8)
+
+    def __repr__(self) -> str:
+        return f"Truth({self.may_be_true!r}, {self.may_be_false!r})"
+
+
+_TRUE = Truth(True, False)
+_FALSE = Truth(False, True)
+
+
+def _add(*terms: Interval) -> Interval:
+    return Interval(sum(t.lo for t in terms), sum(t.hi for t in terms))
+
+
+def _negate(term: Interval) -> Interval:
+    return Interval(-term.hi, -term.lo)
+
+
+def _subtract(*terms: Interval) -> Interval:
+    if len(terms) == 1:
+        return _negate(terms[0])
+    first, *rest = terms
+    return _add(first, *(_negate(term) for term in rest))
+
+
+def _multiply_pair(lhs: Interval, rhs: Interval) -> Interval:
+    with np.errstate(invalid="ignore"):
+        products = [
+            np.asarray(a * b) for a in (lhs.lo, lhs.hi) for b in (rhs.lo, rhs.hi)
+        ]
+    # 0 * inf is nan, but a term that is exactly 0 is 0 for any bounds
+    products = [np.where(np.isnan(p), 0.0, p) for p in products]
+    return Interval(
+        functools.reduce(np.minimum, products), functools.reduce(np.maximum, products)
+    )
+
+
+def _multiply(*terms: Interval) -> Interval:
+    return functools.reduce(_multiply_pair, terms)
+
+
+def _divide_pair(lhs: Interval, rhs: Interval) -> Interval:
+    contains_zero = (rhs.lo <= 0) & (rhs.hi >= 0)
+    with np.errstate(divide="ignore"):
+        reciprocal = Interval(1 / np.asarray(rhs.hi), 1 / np.asarray(rhs.lo))
+    result = _multiply_pair(lhs, reciprocal)
+    return Interval(
+        np.where(contains_zero, -np.inf, result.lo),
+        np.where(contains_zero, np.inf, result.hi),
+    )
+
+
+def _divide(*terms: Interval) -> Interval:
+    return functools.reduce(_divide_pair, terms)
+
+
+def _le(lhs: Interval, rhs: Interval) -> Truth:
+    return Truth(lhs.lo <= rhs.hi, lhs.hi > rhs.lo)
+
+
+def _lt(lhs: Interval, rhs: Interval) -> Truth:
+    return Truth(lhs.lo < rhs.hi, lhs.hi >= rhs.lo)
+
+
+def _ge(lhs: Interval, rhs: Interval) -> Truth:
+    return _le(rhs, lhs)
+
+
+def _gt(lhs: Interval, rhs: Interval) -> Truth:
+    return _lt(rhs, lhs)
+
+
+def _not(term: Truth) -> Truth:
+    return Truth(term.may_be_false, term.may_be_true)
+
+
+def _and(*terms: Truth) -> Truth:
+    return Truth(
+        functools.reduce(np.logical_and, (t.may_be_true for t in terms)),
+        functools.reduce(np.logical_or, (t.may_be_false for t in terms)),
+    )
+
+
+def _or(*terms: Truth) -> Truth:
+    return _not(_and(*(_not(term) for term in terms)))
+
+
+def _xor_pair(lhs: Truth, rhs: Truth) -> Truth:
+    return Truth(
+        (lhs.may_be_true & rhs.may_be_false) | (lhs.may_be_false & rhs.may_be_true),
+        (lhs.may_be_true & rhs.may_be_true) | (lhs.may_be_false & rhs.may_be_false),
+    )
+
+
+def _xor(*terms: Truth) -> Truth:
+    return functools.reduce(_xor_pair, terms)
+
+
+def _implies(*terms: Truth) -> Truth:
+    result = terms[-1]
+    for term in reversed(terms[:-1]):
+        result = _or(_not(term), result)
+    return result
+
+
+def _eq_pair(lhs, rhs) -> Truth:
+    if isinstance(lhs, Truth):
+        return _not(_xor_pair(lhs, rhs))
+    # an equality can only be known to be true for equal points
+    return Truth(
+        (lhs.lo <= rhs.hi) & (rhs.lo <= lhs.hi),
+        np.logical_not((lhs.lo == lhs.hi) & (rhs.lo == rhs.hi) & (lhs.lo == rhs.lo)),
+    )
+
+
+def _ite(condition: Truth, then_term, else_term):
+    if isinstance(then_term, Truth):
+        return _or(_and(condition, then_term), _and(_not(condition), else_term))
+    # the hull of the branches that can be taken
+    return Interval(
+        np.minimum(
+            np.where(condition.may_be_true, then_term.lo, np.inf),
+            np.where(condition.may_be_false, else_term.lo, np.inf),
+        ),
+        np.maximum(
+            np.where(condition.may_be_true, then_term.hi, -np.inf),
+            np.where(condition.may_be_false, else_term.hi, -np.inf),
+        ),
+    )
+
+
+def _chain(compare: Callable[[Any, Any], Truth]) -> Callable[..., Truth]:
+    def chained(*terms) -> Truth:
+        if len(terms) == 2:
+            return compare(*terms)
+        return _and(*(compare(a, b) for a, b in zip(terms, terms[1:])))
+
+    return chained
+
+
+_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "+": _add,
+    "-": _subtract,
+    "*": _multiply,
+    "/": _divide,
+    "<=": _chain(_le),
+    "<": _chain(_lt),
+    ">=": _chain(_ge),
+    ">": _chain(_gt),
+    "=": _chain(_eq_pair),
+    "and": _and,
+    "or": _or,
+    "not": _not,
+    "xor": _xor,
+    "=>": _implies,
+    "ite": _ite,
+}
+
+
+class IntervalEvaluator:
+    """Evaluates a spec over boxes of inputs and outputs with interval arithmetic.
+
+    ``evaluator(input_bounds, output_bounds)`` returns the :class:`Truth` of
+    the conjunction of every assertion, where the bounds have the shape
+    ``(n, 2)`` of a box from :func:`vnnlib.compat.read_vnnlib_simple`, or
+    ``(B, n, 2)`` for a batch of ``B`` boxes. Outputs without bounds are
+    unbounded. The result is sound but not exact, so a term that is always
+    true or always false can still be unknown.
+    """
+
+    __slots__ = "num_inputs", "num_outputs", "variables", "_assertions"
+
+    def __init__(
+        self,
+        num_inputs: int,
+        num_outputs: int,
+        variables: Dict[str, Tuple[int, int]],
+        assertions: List[Any],
+    ):
+        self.num_inputs = num_inputs
+        self.num_outputs = num_outputs
+        # the variable type (0 for inputs and 1 for outputs) and column of each name
+        self.variables = variables
+        self._assertions = assertions
+
+    def __call__(self, input_bounds, output_bounds=None) -> Truth:
+        return _and(_TRUE, *self.evaluate_assertions(input_bounds, output_bounds))
+
+    def evaluate_assertions(self, input_bounds, output_bounds=None) -> List[Truth]:
+        """Return the :class:`Truth` of each assertion, in order."""
+        bounds = (
+            _as_bounds(input_bounds, self.num_inputs, "input_bounds"),
+            _as_bounds(output_bounds, self.num_outputs, "output_bounds"),
+        )
+        # nothing holds in an empty box
+        empty = np.zeros(bounds[0].shape[:-2], dtype=bool)
+        for lo_hi in bounds:
+            empty = empty | (lo_hi[..., 0] > lo_hi[..., 1]).any(axis=-1)
+        truths = []
+        for assertion in self._assertions:
+            truth = assertion(*bounds) if callable(assertion) else assertion
+            truths.append(Truth(truth.may_be_true & ~empty, truth.may_be_false))
+        return truths
+
+    def __repr__(self) -> str:
+        return (
+            f"IntervalEvaluator(num_inputs={self.num_inputs},"
+            f" num_outputs={self.num_outputs}, assertions={len(self._assertions)})"
+        )
+
+
+def _as_bounds(bounds, size: int, name: str) -> np.ndarray:
+    if bounds is None:
+        return np.tile([-np.inf, np.inf], (size, 1))
+    bounds = np.asarray(bounds, dtype=float)
+    if bounds.ndim not in (2, 3) or bounds.shape[-2:] != (size, 2):
+        raise ValueError(
+            f"expected {name} of shape ({size}, 2) or (B, {size}, 2),"
+            f" got {bounds.shape}"
+        )
+    return bounds
+
+
+class IntervalTransformer(AstNodeTransformer):
+    """Compiles a script into an :class:`IntervalEvaluator`.
+
+    Bounds are propagated through arithmetic with interval arithmetic, and
+    comparisons and connectives are evaluated with three-valued logic. As with
+    :class:`vnnlib.evaluate.EvaluatorTransformer`, subterms without variables
+    are evaluated when the spec is compiled.
+    """
+
+    def __init__(self, input_name: str = "X", output_name: str = "Y") -> None:
+        super().__init__()
+        self.input_name = input_name
+        self.output_name = output_name
+        self._names: Dict[str, Tuple[int, Tuple[int, ...]]] = {}
+        self._extents: List[Optional[List[int]]] = [None, None]
+        self._columns: Dict[str, Tuple[int, int]] = {}
+
+    def transform_Assert(self, term) -> Any:
+        return term
+
+    def transform_Constant(self, value) -> Interval:
+        if isinstance(value, str):
+            raise NotImplementedError(
+                f"Constant {value!r} is not supported by the interval evaluator"
+            )
+        return Interval(value, value)
+
+    def transform_DeclareConst(self, symbol: str, sort: str) -> None:
+        if symbol.startswith(f"{self.input_name}_"):
+            var_type = 0
+        elif symbol.startswith(f"{self.output_name}_"):
+            var_type = 1
+        else:
+            raise NotImplementedError(
+                f"Constant {symbol!r} is neither an input nor an output"
+            )
+        self._extents[var_type] = _extend(self._extents[var_type], symbol)
+        index = tuple(int(i) for i in symbol.split("_")[1:])
+        self._names[symbol] = (var_type, index)
+
+    def transform_FunctionApplication(self, function: str, *terms) -> Any:
+        func = _FUNCTIONS.get(function)
+        if func is None:
+            raise NotImplementedError(
+                f"Function {function!r} is not supported by the interval evaluator"
+            )
+        return _lift(func, terms)
+
+    def transform_Identifier(self, value: str) -> Any:
+        if value in self._names:
+            columns = self._columns
+
+            def variable(
+                input_bounds: np.ndarray, output_bounds: np.ndarray
+            ) -> Interval:
+                var_type, column = columns[value]
+                bounds = (input_bounds, output_bounds)[var_type]
+                return Interval(bounds[..., column, 0], bounds[..., column, 1])
+
+            return variable
+        if value == "true":
+            return _TRUE
+        if value == "false":
+            return _FALSE
+        return value
+
+    def transform_Script(self, *commands) -> IntervalEvaluator:
+        sizes = [_product(extent) if extent else 0 for extent in self._extents]
+        for name, (var_type, index) in self._names.items():
+            extent = self._extents[var_type]
+            assert extent is not None
+            column = int(np.ravel_multi_index(index, extent))
+            self._columns[name] = (var_type, column)
+        assertions = [command for command in commands if command is not None]
+        return IntervalEvaluator(sizes[0], sizes[1], dict(self._columns), assertions)
+
+
+def read_vnnlib_interval(
+    vnnlib_filename: Union[str, pathlib.Path],
+    strict: bool = False,
+    input_name: str = "X",
+    output_name: str = "Y",
+) -> IntervalEvaluator:
+    """Compile a vnnlib file into an :class:`IntervalEvaluator`."""
+    ast_node = parse_file(vnnlib_filename, strict=strict)
+    return IntervalTransformer(input_name, output_name).transform(ast_node)
+
+
+def triage(
+    vnnlib_filename: Union[str, pathlib.Path],
+    output_bounds=None,
+    input_bounds=None,
+) -> str:
+    """Try to decide a spec from bounds alone.
+
+    Returns ``"sat"`` if every point of the input bounds satisfies the spec
+    for any outputs within ``output_bounds``, so any such point is a
+    counterexample, ``"unsat"`` if no point can satisfy it, and ``"unknown"``
+    otherwise. ``input_bounds`` defaults to the smallest box that contains
+    the input region of the spec, and ``output_bounds`` to unbounded outputs,
+    such as the bounds of a network's outputs over that box.
+    """
+    # the spec is parsed once, for both the evaluator and the input region
+    ast_node = parse_file(vnnlib_filename, strict=False)
+    evaluator = IntervalTransformer().transform(ast_node)
+    if input_bounds is None:
+        assert isinstance(ast_node, Script)
+        boxes = np.asarray(
+            [box for box, _ in _input_constraints(ast_node).regions],
+            dtype=float,
+        ).reshape(-1, evaluator.num_inputs, 2)
+        if len(boxes) == 0:
+            return "unsat"
+        input_bounds = np.stack(
+            [boxes[..., 0].min(axis=0), boxes[..., 1].max(axis=0)], axis=-1
+        )
+    status = evaluator(input_bounds, output_bounds).status()
+    if status.ndim != 0:
+        raise ValueError("triage expects the bounds of a single box")
+    return {TRUE: "sat", FALSE: "unsat", UNKNOWN: "unknown"}[int(status)]
+
+
+def triage_polytopes(
+    result: Sequence[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]],
+    output_bounds,
+) -> List[np.ndarray]:
+    """Decide each output polytope of a compat result from output bounds alone.
+
+    ``result`` has the format of :func:`vnnlib.compat.read_vnnlib_simple`, and
+    ``output_bounds`` has shape ``(num_outputs, 2)``, or ``(len(result),
+    num_outputs, 2)`` for bounds that depend on the box. Returns an array of
+    ``TRUE``, ``FALSE``, or ``UNKNOWN`` for the polytopes of each box, where
+    ``TRUE`` means that every row holds for any outputs within the bounds.
+    The rows of every polytope are checked at once.
+    """
+    bounds = np.asarray(output_bounds, dtype=float)
+    num_outputs = bounds.shape[-2]
+    num_polytopes = [len(polytopes) for _, polytopes in result]
+    polytopes = [polytope for _, box_polytopes in result for polytope in box_polytopes]
+    rhss = [np.asarray(rhs).reshape(-1) for _, rhs in polytopes]
+    # empty polytopes, including the 1-d arrays of the legacy format, have no
+    # rows, so they are TRUE
+    mats = [
+        np.asarray(mat).reshape(len(rhs), num_outputs)
+        for (mat, _), rhs in zip(polytopes, rhss)
+    ]
+    if not mats:
+        return [np.zeros(0, dtype=np.int8) for _ in result]
+    num_rows = np.array([len(rhs) for rhs in rhss], dtype=np.intp)
+    mat = np.concatenate(mats)
+    rhs = np.concatenate(rhss)
+    polytope_ids = np.repeat(np.arange(len(mats)), num_rows)
+    if bounds.ndim == 3:
+        box_ids = np.repeat(np.arange(len(result)), num_polytopes)
+        bounds = bounds[box_ids[polytope_ids]]
+    lower, upper = bounds[..., 0], bounds[..., 1]
+    with np.errstate(invalid="ignore"):
+        row_min = np.where(mat > 0, mat * lower, np.where(mat < 0, mat * upper, 0.0))
+        row_max = np.where(mat > 0, mat * upper, np.where(mat < 0, mat * lower, 0.0))
+    never = row_min.sum(axis=-1) > rhs
+    always = row_max.sum(axis=-1) <= rhs
+    num_never = np.bincount(polytope_ids, weights=never, minlength=len(mats))
+    num_always = np.bincount(polytope_ids, weights=always, minlength=len(mats))
+    status = np.where(
+        num_never > 0,
+        FALSE,
+        np.where(
+            num_always == np.bincount(polytope_ids, minlength=len(mats)), TRUE, UNKNOWN
+        ),
+    ).astype(np.int8)
+    splits = np.cumsum(num_polytopes)[:-1]
+    return np.split(status, splits)
+
+
+def prune_polytopes(
+    result: Sequence[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]],
+    output_bounds,
+) -> List[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]]:
+    """Remove the polytopes of a compat result that no outputs within the bounds satisfy.
+
+    Boxes without any polytopes left are removed too. See
+    :func:`triage_polytopes` for the format of ``output_bounds``.
+    """
+    pruned = []
+    for (box, polytopes), status in zip(
+        result, triage_polytopes(result, output_bounds)
+    ):
+        kept = [polytope for polytope, s in zip(polytopes, status) if s != FALSE]
+        if kept:
+            pruned.append((box, kept))
+    return pruned
+
+
+__all__ = [
+    "FALSE",
+    "Interval",
+    "IntervalEvaluator",
+    "IntervalTransformer",
+    "TRUE",
+    "Truth",
+    "UNKNOWN",
+    "prune_polytopes",
+    "read_vnnlib_interval",
+    "triage",
+    "triage_polytopes",
+]
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from typing import Iterator, Optional
+
+from .errors import LimitExceededError, ParseCancelledError
+from .tokenizer import Token
+
+# how many tokens are read between checks of the time limit and cancel token
+_CHECK_INTERVAL = 1024
+
+
+class CancelToken:
+    """A flag that another thread can set to cancel parsing and transforming."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise ParseCancelledError("parsing was cancelled")
+
+
+class Limits:
+    """Optional budgets for parsing and transforming a single spec.
+
+    A ``Limits`` object can be passed as the ``limits`` argument of
+    :func:`vnnlib.parser.parse_file`, :meth:`vnnlib.parser.VnnLibParser.parse`,
+    :class:`vnnlib.compat.CompatTransformer`, and
+    :func:`vnnlib.compat.read_vnnlib_simple`. Limits that are ``None`` are not
+    checked, and nothing is checked when ``limits`` is not given.
+
+    ``max_bytes`` limits the size of the (decompressed) file, or the UTF-8
+    encoded size of a text, ``max_tokens``, ``max_depth``, and ``max_nodes``
+    are checked as tokens are read, where each atom and each parenthesized
+    expression counts as a node, and ``max_disjuncts`` is checked before the
+    compat transformer expands a disjunction. ``timeout`` is the wall-clock
+    time in seconds from :meth:`start`, which is called each time a file or
+    text starts being parsed, so that ``Limits`` can be reused, and it is
+    checked along with ``cancel_token`` every few thousand tokens and at each
+    assertion. Exceeding a limit raises a ``LimitExceededError``, and
+    cancelling raises a ``ParseCancelledError``.
+    """
+
+    __slots__ = (
+        "max_bytes",
+        "max_tokens",
+        "max_depth",
+        "max_nodes",
+        "max_disjuncts",
+        "timeout",
+        "cancel_token",
+        "_deadline",
+    )
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        max_disjuncts: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_tokens = max_tokens
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_disjuncts = max_disjuncts
+        self.timeout = timeout
+        self.cancel_token = cancel_token
+        self._deadline: Optional[float] = None
+
+    def start(self) -> None:
+        """Start the clock for ``timeout``."""
+        if self.timeout is not None:
+            self._deadline = time.perf_counter() + self.timeout
+
+    def check(self) -> None:
+        """Check the time limit and the cancel token."""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+        if self.timeout is None:
+            return
+        if self._deadline is None:
+            self.start()
+        elif time.perf_counter() > self._deadline:
+            raise LimitExceededError(f"time limit of {self.timeout}s exceeded")
+
+    def check_bytes(self, num_bytes: int) -> None:
+        if self.max_bytes is not None and num_bytes > self.max_bytes:
+            raise LimitExceededError(
+                f"spec has more than the limit of {self.max_bytes} bytes"
+            )
+
+    def check_disjuncts(self, num_disjuncts: int) -> None:
+        if self.max_disjuncts is not None and num_disjuncts > self.max_disjuncts:
+            raise LimitExceededError(
+                f"spec has {num_disjuncts} disjuncts,"
+                f" more than the limit of {self.max_disjuncts}"
+            )
+
+    def limit_tokens(self, token_stream: Iterator[Token]) -> Iterator[Token]:
+        """Wrap a token stream, checking the limits as each token is read."""
+        max_tokens = sys.maxsize if self.max_tokens is None else self.max_tokens
+        max_depth = sys.maxsize if self.max_depth is None else self.max_depth
+        max_nodes = sys.maxsize if self.max_nodes is None else self.max_nodes
+        num_tokens = 0
+        num_nodes = 0
+        depth = 0
+        after_lparen = False
+        for token in token_stream:
+            num_tokens += 1
+            token_type = token[0]
+            if token_type == "LPAREN":
+                depth += 1
+                num_nodes += 1
+                if depth > max_depth:
+                    raise LimitExceededError(
+                        f"spec is nested deeper than the limit of {max_depth}"
+                    )
+                after_lparen = True
+            elif token_type == "RPAREN":
+                depth -= 1
+                after_lparen = False
+            else:
+                # the first symbol in parentheses is a function or command name
+                if not after_lparen:
+                    num_nodes += 1
+                after_lparen = False
+            if num_tokens > max_tokens:
+                raise LimitExceededError(
+                    f"spec has more than the limit of {max_tokens} tokens"
+                )
+            if num_nodes > max_nodes:
+                raise LimitExceededError(
+                    f"spec has more than the limit of {max_nodes} nodes"
+                )
+            if num_tokens % _CHECK_INTERVAL == 0:
+                self.check()
+            yield token
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name in self.__slots__
+            if not name.startswith("_") and getattr(self, name) is not None
+        )
+        return f"Limits({fields})"
+
+
+__all__ = ["CancelToken", "Limits"]
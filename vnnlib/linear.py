@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import itertools
+import pathlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .parser import Real, parse_file
+from .transformer import AstNodeTransformer
+
+# a linear expression: ({variable index: coefficient}, constant)
+LinearExpr = Tuple[Dict[int, Real], Real]
+# a normalized constraint row: (sense, ((variable index, coefficient), ...), rhs)
+Row = Tuple[str, Tuple[Tuple[int, Real], ...], Real]
+
+_COMPARISONS = frozenset(("<=", "<", "=", ">=", ">"))
+
+
+class CsrMatrix:
+    """A minimal compressed sparse row matrix.
+
+    The attributes follow the usual CSR layout, so they can be handed directly to
+    ``scipy.sparse.csr_matrix((data, indices, indptr), shape=shape)``.
+    """
+
+    __slots__ = "data", "indices", "indptr", "shape"
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        indices: np.ndarray,
+        indptr: np.ndarray,
+        shape: Tuple[int, int],
+    ):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = shape
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def row_indices(self) -> np.ndarray:
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def dot(self, x: np.ndarray) -> np.ndarray:
+        """Computes ``A @ x``, or ``(A @ x.T).T`` for a batch ``x`` of shape (N, n)."""
+        x = np.asarray(x)
+        products = x[..., self.indices] * self.data
+        result = np.zeros(x.shape[:-1] + (self.shape[0],), dtype=products.dtype)
+        starts = self.indptr[:-1]
+        nonempty = starts < self.indptr[1:]
+        if products.shape[-1]:
+            result[..., nonempty] = np.add.reduceat(products, starts[nonempty], axis=-1)
+        return result
+
+    def toarray(self) -> np.ndarray:
+        array = np.zeros(self.shape, dtype=self.data.dtype)
+        array[self.row_indices(), self.indices] = self.data
+        return array
+
+    def to_scipy(self):
+        try:
+            from scipy.sparse import csr_matrix  # type: ignore
+        except ImportError as e:
+            raise ImportError("scipy is required to convert to a scipy matrix") from e
+        return csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+
+class LinearSpec:
+    """A linear VNN-LIB specification over the joint vector of declared constants.
+
+    Each row ``i`` is the constraint ``A[i] @ x <sense[i]> b[i]``, where
+    ``sense[i]`` is one of ``"<="``, ``"<"``, or ``"="``. The specification holds
+    when every row in ``conjuncts`` holds, and, for every disjunction in
+    ``disjunctions``, all rows of at least one of its groups hold.
+    """
+
+    __slots__ = "variables", "A", "b", "sense", "conjuncts", "disjunctions"
+
+    def __init__(
+        self,
+        variables: List[str],
+        A: CsrMatrix,
+        b: np.ndarray,
+        sense: np.ndarray,
+        conjuncts: np.ndarray,
+        disjunctions: List[List[np.ndarray]],
+    ):
+        self.variables = variables
+        self.A = A
+        self.b = b
+        self.sense = sense
+        self.conjuncts = conjuncts
+        self.disjunctions = disjunctions
+
+    def is_satisfied(self, x: np.ndarray) -> bool:
+        lhs = self.A.dot(np.asarray(x, dtype=float))
+        rows = np.where(
+            self.sense == "=",
+            lhs == self.b,
+            np.where(self.sense == "<", lhs < self.b, lhs <= self.b),
+        )
+        if not rows[self.conjuncts].all():
+            return False
+        return all(
+            any(rows[group].all() for group in disjunction)
+            for disjunction in self.disjunctions
+        )
+
+
+class LinearTransformer(AstNodeTransformer):
+    """Lowers a linear VNN-LIB script into a sparse :class:`LinearSpec`.
+
+    Arithmetic terms are reduced to linear expressions while the AST is
+    transformed, and the boolean structure of each assertion is converted to
+    disjunctive normal form over interned constraint rows.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.variables: List[str] = []
+        self._variable_ids: Dict[str, int] = {}
+        self._rows: Dict[Row, int] = {}
+        self._conjuncts: List[int] = []
+        self._disjunctions: List[List[Tuple[int, ...]]] = []
+
+    def transform_Assert(self, term) -> None:
+        if not _is_bool(term):
+            raise RuntimeError("unexpected term for assert")
+        dnf = self._to_dnf(term, False)
+        if any(len(group) == 0 for group in dnf):
+            return
+        if len(dnf) == 1:
+            self._conjuncts.extend(dnf[0])
+        else:
+            self._disjunctions.append(dnf)
+
+    def transform_Constant(self, value) -> LinearExpr:
+        if not isinstance(value, (Real, int)):
+            raise NotImplementedError(
+                f"Constant {value!r} is not supported by the linear compiler"
+            )
+        return {}, value
+
+    def transform_DeclareConst(self, symbol: str, sort: str) -> None:
+        if sort not in ("Real", "Int"):
+            raise NotImplementedError(
+                f"Sort {sort!r} is not supported by the linear compiler"
+            )
+        self._variable_ids[symbol] = len(self.variables)
+        self.variables.append(symbol)
+
+    def transform_FunctionApplication(self, function: str, *terms):
+        if function in _COMPARISONS:
+            if any(_is_bool(term) for term in terms):
+                if function != "=":
+                    raise RuntimeError(f"unexpected boolean argument to {function!r}")
+                return _chain(function, terms, _iff)
+            return _chain(function, terms, _compare)
+        if function == "and" or function == "or":
+            return (function, terms)
+        if function == "not":
+            (term,) = terms
+            return ("not", term)
+        if function == "=>":
+            result = terms[-1]
+            for term in reversed(terms[:-1]):
+                result = ("or", (("not", term), result))
+            return result
+        if function == "xor":
+            result = terms[0]
+            for term in terms[1:]:
+                result = ("not", _iff("=", result, term))
+            return result
+        if function == "ite":
+            condition, then_term, else_term = terms
+            if _is_bool(then_term):
+                return ("ite", condition, then_term, else_term)
+            return [condition, then_term, else_term]
+        if function == "+":
+            return _apply_arithmetic(_add, terms)
+        if function == "-":
+            if len(terms) == 1:
+                return _apply_arithmetic(_negate, terms)
+            return _apply_arithmetic(_subtract, terms)
+        if function == "*":
+            return _apply_arithmetic(_multiply, terms)
+        if function == "/":
+            return _apply_arithmetic(_divide, terms)
+        raise NotImplementedError(
+            f"Function {function!r} is not supported by the linear compiler"
+        )
+
+    def transform_Identifier(self, value: str):
+        if value in self._variable_ids:
+            return {self._variable_ids[value]: 1}, 0
+        if value == "true" or value == "false":
+            return ("const", value == "true")
+        return value
+
+    def transform_Script(self, *commands) -> LinearSpec:
+        num_rows = len(self._rows)
+        rows = list(self._rows)
+        row_lengths = np.fromiter(
+            (len(coefficients) for _, coefficients, _ in rows), dtype=np.intp
+        )
+        indptr = np.zeros(num_rows + 1, dtype=np.intp)
+        np.cumsum(row_lengths, out=indptr[1:])
+        indices = np.fromiter(
+            (index for _, coefficients, _ in rows for index, _ in coefficients),
+            dtype=np.intp,
+            count=indptr[-1],
+        )
+        data = np.fromiter(
+            (value for _, coefficients, _ in rows for _, value in coefficients),
+            dtype=float,
+            count=indptr[-1],
+        )
+        return LinearSpec(
+            self.variables,
+            CsrMatrix(data, indices, indptr, (num_rows, len(self.variables))),
+            np.fromiter((rhs for _, _, rhs in rows), dtype=float, count=num_rows),
+            np.array([sense for sense, _, _ in rows], dtype="<U2").reshape(num_rows),
+            np.array(self._conjuncts, dtype=np.intp),
+            [
+                [np.array(group, dtype=np.intp) for group in disjunction]
+                for disjunction in self._disjunctions
+            ],
+        )
+
+    def _row(self, sense: str, expr: LinearExpr) -> int:
+        coefficients, constant = expr
+        row = (
+            sense,
+            tuple(sorted((i, c) for i, c in coefficients.items() if c != 0)),
+            -constant,
+        )
+        if row not in self._rows:
+            self._rows[row] = len(self._rows)
+        return self._rows[row]
+
+    def _to_dnf(self, term, negate: bool) -> List[Tuple[int, ...]]:
+        kind = term[0]
+        if kind == "atom":
+            _, sense, expr = term
+            if not negate:
+                return [(self._row(sense, expr),)]
+            negated_expr = _negate(expr)
+            if sense == "<=":
+                return [(self._row("<", negated_expr),)]
+            if sense == "<":
+                return [(self._row("<=", negated_expr),)]
+            return [(self._row("<", expr),), (self._row("<", negated_expr),)]
+        if kind == "const":
+            return [()] if term[1] != negate else []
+        if kind == "not":
+            return self._to_dnf(term[1], not negate)
+        if kind == "ite":
+            _, condition, then_term, else_term = term
+            return self._to_dnf(
+                (
+                    "or",
+                    (
+                        ("and", (condition, then_term)),
+                        ("and", (("not", condition), else_term)),
+                    ),
+                ),
+                negate,
+            )
+        if (kind == "or") != negate:
+            dnf = []
+            for child in term[1]:
+                dnf.extend(self._to_dnf(child, negate))
+            return dnf
+        dnf = [()]
+        for child in term[1]:
+            child_dnf = self._to_dnf(child, negate)
+            dnf = [
+                tuple(dict.fromkeys(left + right))
+                for left, right in itertools.product(dnf, child_dnf)
+            ]
+        return dnf
+
+
+def _is_bool(term) -> bool:
+    return isinstance(term, tuple) and isinstance(term[0], str)
+
+
+def _chain(function: str, terms: Sequence[Any], compare) -> Tuple:
+    if len(terms) == 2:
+        return compare(function, *terms)
+    return ("and", tuple(compare(function, *pair) for pair in zip(terms, terms[1:])))
+
+
+def _iff(function: str, lhs, rhs) -> Tuple:
+    return ("or", (("and", (lhs, rhs)), ("and", (("not", lhs), ("not", rhs)))))
+
+
+def _compare(function: str, lhs, rhs) -> Tuple:
+    if _is_bool(lhs) or _is_bool(rhs):
+        raise RuntimeError(f"unexpected boolean argument to {function!r}")
+    if isinstance(lhs, list) or isinstance(rhs, list):
+        # at least one side is an if-then-else term, compare each case separately
+        return _lift(lambda l, r: _compare(function, l, r), (lhs, rhs), True)
+    if function in ("<=", "<", "="):
+        return ("atom", function, _subtract(lhs, rhs))
+    return ("atom", "<=" if function == ">=" else "<", _subtract(rhs, lhs))
+
+
+def _lift(func, terms: Sequence[Any], boolean: bool):
+    # arithmetic if-then-else terms are represented as [condition, then, else]
+    for i, term in enumerate(terms):
+        if isinstance(term, list):
+            condition, then_term, else_term = term
+            then_result = _lift(func, (*terms[:i], then_term, *terms[i + 1 :]), boolean)
+            else_result = _lift(func, (*terms[:i], else_term, *terms[i + 1 :]), boolean)
+            if boolean:
+                return ("ite", condition, then_result, else_result)
+            return [condition, then_result, else_result]
+    return func(*terms)
+
+
+def _apply_arithmetic(func, terms: Sequence[Any]):
+    if any(_is_bool(term) for term in terms):
+        raise RuntimeError("unexpected boolean term in arithmetic")
+    if any(isinstance(term, list) for term in terms):
+        return _lift(func, terms, False)
+    return func(*terms)
+
+
+def _add(*terms: LinearExpr) -> LinearExpr:
+    coefficients: Dict[int, Real] = {}
+    constant: Real = 0
+    for term_coefficients, term_constant in terms:
+        for index, value in term_coefficients.items():
+            coefficients[index] = coefficients.get(index, 0) + value
+        constant += term_constant
+    return coefficients, constant
+
+
+def _negate(term: LinearExpr) -> LinearExpr:
+    coefficients, constant = term
+    return {index: -value for index, value in coefficients.items()}, -constant
+
+
+def _subtract(first: LinearExpr, *terms: LinearExpr) -> LinearExpr:
+    return _add(first, *(_negate(term) for term in terms))
+
+
+def _scale(term: LinearExpr, factor: Real) -> LinearExpr:
+    coefficients, constant = term
+    return (
+        {index: value * factor for index, value in coefficients.items()},
+        constant * factor,
+    )
+
+
+def _multiply(*terms: LinearExpr) -> LinearExpr:
+    result: Optional[LinearExpr] = None
+    factor: Real = 1
+    for term in terms:
+        if term[0]:
+            if result is not None:
+                raise NotImplementedError(
+                    "Nonlinear constraints are not supported by the linear compiler"
+                )
+            result = term
+        else:
+            factor *= term[1]
+    if result is None:
+        return {}, factor
+    return _scale(result, factor)
+
+
+def _divide(first: LinearExpr, *terms: LinearExpr) -> LinearExpr:
+    result = first
+    for coefficients, constant in terms:
+        if coefficients:
+            raise NotImplementedError(
+                "Nonlinear constraints are not supported by the linear compiler"
+            )
+        result = _scale(result, 1 / constant)
+    return result
+
+
+def read_vnnlib_linear(
+    vnnlib_filename: Union[str, pathlib.Path], strict: bool = False
+) -> LinearSpec:
+    """Compile a linear vnnlib file into sparse constraint matrices.
+
+    The result constrains the joint vector of all declared constants, in declaration
+    order, and does not depend on any naming convention for inputs and outputs.
+    """
+    ast_node = parse_file(vnnlib_filename, strict=strict)
+    return LinearTransformer().transform(ast_node)
+
+
+__all__ = [
+    "CsrMatrix",
+    "LinearSpec",
+    "LinearTransformer",
+    "read_vnnlib_linear",
+]
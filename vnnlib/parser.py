@@ -5,9 +5,11 @@ import gzip
 import lzma
 import warnings
 from pathlib import Path
-from typing import Callable, Dict, Iterator, List, Optional, TextIO, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from .errors import ParserError
+from .limits import Limits
+from .stats import ParseStats
 from .tokenizer import DUMMY_TOKEN, EOF, Token, tokenize
 
 Real = float
@@ -23,6 +25,12 @@ class Script(AstNode):
     def __init__(self, *commands: Command):
         self.commands = commands
 
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Script) and self.commands == other.commands
+
+    def __hash__(self) -> int:
+        return hash(self.commands)
+
 
 class Command(AstNode):
     pass
@@ -39,6 +47,16 @@ class DeclareConst(Declare):
         self.symbol = symbol
         self.sort = sort
 
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, DeclareConst)
+            and self.symbol == other.symbol
+            and self.sort == other.sort
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.symbol, self.sort))
+
 
 class Assert(Command):
     __slots__ = ("term",)
@@ -46,17 +64,86 @@ class Assert(Command):
     def __init__(self, term: Term):
         self.term = term
 
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Assert) and self.term == other.term
+
+    def __hash__(self) -> int:
+        return hash(self.term)
+
 
 class Term(AstNode):
     pass
 
 
 class FunctionApplication(Term):
-    __slots__ = "function", "terms"
+    __slots__ = "function", "terms", "_hash"
+    _hash: int
 
     def __init__(self, function: Identifier, *terms: Term):
         self.function = function
         self.terms = terms
+        # the hash slot is only set when the hash is first computed, which
+        # keeps construction as cheap as possible for the parser
+
+    def __eq__(self, other: object) -> bool:
+        return _terms_equal(self, other)
+
+    def __hash__(self) -> int:
+        cached_hash = _cached_hash(self)
+        if cached_hash is None:
+            _hash_terms(self)
+            cached_hash = _cached_hash(self)
+        assert cached_hash is not None
+        return cached_hash
+
+
+# terms can be nested arbitrarily deep, so they are compared and hashed with
+# explicit stacks rather than recursively
+
+
+def _terms_equal(term: FunctionApplication, other: object) -> bool:
+    pairs: List[Tuple[object, object]] = [(term, other)]
+    while pairs:
+        lhs, rhs = pairs.pop()
+        if lhs is rhs:
+            continue
+        if not isinstance(lhs, FunctionApplication):
+            if lhs != rhs:
+                return False
+            continue
+        if (
+            not isinstance(rhs, FunctionApplication)
+            or lhs.function != rhs.function
+            or len(lhs.terms) != len(rhs.terms)
+        ):
+            return False
+        lhs_hash, rhs_hash = _cached_hash(lhs), _cached_hash(rhs)
+        if lhs_hash is not None and rhs_hash is not None and lhs_hash != rhs_hash:
+            return False
+        pairs.extend(zip(lhs.terms, rhs.terms))
+    return True
+
+
+def _hash_terms(term: FunctionApplication) -> None:
+    # each hash is computed once from the cached hashes of the children
+    stack = [term]
+    while stack:
+        node = stack[-1]
+        pending = [
+            child
+            for child in node.terms
+            if isinstance(child, FunctionApplication) and _cached_hash(child) is None
+        ]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        if _cached_hash(node) is None:
+            node._hash = hash((node.function, node.terms))
+
+
+def _cached_hash(term: FunctionApplication) -> Optional[int]:
+    return getattr(term, "_hash", None)
 
 
 class Constant(Term):
@@ -65,6 +152,12 @@ class Constant(Term):
     def __init__(self, value: float | int | str | Real):
         self.value = value
 
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Constant) and self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
 
 class Sort(AstNode):
     __slots__ = ("value",)
@@ -79,6 +172,12 @@ class Identifier(Term):
     def __init__(self, value: str, sort: Sort):
         self.value = value
 
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Identifier) and self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
 
 def _hex_to_int(x: str) -> int:
     return int(x[2:], 16)
@@ -173,8 +272,44 @@ class VnnLibParser:
         return self.sorts[name]
 
     @classmethod
-    def parse(cls, text: str, strict=True) -> Script:
-        parser = VnnLibParser(tokenize(text, strict=strict))
+    def parse(
+        cls,
+        text: str,
+        strict=True,
+        stats: Optional[ParseStats] = None,
+        limits: Optional[Limits] = None,
+    ) -> Script:
+        if limits is not None:
+            limits.start()
+        return cls._parse_text(text, strict, stats, limits)
+
+    @classmethod
+    def _parse_text(
+        cls,
+        text: str,
+        strict: bool,
+        stats: Optional[ParseStats],
+        limits: Optional[Limits],
+    ) -> Script:
+        # the clock for the time limit is started by the caller, so that
+        # parse_file also counts the time spent reading the file
+        token_stream = tokenize(text, strict=strict)
+        if limits is not None:
+            # the length of ASCII text is its size in bytes, which avoids
+            # encoding the whole text
+            limits.check_bytes(len(text) if text.isascii() else len(text.encode()))
+            limits.check()
+            token_stream = limits.limit_tokens(token_stream)
+        if stats is None:
+            return cls.parse_tokens(token_stream)
+        with stats.phase("parse"):
+            ast_node = cls.parse_tokens(stats.count_tokens(token_stream))
+        stats.count_nodes(ast_node)
+        return ast_node
+
+    @classmethod
+    def parse_tokens(cls, token_stream: Iterator[Token]) -> Script:
+        parser = VnnLibParser(token_stream)
         parser.advance_token_stream()
         commands = []
         while parser.curr_token != EOF:
@@ -182,6 +317,14 @@ class VnnLibParser:
             commands.append(command)
         return Script(*commands)
 
+    @classmethod
+    def iter_parse_tokens(cls, token_stream: Iterator[Token]) -> Iterator[Command]:
+        """Parse a token stream lazily, yielding each command as it is parsed."""
+        parser = VnnLibParser(token_stream)
+        parser.advance_token_stream()
+        while parser.curr_token != EOF:
+            yield parser.parse_command()
+
     def parse_command(self) -> Command:
         self.ensure_token_type(self.curr_token, "LPAREN", expected_value="(")
         curr_token = self.advance_token_stream()
@@ -246,22 +389,86 @@ class VnnLibParser:
         raise ParserError(f"Unexpected token: {curr_token}")
 
 
-def parse_file(filename: Union[str, Path], strict=True) -> AstNode:
+DECOMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    ".gz": gzip.decompress,
+    ".gzip": gzip.decompress,
+    ".bz2": bz2.decompress,
+    ".bzip2": bz2.decompress,
+    ".xz": lzma.decompress,
+}
+# open functions that decompress files as they are read
+OPENERS: Dict[str, Callable[..., Any]] = {
+    ".gz": gzip.open,
+    ".gzip": gzip.open,
+    ".bz2": bz2.open,
+    ".bzip2": bz2.open,
+    ".xz": lzma.open,
+}
+
+
+def _read_prefix(filename: Path, size: int) -> bytes:
+    with OPENERS[filename.suffix](filename, "rb") as f:
+        return f.read(size)
+
+
+def _read_text(
+    filename: Path, stats: Optional[ParseStats], limits: Optional[Limits] = None
+) -> str:
+    if limits is not None:
+        file_size = filename.stat().st_size
+        limits.check_bytes(file_size)
+        if limits.max_bytes is not None and filename.suffix in OPENERS:
+            # compressed files are only decompressed up to the limit, so
+            # reading and decompression are timed together
+            if stats is None:
+                data = _read_prefix(filename, limits.max_bytes + 1)
+            else:
+                with stats.phase("decompress"):
+                    data = _read_prefix(filename, limits.max_bytes + 1)
+                stats.bytes_read += file_size
+                stats.decompression_time = stats.phase_times["decompress"]
+            limits.check_bytes(len(data))
+            return data.decode()
+    if stats is None:
+        open_func = OPENERS.get(filename.suffix, open)
+        with open_func(filename, "rt") as f:
+            return f.read()
+    # the raw bytes are read first, so that reading and decompression are
+    # timed separately
+    decompress = DECOMPRESSORS.get(filename.suffix)
+    with stats.phase("read"):
+        with open(filename, "rb") as f:
+            data = f.read()
+    stats.bytes_read += len(data)
+    with stats.phase("decompress"):
+        if decompress is not None:
+            data = decompress(data)
+        text = data.decode()
+    stats.decompression_time = stats.phase_times["decompress"]
+    return text
+
+
+def parse_file(
+    filename: Union[str, Path],
+    strict=True,
+    stats: Optional[ParseStats] = None,
+    simplify=False,
+    limits: Optional[Limits] = None,
+) -> AstNode:
     if isinstance(filename, str):
         filename = Path(filename)
-    open_func: Callable[[Union[str, Path]], TextIO]
-    if filename.suffix in {".gz", ".gzip"}:
-        open_func = lambda fname: gzip.open(fname, "rt")
-    elif filename.suffix in {".bz2", ".bzip2"}:
-        open_func = lambda fname: bz2.open(fname, "rt")
-    elif filename.suffix == ".xz":
-        open_func = lambda fname: lzma.open(fname, "rt")
-    else:
-        open_func = open
-
-    with open_func(filename) as f:
-        text = f.read()
-    ast_node = VnnLibParser.parse(text, strict=strict)
+    if limits is not None:
+        limits.start()
+    text = _read_text(filename, stats, limits)
+    ast_node: AstNode = VnnLibParser._parse_text(text, strict, stats, limits)
+    if simplify:
+        from .simplify import SimplifyTransformer
+
+        if stats is None:
+            ast_node = SimplifyTransformer().transform(ast_node)
+        else:
+            with stats.phase("simplify"):
+                ast_node = SimplifyTransformer().transform(ast_node)
 
     return ast_node
 
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .parser import Real
+
+Box = Union[Sequence[Sequence[Real]], np.ndarray]
+Polytope = Tuple[np.ndarray, np.ndarray]
+
+
+def _prime_factors(n: int) -> List[int]:
+    factors = []
+    factor = 2
+    while factor * factor <= n:
+        while n % factor == 0:
+            factors.append(factor)
+            n //= factor
+        factor += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def split_counts(
+    box: Box, num_boxes: int, dims: Optional[Sequence[int]] = None
+) -> np.ndarray:
+    """Choose how many pieces to split each dimension of a box into.
+
+    The number of pieces of each dimension multiply to exactly ``num_boxes``.
+    Each prime factor of ``num_boxes``, largest first, is assigned to the
+    dimension whose pieces are currently widest, considering only ``dims`` if
+    it is given. Unbounded dimensions are never split.
+    """
+    if num_boxes < 1:
+        raise ValueError(f"num_boxes must be positive, got {num_boxes}")
+    box = np.asarray(box, dtype=float).reshape(-1, 2)
+    widths = box[:, 1] - box[:, 0]
+    candidates = np.zeros(len(box), dtype=bool)
+    if dims is None:
+        candidates[:] = True
+    else:
+        candidates[list(dims)] = True
+    candidates &= np.isfinite(widths) & (widths > 0)
+    counts = np.ones(len(box), dtype=np.intp)
+    factors = _prime_factors(num_boxes)
+    if factors and not candidates.any():
+        raise ValueError("box has no bounded dimension of positive width to split")
+    for factor in sorted(factors, reverse=True):
+        piece_widths = np.where(candidates, widths / counts, -np.inf)
+        counts[np.argmax(piece_widths)] *= factor
+    return counts
+
+
+def _sub_boxes(box: np.ndarray, counts: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    # indices are flat indices of sub-boxes in the C-ordered grid given by counts
+    grid_indices = np.stack(np.unravel_index(indices, tuple(counts)), axis=-1)
+    lower, upper = box[:, 0], box[:, 1]
+    piece_widths = np.where(counts > 1, (upper - lower) / counts, 0.0)
+    sub_boxes = np.empty((len(indices), len(box), 2))
+    sub_boxes[:, :, 0] = np.where(
+        grid_indices == 0, lower, lower + grid_indices * piece_widths
+    )
+    sub_boxes[:, :, 1] = np.where(
+        grid_indices == counts - 1, upper, lower + (grid_indices + 1) * piece_widths
+    )
+    return sub_boxes
+
+
+def iter_partition(
+    box: Box,
+    num_boxes: int,
+    dims: Optional[Sequence[int]] = None,
+    batch_size: int = 1024,
+) -> Iterator[np.ndarray]:
+    """Lazily split a box into ``num_boxes`` sub-boxes of shape ``(n, 2)``.
+
+    Sub-boxes are generated ``batch_size`` at a time, in C order over the
+    grid of pieces chosen by :func:`split_counts`.
+    """
+    box = np.asarray(box, dtype=float).reshape(-1, 2)
+    counts = split_counts(box, num_boxes, dims)
+    for start in range(0, num_boxes, batch_size):
+        indices = np.arange(start, min(start + batch_size, num_boxes))
+        yield from _sub_boxes(box, counts, indices)
+
+
+def partition_box(
+    box: Box,
+    num_boxes: int,
+    dims: Optional[Sequence[int]] = None,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Split a box into ``num_boxes`` sub-boxes, stacked into one array.
+
+    The result has shape ``(num_boxes, n, 2)`` and is written into ``out``
+    if it is given, for instance a shared memory buffer.
+    """
+    box = np.asarray(box, dtype=float).reshape(-1, 2)
+    counts = split_counts(box, num_boxes, dims)
+    sub_boxes = _sub_boxes(box, counts, np.arange(num_boxes))
+    if out is None:
+        return sub_boxes
+    out[...] = sub_boxes
+    return out
+
+
+def partition_compat(
+    result: List[Tuple[List[List[Real]], List[Polytope]]],
+    num_boxes: int,
+    dims: Optional[Sequence[int]] = None,
+) -> Iterator[Tuple[List[List[Real]], List[Polytope]]]:
+    """Lazily split every box of a :func:`vnnlib.compat.read_vnnlib_simple` result.
+
+    Each sub-box is paired with the disjuncts of the box it was split from, so
+    the output has the same format as the input, with ``num_boxes`` times as
+    many entries.
+    """
+    for box, polytopes in result:
+        for sub_box in iter_partition(box, num_boxes, dims):
+            yield sub_box.tolist(), polytopes
+
+
+__all__ = ["iter_partition", "partition_box", "partition_compat", "split_counts"]
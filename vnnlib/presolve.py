@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .parser import Real
+
+Polytope = Tuple[np.ndarray, np.ndarray]
+CompatResult = List[Tuple[List[List[Real]], List[Polytope]]]
+
+
+class PresolveReport:
+    """Counts of what was removed by :func:`presolve`."""
+
+    __slots__ = (
+        "trivial_rows",
+        "duplicate_rows",
+        "dominated_rows",
+        "infeasible_disjuncts",
+        "duplicate_disjuncts",
+        "subsumed_disjuncts",
+        "removed_boxes",
+    )
+
+    def __init__(self) -> None:
+        self.trivial_rows = 0
+        self.duplicate_rows = 0
+        self.dominated_rows = 0
+        self.infeasible_disjuncts = 0
+        self.duplicate_disjuncts = 0
+        self.subsumed_disjuncts = 0
+        self.removed_boxes = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"PresolveReport({fields})"
+
+
+def _presolve_polytope(
+    mat: np.ndarray, rhs: np.ndarray, report: PresolveReport
+) -> Optional[Polytope]:
+    """Presolve a single polytope ``mat @ y <= rhs``.
+
+    Returns ``None`` if the polytope is found to be empty.
+    """
+    if len(rhs) == 0:
+        # read_vnnlib_simple returns (np.array([]), np.array([])) for a
+        # disjunct without rows, which is kept as it is
+        return mat, rhs
+    mat = np.asarray(mat, dtype=float).reshape(len(rhs), -1)
+    rhs = np.asarray(rhs, dtype=float).reshape(-1)
+
+    scale = np.abs(mat).max(axis=1, initial=0.0)
+    constant_rows = scale == 0
+    if np.any(rhs[constant_rows] < 0):
+        return None
+    report.trivial_rows += int(constant_rows.sum())
+    mat, rhs, scale = mat[~constant_rows], rhs[~constant_rows], scale[~constant_rows]
+    if len(rhs) == 0:
+        return mat, rhs.reshape(-1, 1)
+
+    # rows with parallel normals differ only by their (scaled) right hand side,
+    # the one with the smallest right hand side dominates all the others
+    normalized_mat = mat / scale[:, None] + 0.0
+    normalized_rhs = rhs / scale
+    unique_rows, first_index, inverse = np.unique(
+        normalized_mat, axis=0, return_index=True, return_inverse=True
+    )
+    inverse = inverse.reshape(-1)
+    tightest_rhs = np.full(len(unique_rows), np.inf)
+    np.minimum.at(tightest_rhs, inverse, normalized_rhs)
+    num_dominated = int((normalized_rhs > tightest_rhs[inverse]).sum())
+    report.dominated_rows += num_dominated
+    report.duplicate_rows += len(rhs) - len(unique_rows) - num_dominated
+
+    # opposite half-spaces a @ y <= b1 and -a @ y <= b2 are disjoint if b1 < -b2
+    bounds = {row.tobytes(): b for row, b in zip(unique_rows, tightest_rhs)}
+    for row, b in zip(unique_rows, tightest_rhs):
+        opposite_b = bounds.get((0.0 - row).tobytes())
+        if opposite_b is not None and b + opposite_b < 0:
+            return None
+
+    order = np.argsort(first_index)
+    kept = first_index[order]
+    return mat[kept], (tightest_rhs[order] * scale[kept]).reshape(-1, 1)
+
+
+def _polytope_key(polytope: Polytope) -> Tuple[Tuple[int, ...], bytes]:
+    mat, rhs = polytope
+    rows = np.hstack([mat, rhs])
+    rows = rows[np.lexsort(rows.T[::-1])] if len(rows) else rows
+    return rows.shape, rows.tobytes()
+
+
+def presolve(result: CompatResult) -> Tuple[CompatResult, PresolveReport]:
+    """Simplify the output of :func:`vnnlib.compat.read_vnnlib_simple`.
+
+    Within each disjunct polytope ``mat @ y <= rhs``, constant rows are removed,
+    duplicate rows and rows dominated by a parallel tighter row are dropped, and
+    infeasible polytopes are detected from conflicting opposite rows (such as
+    single-variable lower and upper bounds). Infeasible and duplicate disjuncts are
+    removed, a disjunct without any rows subsumes the others under its box, and
+    boxes that are empty or have no remaining disjuncts are removed.
+
+    Returns the simplified result in the same format, and a report of what
+    was removed.
+    """
+    report = PresolveReport()
+    presolved: CompatResult = []
+    for box, polytopes in result:
+        if any(lower > upper for lower, upper in box):
+            report.removed_boxes += 1
+            continue
+        presolved_polytopes: List[Polytope] = []
+        seen = set()
+        for mat, rhs in polytopes:
+            polytope = _presolve_polytope(mat, rhs, report)
+            if polytope is None:
+                report.infeasible_disjuncts += 1
+                continue
+            key = _polytope_key(polytope)
+            if key in seen:
+                report.duplicate_disjuncts += 1
+                continue
+            seen.add(key)
+            presolved_polytopes.append(polytope)
+        for polytope in presolved_polytopes:
+            if len(polytope[1]) == 0:
+                report.subsumed_disjuncts += len(presolved_polytopes) - 1
+                presolved_polytopes = [polytope]
+                break
+        if not presolved_polytopes:
+            report.removed_boxes += 1
+            continue
+        presolved.append((box, presolved_polytopes))
+    return presolved, report
+
+
+__all__ = ["PresolveReport", "presolve"]
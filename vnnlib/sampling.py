@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .compat import Box
+
+Polytope = Tuple[np.ndarray, np.ndarray]
+Seed = Union[None, int, np.random.Generator]
+
+_METHODS = ("uniform", "corner", "lhs")
+_POLYTOPE_METHODS = ("rejection", "hit_and_run")
+# candidates drawn per round of rejection sampling are kept within these bounds
+_MIN_BATCH_SIZE = 1024
+_MAX_BATCH_SIZE = 1 << 20
+_MAX_REJECTION_ROUNDS = 100
+
+
+def _as_box(box) -> Tuple[np.ndarray, np.ndarray]:
+    bounds = np.asarray(box, dtype=float).reshape(-1, 2)
+    lo, hi = bounds[:, 0], bounds[:, 1]
+    if not (np.isfinite(lo).all() and np.isfinite(hi).all()):
+        raise ValueError("cannot sample from an unbounded box")
+    if (lo > hi).any():
+        raise ValueError("cannot sample from an empty box")
+    return lo, hi
+
+
+def _output(n: Optional[int], size: int, out: Optional[np.ndarray]) -> np.ndarray:
+    if out is None:
+        if n is None:
+            raise ValueError("either n or out must be given")
+        return np.empty((n, size))
+    if out.ndim != 2 or out.shape[1] != size or (n is not None and len(out) != n):
+        raise ValueError(
+            f"expected out of shape ({'N' if n is None else n}, {size}), got {out.shape}"
+        )
+    return out
+
+
+def _fill(
+    lo: np.ndarray, hi: np.ndarray, method: str, rng: np.random.Generator, out
+) -> None:
+    # lo and hi have shape (d,), or (len(out), d) for a box per sample
+    if method == "uniform":
+        rng.random(out=out, dtype=out.dtype)
+    elif method == "corner":
+        np.copyto(out, lo)
+        np.copyto(out, hi, where=rng.integers(0, 2, size=out.shape, dtype=bool))
+        return
+    elif method == "lhs":
+        n, d = out.shape
+        # each column is a random permutation of the n strata of [0, 1)
+        strata = np.argsort(rng.random((d, n)), axis=1).T
+        rng.random(out=out, dtype=out.dtype)
+        out += strata
+        out /= n
+    else:
+        raise ValueError(
+            f"unknown sampling method {method!r}, expected one of {_METHODS}"
+        )
+    out *= hi - lo
+    out += lo
+
+
+def sample_box(
+    box: Union[Box, np.ndarray],
+    n: Optional[int] = None,
+    method: str = "uniform",
+    seed: Seed = None,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Sample points from a box of shape ``(d, 2)``, as an array of shape ``(n, d)``.
+
+    ``method`` is ``"uniform"`` for uniform samples, ``"corner"`` for random
+    vertices of the box, or ``"lhs"`` for a Latin hypercube sample. ``seed``
+    is a seed or a ``numpy.random.Generator``. If ``out`` is given, samples are
+    written into it in place and it is returned, and ``n`` may be omitted.
+    """
+    lo, hi = _as_box(box)
+    out = _output(n, len(lo), out)
+    _fill(lo, hi, method, np.random.default_rng(seed), out)
+    return out
+
+
+def _volumes(boxes: Sequence[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+    volumes = np.array([np.prod(hi - lo) for lo, hi in boxes], dtype=float)
+    if volumes.sum() <= 0:
+        return np.ones(len(boxes)) / len(boxes)
+    return volumes / volumes.sum()
+
+
+def sample_boxes(
+    boxes: Sequence[Union[Box, np.ndarray]],
+    n: Optional[int] = None,
+    method: str = "uniform",
+    seed: Seed = None,
+    out: Optional[np.ndarray] = None,
+    weights: Optional[Sequence[float]] = None,
+) -> np.ndarray:
+    """Sample points from a union of boxes, such as the boxes of a compat result.
+
+    Each sample is drawn from a box chosen at random with probability
+    ``weights``, which defaults to the volume of each box, so samples are
+    uniform over the union of disjoint boxes. See :func:`sample_box` for the
+    other arguments. The boxes of a compat result can be sampled with
+    ``sample_boxes([box for box, _ in result], n)``.
+    """
+    bounds = [_as_box(box) for box in boxes]
+    if not bounds:
+        raise ValueError("cannot sample from an empty union of boxes")
+    rng = np.random.default_rng(seed)
+    out = _output(n, len(bounds[0][0]), out)
+    p = _volumes(bounds) if weights is None else np.asarray(weights, dtype=float)
+    indices = rng.choice(len(bounds), size=len(out), p=p / p.sum())
+    lo = np.stack([lo for lo, _ in bounds])[indices]
+    hi = np.stack([hi for _, hi in bounds])[indices]
+    _fill(lo, hi, method, rng, out)
+    return out
+
+
+def _in_polytopes(x: np.ndarray, polytopes: Sequence[Polytope]) -> np.ndarray:
+    # whether each point is in any of the polytopes
+    mask = np.zeros(len(x), dtype=bool)
+    for mat, rhs in polytopes:
+        mask |= (x @ np.asarray(mat).T <= np.asarray(rhs).reshape(-1)).all(axis=1)
+    return mask
+
+
+def _rejection_sample(
+    lo: np.ndarray,
+    hi: np.ndarray,
+    polytopes: Sequence[Polytope],
+    method: str,
+    rng: np.random.Generator,
+    out: np.ndarray,
+) -> None:
+    num_filled = 0
+    num_drawn = 0
+    num_accepted = 0
+    for _ in range(_MAX_REJECTION_ROUNDS):
+        remaining = len(out) - num_filled
+        if remaining == 0:
+            return
+        # draw enough candidates for the remaining samples at the observed rate
+        rate = max(num_accepted / num_drawn, 1e-3) if num_drawn else 1.0
+        batch_size = int(min(max(remaining / rate, _MIN_BATCH_SIZE), _MAX_BATCH_SIZE))
+        candidates = np.empty((batch_size, len(lo)), dtype=out.dtype)
+        _fill(lo, hi, method, rng, candidates)
+        accepted = candidates[_in_polytopes(candidates, polytopes)][:remaining]
+        out[num_filled : num_filled + len(accepted)] = accepted
+        num_filled += len(accepted)
+        num_drawn += batch_size
+        num_accepted += len(accepted)
+    if num_filled < len(out):
+        raise RuntimeError(
+            f"only {num_filled} of {len(out)} samples were accepted after"
+            f" {num_drawn} candidates, try hit-and-run sampling instead"
+        )
+
+
+def _starting_points(
+    lo: np.ndarray,
+    hi: np.ndarray,
+    mat: np.ndarray,
+    rhs: np.ndarray,
+    count: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    # points accepted from a uniform sample of the box are uniform in the
+    # polytope, so chains started from them only need to spread out
+    candidates = np.empty((_MIN_BATCH_SIZE, len(lo)))
+    _fill(lo, hi, "uniform", rng, candidates)
+    inside = candidates[_in_polytopes(candidates, [(mat, rhs)])]
+    if len(inside):
+        return inside[rng.integers(0, len(inside), size=count)]
+    try:
+        from scipy.optimize import linprog  # type: ignore
+    except ImportError as e:
+        raise RuntimeError(
+            "no point in the polytope was found, and scipy is required to find one"
+        ) from e
+    # the center of the largest ball in the polytope, which maximizes r such that
+    # a @ x + r * |a| <= b for every row
+    norms = np.linalg.norm(mat, axis=1)
+    result = linprog(
+        np.r_[np.zeros(len(lo)), -1.0],
+        A_ub=np.c_[mat, norms],
+        b_ub=rhs,
+        bounds=[*zip(lo, hi), (0, None)],
+    )
+    if not result.success:
+        raise RuntimeError("the polytope is empty")
+    return np.tile(result.x[:-1], (count, 1))
+
+
+def _hit_and_run(
+    lo: np.ndarray,
+    hi: np.ndarray,
+    polytope: Polytope,
+    steps: int,
+    rng: np.random.Generator,
+    out: np.ndarray,
+) -> None:
+    mat = np.asarray(polytope[0], dtype=float)
+    rhs = np.asarray(polytope[1], dtype=float).reshape(-1)
+    # one chain per sample, each moving along a random input at each step, so
+    # the slack of every row can be updated without a matrix product
+    x = _starting_points(lo, hi, mat, rhs, len(out), rng)
+    slack = rhs - x @ mat.T
+    mat_columns = mat.T
+    chains = np.arange(len(x))
+    # chains can not move along fixed inputs
+    free = np.flatnonzero(lo < hi)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(steps if len(free) else 0):
+            inputs = free[rng.integers(0, len(free), size=len(x))]
+            values = x[chains, inputs]
+            rates = mat_columns[inputs]
+            steps_to_boundary = np.maximum(slack, 0.0) / rates
+            t_max = np.where(rates > 0, steps_to_boundary, np.inf).min(axis=1)
+            t_min = np.where(rates < 0, steps_to_boundary, -np.inf).max(axis=1)
+            # the bounds of the box along the input
+            t_max = np.minimum(t_max, hi[inputs] - values)
+            t_min = np.maximum(t_min, lo[inputs] - values)
+            t = t_min + (t_max - t_min) * rng.random(len(x))
+            x[chains, inputs] = values + t
+            slack -= t[:, None] * rates
+    out[...] = x
+
+
+def sample_regions(
+    regions: Sequence[Tuple[Union[Box, np.ndarray], List[Polytope]]],
+    n: Optional[int] = None,
+    method: str = "uniform",
+    seed: Seed = None,
+    out: Optional[np.ndarray] = None,
+    polytope_method: str = "rejection",
+    hit_and_run_steps: int = 64,
+) -> np.ndarray:
+    """Sample points from input regions, such as those of :func:`vnnlib.inputs.read_vnnlib_inputs`.
+
+    Each region is a box with a list of polytopes ``(mat, rhs)`` over the
+    inputs, and contains the points of the box in any of its polytopes. The
+    number of samples from each region is proportional to the volume of its
+    box. Points are drawn from the box with ``method``, and if no polytope of
+    the region is empty, they are either rejected when they are outside every
+    polytope (``polytope_method="rejection"``), or drawn with parallel
+    coordinate hit-and-run chains of ``hit_and_run_steps`` steps started from
+    points in each polytope (``polytope_method="hit_and_run"``), which suits
+    polytopes that fill little of their box. Samples are
+    shuffled, so that they are not grouped by region. See :func:`sample_box`
+    for the other arguments.
+    """
+    if polytope_method not in _POLYTOPE_METHODS:
+        raise ValueError(
+            f"unknown polytope sampling method {polytope_method!r},"
+            f" expected one of {_POLYTOPE_METHODS}"
+        )
+    if not regions:
+        raise ValueError("cannot sample from an empty list of regions")
+    bounds = [_as_box(box) for box, _ in regions]
+    rng = np.random.default_rng(seed)
+    out = _output(n, len(bounds[0][0]), out)
+    counts = rng.multinomial(len(out), _volumes(bounds))
+    start = 0
+    for (lo, hi), (_, polytopes), count in zip(bounds, regions, counts):
+        region_out = out[start : start + count]
+        start += count
+        if count == 0:
+            continue
+        if not polytopes or any(len(rhs) == 0 for _, rhs in polytopes):
+            _fill(lo, hi, method, rng, region_out)
+        elif polytope_method == "rejection":
+            _rejection_sample(lo, hi, polytopes, method, rng, region_out)
+        else:
+            polytope_counts = rng.multinomial(
+                count, np.ones(len(polytopes)) / len(polytopes)
+            )
+            polytope_start = 0
+            for polytope, polytope_count in zip(polytopes, polytope_counts):
+                polytope_out = region_out[
+                    polytope_start : polytope_start + polytope_count
+                ]
+                polytope_start += polytope_count
+                if polytope_count:
+                    _hit_and_run(lo, hi, polytope, hit_and_run_steps, rng, polytope_out)
+    if len(regions) > 1 or polytope_method == "hit_and_run":
+        rng.shuffle(out)
+    return out
+
+
+__all__ = ["sample_box", "sample_boxes", "sample_regions"]
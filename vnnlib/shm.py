@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import os
+import uuid
+from concurrent.futures import Executor
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from .compat import Box, read_vnnlib_simple
+
+CompatResult = List[Tuple[Box, List[Tuple[np.ndarray, np.ndarray]]]]
+SharedCompatResult = List[Tuple[np.ndarray, List[Tuple[np.ndarray, np.ndarray]]]]
+# the offset, shape, and dtype of an array in a shared memory block
+ArraySpec = Tuple[int, Tuple[int, ...], str]
+Layout = List[Tuple[ArraySpec, List[Tuple[ArraySpec, ArraySpec]]]]
+
+_ALIGNMENT = 8
+# on Windows, a named block is removed when its last handle is closed, so it can
+# not outlive the process that writes it, and results are passed inline instead
+_SHARED_BLOCKS = os.name == "posix"
+
+
+class SharedResultDescriptor:
+    """A small, picklable description of a compat result in shared memory.
+
+    Where blocks can not outlive the process that writes them, ``data`` holds
+    the contents of the block instead.
+    """
+
+    __slots__ = ("name", "size", "layout", "data")
+
+    def __init__(
+        self, name: str, size: int, layout: Layout, data: Optional[bytearray] = None
+    ) -> None:
+        self.name = name
+        self.size = size
+        self.layout = layout
+        self.data = data
+
+    def __getstate__(self):
+        return self.name, self.size, self.layout, self.data
+
+    def __setstate__(self, state) -> None:
+        self.name, self.size, self.layout, self.data = state
+
+    def __repr__(self) -> str:
+        return (
+            f"SharedResultDescriptor(name={self.name!r}, size={self.size},"
+            f" boxes={len(self.layout)})"
+        )
+
+
+def new_block_name() -> str:
+    """Create a unique name for a shared memory block."""
+    return f"vnnlib_{os.getpid()}_{uuid.uuid4().hex[:16]}"
+
+
+def unlink_block(name: str) -> bool:
+    """Remove a shared memory block if it exists, returning whether it did."""
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    shm.close()
+    shm.unlink()
+    return True
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    # the resource tracker removes blocks created or attached to by a process
+    # when it exits, but the block must outlive the worker that writes it
+    if _SHARED_BLOCKS:
+        resource_tracker.unregister(getattr(shm, "_name", shm.name), "shared_memory")
+
+
+def write_shared(
+    result: CompatResult, name: Optional[str] = None
+) -> SharedResultDescriptor:
+    """Copy a compat result into a new shared memory block.
+
+    Every box and polytope is copied into a single block, named ``name`` if it
+    is given. The block is left open for another process to attach to with
+    :func:`attach_shared`, which then becomes responsible for removing it.
+    Where blocks can not outlive the process that writes them, no block is
+    created, and the descriptor holds the data instead.
+    """
+    arrays: List[Tuple[ArraySpec, np.ndarray]] = []
+    layout: Layout = []
+    size = 0
+
+    def add(array: np.ndarray) -> ArraySpec:
+        nonlocal size
+        spec = (size, array.shape, array.dtype.str)
+        size += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+        arrays.append((spec, array))
+        return spec
+
+    for box, polytopes in result:
+        box_spec = add(np.asarray(box, dtype=float))
+        polytope_specs = [
+            (add(np.asarray(mat)), add(np.asarray(rhs))) for mat, rhs in polytopes
+        ]
+        layout.append((box_spec, polytope_specs))
+
+    if not _SHARED_BLOCKS:
+        data = bytearray(max(size, 1))
+        for spec, array in arrays:
+            _view(memoryview(data), spec)[...] = array
+        return SharedResultDescriptor(name or new_block_name(), size, layout, data)
+
+    shm = shared_memory.SharedMemory(
+        name=name or new_block_name(), create=True, size=max(size, 1)
+    )
+    try:
+        buffer = shm.buf
+        assert buffer is not None
+        for spec, array in arrays:
+            _view(buffer, spec)[...] = array
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    _untrack(shm)
+    descriptor = SharedResultDescriptor(shm.name, size, layout)
+    shm.close()
+    return descriptor
+
+
+class SharedResult:
+    """A compat result backed by a shared memory block owned by this process.
+
+    ``result`` has the format of :func:`vnnlib.compat.read_vnnlib_simple`,
+    except that boxes are arrays of shape ``(n, 2)``. All arrays are views
+    of the shared memory block, without any copies, so they must not be used
+    after :meth:`close`, which also removes the block. Results can be used as
+    context managers to close them. A block that is never closed is removed by
+    the resource tracker when this process exits.
+    """
+
+    def __init__(self, descriptor: SharedResultDescriptor) -> None:
+        self.descriptor = descriptor
+        self._closed = False
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        buffer: Optional[memoryview]
+        if descriptor.data is not None:
+            buffer = memoryview(descriptor.data)
+        else:
+            self._shm = shared_memory.SharedMemory(name=descriptor.name)
+            buffer = self._shm.buf
+        assert buffer is not None
+        self.result: SharedCompatResult = [
+            (
+                _view(buffer, box_spec),
+                [
+                    (_view(buffer, mat_spec), _view(buffer, rhs_spec))
+                    for mat_spec, rhs_spec in polytope_specs
+                ],
+            )
+            for box_spec, polytope_specs in descriptor.layout
+        ]
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self.result = []
+        shm = self._shm
+        if shm is None:
+            return
+        self._shm = None
+        shm.unlink()
+        # raises a BufferError if views of the block are still referenced
+        shm.close()
+
+    def __enter__(self) -> SharedResult:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _view(buffer: memoryview, spec: ArraySpec) -> np.ndarray:
+    offset, shape, dtype = spec
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=buffer, offset=offset)
+
+
+def attach_shared(descriptor: SharedResultDescriptor) -> SharedResult:
+    """Attach to a compat result written by :func:`write_shared` in another process."""
+    return SharedResult(descriptor)
+
+
+def read_vnnlib_shared(
+    vnnlib_filename: Union[str, Path],
+    num_inputs: int,
+    num_outputs: int,
+    name: Optional[str] = None,
+) -> SharedResultDescriptor:
+    """Read a spec like :func:`vnnlib.compat.read_vnnlib_simple` into shared memory.
+
+    This is meant to run in a worker process, returning only a small descriptor
+    to the parent, which can attach to the result with :func:`attach_shared`.
+    """
+    result = read_vnnlib_simple(vnnlib_filename, num_inputs, num_outputs)
+    assert isinstance(result, list)
+    return write_shared(result, name)
+
+
+def submit_shared(
+    executor: Executor,
+    vnnlib_filename: Union[str, Path],
+    num_inputs: int,
+    num_outputs: int,
+) -> SharedResult:
+    """Read a spec in a worker process of ``executor``, returning it in shared memory.
+
+    The parent names the block before submitting the work, so that a block
+    left behind by a worker that crashed after creating it can be removed.
+    """
+    name = new_block_name()
+    future = executor.submit(
+        read_vnnlib_shared, vnnlib_filename, num_inputs, num_outputs, name
+    )
+    try:
+        descriptor = future.result()
+    except BaseException:
+        unlink_block(name)
+        raise
+    return attach_shared(descriptor)
+
+
+__all__ = [
+    "SharedResult",
+    "SharedResultDescriptor",
+    "attach_shared",
+    "new_block_name",
+    "read_vnnlib_shared",
+    "submit_shared",
+    "unlink_block",
+    "write_shared",
+]
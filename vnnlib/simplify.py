@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import operator
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from .parser import (
+    CORE_IDS,
+    Assert,
+    AstNode,
+    Command,
+    Constant,
+    DeclareConst,
+    FunctionApplication,
+    Identifier,
+    Script,
+    Sort,
+    Term,
+)
+from .transformer import AstNodeTransformer, Discard
+
+Number = Union[int, float]
+
+TRUE = CORE_IDS["true"]
+FALSE = CORE_IDS["false"]
+
+_COMPARISONS: Dict[str, Callable[[Number, Number], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "=": operator.eq,
+}
+_BOOLEAN = frozenset(("and", "or", "not", "=>", "xor", "ite"))
+# the sort of identifiers that are used without being declared
+_UNKNOWN_SORT = Sort("")
+
+
+def _number(term: Term) -> Optional[Number]:
+    if isinstance(term, Constant) and isinstance(term.value, (int, float)):
+        return term.value
+    return None
+
+
+def _is_application(term: Term, function: str) -> bool:
+    return isinstance(term, FunctionApplication) and term.function.value == function
+
+
+def _flatten(function: Identifier, terms: Sequence[Term]) -> List[Term]:
+    # children are simplified first, so nested applications are already flat
+    flattened: List[Term] = []
+    for term in terms:
+        if _is_application(term, function.value):
+            assert isinstance(term, FunctionApplication)
+            flattened.extend(term.terms)
+        else:
+            flattened.append(term)
+    return flattened
+
+
+def _apply(function: Identifier, terms: Sequence[Term]) -> Term:
+    if len(terms) == 1:
+        return terms[0]
+    return FunctionApplication(function, *terms)
+
+
+def _negate(term: Term) -> Term:
+    value = _number(term)
+    if value is not None:
+        return Constant(-value)
+    if _is_application(term, "-"):
+        assert isinstance(term, FunctionApplication)
+        if len(term.terms) == 1:
+            return term.terms[0]
+    return FunctionApplication(CORE_IDS["-"], term)
+
+
+def _simplify_add(function: Identifier, terms: Sequence[Term]) -> Term:
+    total: Number = 0
+    others = []
+    for term in _flatten(function, terms):
+        value = _number(term)
+        if value is None:
+            others.append(term)
+        else:
+            total += value
+    if not others or total != 0:
+        others.append(Constant(total))
+    return _apply(function, others)
+
+
+def _simplify_sub(function: Identifier, terms: Sequence[Term]) -> Term:
+    if len(terms) == 1:
+        return _negate(terms[0])
+    first, *rest = terms
+    subtrahend: Number = 0
+    others = []
+    for term in rest:
+        value = _number(term)
+        if value is None:
+            others.append(term)
+        else:
+            subtrahend += value
+    first_value = _number(first)
+    if first_value is None:
+        if subtrahend != 0:
+            others.append(Constant(subtrahend))
+        return FunctionApplication(function, first, *others) if others else first
+    first_value -= subtrahend
+    if not others:
+        return Constant(first_value)
+    if first_value == 0 and len(others) == 1:
+        return _negate(others[0])
+    return FunctionApplication(function, Constant(first_value), *others)
+
+
+def _simplify_mul(function: Identifier, terms: Sequence[Term]) -> Term:
+    product: Number = 1
+    others = []
+    for term in _flatten(function, terms):
+        value = _number(term)
+        if value is None:
+            others.append(term)
+        else:
+            product *= value
+    if product == 0 or not others:
+        return Constant(product)
+    if product != 1:
+        others.insert(0, Constant(product))
+    return _apply(function, others)
+
+
+def _simplify_div(function: Identifier, terms: Sequence[Term]) -> Term:
+    first, *rest = terms
+    divisors = [term for term in rest if _number(term) != 1]
+    first_value = _number(first)
+    if first_value is not None and divisors:
+        values = [_number(term) for term in divisors]
+        if all(value is not None and value != 0 for value in values):
+            for value in values:
+                assert value is not None
+                first_value /= value
+            return Constant(first_value)
+    return FunctionApplication(function, first, *divisors) if divisors else first
+
+
+def _simplify_comparison(function: Identifier, terms: Sequence[Term]) -> Term:
+    values = [_number(term) for term in terms]
+    if any(value is None for value in values):
+        return FunctionApplication(function, *terms)
+    compare = _COMPARISONS[function.value]
+    for lhs, rhs in zip(values, values[1:]):
+        assert lhs is not None and rhs is not None
+        if not compare(lhs, rhs):
+            return FALSE
+    return TRUE
+
+
+def _dedupe_key(term: Term) -> object:
+    # connectives can be nested arbitrarily deep, so only the atoms between them
+    # are compared by value, and nested connectives by identity
+    if isinstance(term, FunctionApplication) and term.function.value in _BOOLEAN:
+        return id(term)
+    return term
+
+
+def _simplify_connective(
+    function: Identifier, terms: Sequence[Term], identity: Term, absorbing: Term
+) -> Term:
+    # duplicates are removed, and a term together with its negation is absorbing
+    unique: Dict[object, Term] = {}
+    for term in _flatten(function, terms):
+        if term == absorbing:
+            return absorbing
+        if term != identity:
+            unique.setdefault(_dedupe_key(term), term)
+    for term in unique.values():
+        if _is_application(term, "not"):
+            assert isinstance(term, FunctionApplication)
+            if _dedupe_key(term.terms[0]) in unique:
+                return absorbing
+    if not unique:
+        return identity
+    return _apply(function, list(unique.values()))
+
+
+def _simplify_and(function: Identifier, terms: Sequence[Term]) -> Term:
+    return _simplify_connective(function, terms, TRUE, FALSE)
+
+
+def _simplify_or(function: Identifier, terms: Sequence[Term]) -> Term:
+    return _simplify_connective(function, terms, FALSE, TRUE)
+
+
+def _simplify_not(function: Identifier, terms: Sequence[Term]) -> Term:
+    (term,) = terms
+    if term == TRUE:
+        return FALSE
+    if term == FALSE:
+        return TRUE
+    if _is_application(term, "not"):
+        assert isinstance(term, FunctionApplication)
+        return term.terms[0]
+    return FunctionApplication(function, term)
+
+
+def _simplify_implies(function: Identifier, terms: Sequence[Term]) -> Term:
+    *premises, conclusion = terms
+    if conclusion == TRUE or FALSE in premises:
+        return TRUE
+    premises = [premise for premise in premises if premise != TRUE]
+    if not premises:
+        return conclusion
+    return FunctionApplication(function, *premises, conclusion)
+
+
+def _simplify_ite(function: Identifier, terms: Sequence[Term]) -> Term:
+    condition, then_term, else_term = terms
+    if condition == TRUE or then_term == else_term:
+        return then_term
+    if condition == FALSE:
+        return else_term
+    return FunctionApplication(function, *terms)
+
+
+_SIMPLIFIERS: Dict[str, Callable[[Identifier, Sequence[Term]], Term]] = {
+    "+": _simplify_add,
+    "-": _simplify_sub,
+    "*": _simplify_mul,
+    "/": _simplify_div,
+    "and": _simplify_and,
+    "or": _simplify_or,
+    "not": _simplify_not,
+    "=>": _simplify_implies,
+    "ite": _simplify_ite,
+    **{name: _simplify_comparison for name in _COMPARISONS},
+}
+
+
+class SimplifyTransformer(AstNodeTransformer):
+    """Simplifies an AST before it is compiled.
+
+    Constant arithmetic and comparisons are folded, nested ``and``, ``or``,
+    ``+``, and ``*`` are flattened, identity elements (such as ``(+ x 0.0)``)
+    and double negations are removed, and duplicate or complementary terms of
+    ``and`` and ``or`` are simplified. Assertions that simplify to ``true``
+    are dropped. The result is a new AST with the same meaning.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._identifiers: Dict[str, Identifier] = CORE_IDS.copy()
+
+    def transform_Assert(self, term: Term) -> Union[Assert, object]:
+        if term == TRUE:
+            return Discard
+        return Assert(term)
+
+    def transform_Constant(self, value) -> Constant:
+        return Constant(value)
+
+    def transform_DeclareConst(self, symbol: str, sort: str) -> DeclareConst:
+        self._identifiers[symbol] = Identifier(symbol, Sort(sort))
+        return DeclareConst(symbol, sort)
+
+    def transform_FunctionApplication(self, function: Identifier, *terms: Term) -> Term:
+        simplify = _SIMPLIFIERS.get(function.value)
+        if simplify is None:
+            return FunctionApplication(function, *terms)
+        return simplify(function, terms)
+
+    def transform_Identifier(self, value: str) -> Identifier:
+        identifier = self._identifiers.get(value)
+        if identifier is None:
+            identifier = self._identifiers[value] = Identifier(value, _UNKNOWN_SORT)
+        return identifier
+
+    def transform_Script(self, *commands: Command) -> Script:
+        return Script(*commands)
+
+
+def simplify(node: AstNode) -> AstNode:
+    """Simplify a script, command, or term with :class:`SimplifyTransformer`.
+
+    An assertion that simplifies to ``true`` is returned as ``Assert(true)``.
+    """
+    result = SimplifyTransformer().transform(node)
+    if result is Discard:
+        return Assert(TRUE)
+    return result
+
+
+__all__ = ["SimplifyTransformer", "simplify"]
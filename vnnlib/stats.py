@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .tokenizer import Token
+
+StatsCallback = Callable[[str, "ParseStats"], None]
+
+
+class ParseStats:
+    """Statistics collected while parsing and transforming a spec.
+
+    A ``ParseStats`` object can be passed as the ``stats`` argument of
+    :func:`vnnlib.parser.parse_file`, :meth:`vnnlib.parser.VnnLibParser.parse`,
+    and :class:`vnnlib.compat.CompatTransformer`. Nothing is collected when
+    ``stats`` is not given, so the hot loops of the tokenizer, parser and
+    transformer are unchanged.
+
+    Phases are timed with :meth:`phase` and can nest, for instance the
+    ``result`` phase that builds the compat output is part of the
+    ``transform`` phase when a whole script is transformed at once.
+
+    If ``callback`` is given, it is called with the name of each phase and the
+    stats object after the phase finishes, so that the numbers can be forwarded
+    to an external metrics system.
+    """
+
+    __slots__ = (
+        "bytes_read",
+        "decompression_time",
+        "token_counts",
+        "num_nodes",
+        "max_depth",
+        "declared_symbols",
+        "disjuncts_before_dedupe",
+        "disjuncts_after_dedupe",
+        "phase_times",
+        "callback",
+    )
+
+    def __init__(self, callback: Optional[StatsCallback] = None) -> None:
+        self.bytes_read = 0
+        self.decompression_time = 0.0
+        self.token_counts: Dict[str, int] = {}
+        self.num_nodes = 0
+        self.max_depth = 0
+        self.declared_symbols: List[str] = []
+        self.disjuncts_before_dedupe = 0
+        self.disjuncts_after_dedupe = 0
+        self.phase_times: Dict[str, float] = {}
+        self.callback = callback
+
+    @property
+    def num_tokens(self) -> int:
+        return sum(self.token_counts.values())
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase, adding to the time of previous phases with the same name."""
+        start_t = time.perf_counter()
+        try:
+            yield
+        finally:
+            end_t = time.perf_counter()
+            self.phase_times[name] = self.phase_times.get(name, 0.0) + end_t - start_t
+        if self.callback is not None:
+            self.callback(name, self)
+
+    def count_tokens(self, token_stream: Iterator[Token]) -> Iterator[Token]:
+        """Wrap a token stream, counting tokens by type and the nesting depth."""
+        token_counts = self.token_counts
+        depth = 0
+        max_depth = self.max_depth
+        for token in token_stream:
+            token_type = token[0]
+            token_counts[token_type] = token_counts.get(token_type, 0) + 1
+            if token_type == "LPAREN":
+                depth += 1
+                if depth > max_depth:
+                    max_depth = depth
+                    self.max_depth = max_depth
+            elif token_type == "RPAREN":
+                depth -= 1
+            yield token
+
+    def count_nodes(self, node: Any) -> None:
+        """Count the nodes of an AST and record the symbols it declares."""
+        # imported here, since the parser imports this module
+        from .parser import Assert, DeclareConst, FunctionApplication, Script
+
+        num_nodes = 0
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            num_nodes += 1
+            if isinstance(current, FunctionApplication):
+                stack.extend(reversed(current.terms))
+                stack.append(current.function)
+            elif isinstance(current, Assert):
+                stack.append(current.term)
+            elif isinstance(current, DeclareConst):
+                self.declared_symbols.append(current.symbol)
+            elif isinstance(current, Script):
+                stack.extend(reversed(current.commands))
+        self.num_nodes += num_nodes
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "bytes_read": self.bytes_read,
+            "decompression_time": self.decompression_time,
+            "num_tokens": self.num_tokens,
+            "token_counts": dict(self.token_counts),
+            "num_nodes": self.num_nodes,
+            "max_depth": self.max_depth,
+            "num_declared_symbols": len(self.declared_symbols),
+            "disjuncts_before_dedupe": self.disjuncts_before_dedupe,
+            "disjuncts_after_dedupe": self.disjuncts_after_dedupe,
+            "phase_times": dict(self.phase_times),
+        }
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={value!r}" for name, value in self.as_dict().items()
+        )
+        return f"ParseStats({fields})"
+
+
+__all__ = ["ParseStats"]
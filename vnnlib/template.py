@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .compat import CompatTransformer
+from .parser import (
+    Assert,
+    AstNode,
+    Constant,
+    FunctionApplication,
+    Real,
+    Script,
+    VnnLibParser,
+    _read_text,
+)
+
+CompatResult = List[Tuple[List[List[Real]], List[Tuple[np.ndarray, np.ndarray]]]]
+
+# candidate numeric literals, including the negative literals that are parsed
+# from symbols, which are checked by converting them to numbers
+_LITERAL = re.compile(
+    r"(?<=[\s()])(?:#x[0-9a-fA-F]+|#b[01]+|-?[0-9][0-9.eE+-]*)(?![^\s()])"
+)
+_COMMENT = re.compile(r";[^\n\r]*")
+
+Literal = Union[int, Real]
+
+
+def _convert_literals(literals: List[str]) -> Optional[Tuple[str, List[Literal]]]:
+    kinds = []
+    values: List[Literal] = []
+    try:
+        for literal in literals:
+            c = literal[0]
+            if c == "#":
+                kinds.append(literal[1])
+                values.append(int(literal[2:], 16 if literal[1] == "x" else 2))
+            elif c == "-":
+                kinds.append("n")
+                values.append(Real(literal))
+            elif literal.isdigit():
+                kinds.append("i")
+                values.append(int(literal))
+            else:
+                # exponents are kept apart, since they are invalid in strict mode
+                kinds.append("e" if "e" in literal or "E" in literal else "d")
+                values.append(Real(literal))
+    except ValueError:
+        return None
+    return "".join(kinds), values
+
+
+def scan_literals(text: str) -> Optional[Tuple[bytes, str, List[Literal]]]:
+    """Compute the structural fingerprint of a spec, and its numeric literals.
+
+    The fingerprint is a digest of the spec with comments removed, whitespace
+    collapsed, and each numeric literal replaced by its kind, so two specs have
+    the same fingerprint if they differ only in the values of their literals.
+
+    Returns the fingerprint, the kinds of the literals as a string, and their
+    values in the order they appear, or ``None`` for specs with string literals
+    or quoted symbols, or with something that looks like a literal but is not.
+    """
+    if '"' in text or "|" in text:
+        return None
+    literals: List[str] = []
+
+    def replace(match: re.Match) -> str:
+        literals.append(match.group())
+        return "#"
+
+    skeleton = _LITERAL.sub(replace, _COMMENT.sub("", text))
+    converted = _convert_literals(literals)
+    if converted is None:
+        return None
+    kinds, values = converted
+    digest = hashlib.blake2b(" ".join(skeleton.split()).encode(), digest_size=16)
+    # negative literals are parsed to the same constants as positive decimals
+    digest.update(kinds.replace("n", "d").encode())
+    return digest.digest(), kinds, values
+
+
+def _constant_values(node: AstNode) -> List[Any]:
+    # the values of all constants, in the order they appear in the source
+    values = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, Constant):
+            values.append(current.value)
+        elif isinstance(current, FunctionApplication):
+            stack.extend(reversed(current.terms))
+        elif isinstance(current, Assert):
+            stack.append(current.term)
+        elif isinstance(current, Script):
+            stack.extend(reversed(current.commands))
+    return values
+
+
+class _TemplateTransformer(CompatTransformer):
+    """A compat transformer that takes the values of constants from a list.
+
+    Constants are transformed in the order they appear in the source, so the
+    i-th numeric constant of the template takes the i-th scanned literal.
+    """
+
+    def __init__(self, values: List[Literal], *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Iterator[Literal] = iter(values)
+
+    def transform_Constant(self, value) -> Dict[Tuple[int, ...], Real]:
+        return super().transform_Constant(next(self._values))
+
+
+class TemplateCache:
+    """Compiles specs to the compat format, reusing the parse of identical structures.
+
+    Specs in a VNN-COMP benchmark usually differ only in their numeric
+    literals, such as the epsilon of the input box. The first spec with a given
+    structure is parsed in full, and its AST is cached as a template under the
+    fingerprint from :func:`scan_literals`. Later specs with the same
+    fingerprint are not tokenized or parsed: their literals are scanned with
+    a regular expression and substituted into the template as it is
+    transformed. Specs that differ in structure, for instance in the target
+    class of a robustness property, are cached as separate templates.
+
+    The compat output itself is built for each spec, since how literals
+    combine into box bounds depends on their values.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._templates: OrderedDict[Tuple[bool, bytes], Script] = OrderedDict()
+
+    def compile(
+        self,
+        text: str,
+        input_name: str = "X",
+        output_name: str = "Y",
+        input_size: Optional[int] = None,
+        output_size: Optional[int] = None,
+        strict=True,
+    ) -> CompatResult:
+        scan = scan_literals(text)
+        if scan is not None:
+            digest, literal_kinds, values = scan
+            key = (strict, digest)
+            template = self._templates.get(key)
+            if template is not None:
+                self.hits += 1
+                self._templates.move_to_end(key)
+                if "n" in literal_kinds:
+                    # as the parser would warn about negative literals
+                    warnings.warn("literal negation does not strictly follow SMT-LIB")
+                return _TemplateTransformer(
+                    values, input_name, output_name, input_size, output_size
+                ).transform(template)
+        self.misses += 1
+        ast_node = VnnLibParser.parse(text, strict=strict)
+        # the template is only cached if the scan found the same literals as the
+        # parser, so that values are always substituted into the right places
+        if scan is not None and _constant_values(ast_node) == scan[2]:
+            self._templates[(strict, scan[0])] = ast_node
+            if len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+        return CompatTransformer(
+            input_name, output_name, input_size, output_size
+        ).transform(ast_node)
+
+    def read_vnnlib_simple(
+        self, vnnlib_filename: Union[str, Path], num_inputs: int, num_outputs: int
+    ) -> CompatResult:
+        """Read a spec like :func:`vnnlib.compat.read_vnnlib_simple`, using the cache."""
+        text = _read_text(Path(vnnlib_filename), None)
+        return self.compile(text, "X", "Y", num_inputs, num_outputs, strict=False)
+
+    def clear(self) -> None:
+        self._templates.clear()
+
+
+__all__ = ["TemplateCache", "scan_literals"]
@@ -1,6 +1,18 @@
 from __future__ import annotations
 
-from typing import Set, Type, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from .parser import (
     Assert,
@@ -29,50 +41,136 @@ def get_subclasses(cls: Type[T]) -> Set[Type[T]]:
     return set(c)
 
 
-class AstNodeTransformer:
-    def __init__(self) -> None:
-        self._visitor_table = {
-            node_class: getattr(self, f"_visit_{node_class.__name__}")
-            for node_class in get_subclasses(AstNode)
-            if hasattr(self, f"_visit_{node_class.__name__}")
-        }
-        self._transform_table = {
-            node_class: getattr(self, f"transform_{node_class.__name__}")
-            for node_class in get_subclasses(AstNode)
-            if hasattr(self, f"transform_{node_class.__name__}")
-        }
+# node kinds handled by the traversal engine
+_SCRIPT: Final = 0
+_ASSERT: Final = 1
+_DECLARE_CONST: Final = 2
+_FUNCTION_APPLICATION: Final = 3
+_CONSTANT: Final = 4
+_IDENTIFIER: Final = 5
 
-    def transform(self, node: AstNode):
-        args = self._visitor_table[node.__class__](node)
-        if node.__class__ in self._transform_table:
-            return self._transform_table[node.__class__](*args)
-        return args
+_NODE_KINDS: Dict[type, int] = {
+    Script: _SCRIPT,
+    Assert: _ASSERT,
+    DeclareConst: _DECLARE_CONST,
+    FunctionApplication: _FUNCTION_APPLICATION,
+    Constant: _CONSTANT,
+    Identifier: _IDENTIFIER,
+}
 
-    def _visit_Assert(self, node: Assert):
-        result = self.transform(node.term)
-        return (result,)
 
-    def _visit_Constant(self, node: Constant):
-        return (node.value,)
+class AstNodeTransformer:
+    """Transforms an AST bottom-up by calling ``transform_<NodeClass>`` methods.
+
+    Each ``transform_<NodeClass>`` method receives the transformed children of a
+    node (or the node's fields for leaf nodes) as positional arguments. Nodes
+    without a matching method are transformed into their argument tuple.
+
+    The dispatch table is built once per transformer class, and the traversal
+    uses an explicit stack, so arbitrarily deep ASTs can be transformed without
+    reaching the recursion limit.
+    """
 
-    def _visit_DeclareConst(self, node: DeclareConst):
-        return (node.symbol, node.sort)
+    _dispatch_table: Dict[type, Tuple[int, Optional[Callable[..., Any]]]] = {}
 
-    def _visit_FunctionApplication(self, node: FunctionApplication):
-        function = self.transform(node.function)
-        terms = [self.transform(term) for term in node.terms]
-        return (function, *terms)
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._build_dispatch_table()
 
-    def _visit_Identifier(self, node: Identifier):
-        return (node.value,)
+    @classmethod
+    def _build_dispatch_table(cls) -> None:
+        cls._dispatch_table = {
+            node_class: (kind, getattr(cls, f"transform_{node_class.__name__}", None))
+            for node_class, kind in _NODE_KINDS.items()
+        }
 
-    def _visit_Script(self, node: Script):
-        results = []
-        for command in node.commands:
-            result = self.transform(command)
-            if result is not Discard:
-                results.append(result)
-        return results
+    def __init__(self) -> None:
+        pass
 
+    def transform(self, node: AstNode):
+        dispatch_table = self._dispatch_table
+
+        # Nodes are visited in post-order. Leaf children are transformed in place,
+        # while interior children suspend their parent on an explicit stack of
+        # (kind, transform function, children, next child index, results) frames.
+        frames: List[Tuple[int, Any, Sequence[Any], int, List[Any]]] = []
+        kind, transform_func = dispatch_table[node.__class__]
+        current: Any = node
+        while True:
+            results: List[Any] = []
+            if kind == _FUNCTION_APPLICATION:
+                function = current.function
+                function_transform = dispatch_table[function.__class__][1]
+                if function_transform is None:
+                    results.append((function.value,))
+                else:
+                    results.append(function_transform(self, function.value))
+                children: Sequence[Any] = current.terms
+            elif kind == _ASSERT:
+                children = (current.term,)
+            elif kind == _SCRIPT:
+                children = current.commands
+            else:
+                children = ()
+            index = 0
+            while True:
+                num_children = len(children)
+                while index < num_children:
+                    child = children[index]
+                    index += 1
+                    child_kind, child_transform = dispatch_table[child.__class__]
+                    if child_kind == _CONSTANT or child_kind == _IDENTIFIER:
+                        if child_transform is None:
+                            results.append((child.value,))
+                        else:
+                            results.append(child_transform(self, child.value))
+                    elif child_kind == _DECLARE_CONST:
+                        if child_transform is None:
+                            results.append((child.symbol, child.sort))
+                        else:
+                            results.append(
+                                child_transform(self, child.symbol, child.sort)
+                            )
+                    else:
+                        frames.append((kind, transform_func, children, index, results))
+                        kind, transform_func, current = (
+                            child_kind,
+                            child_transform,
+                            child,
+                        )
+                        break
+                else:
+                    if kind == _CONSTANT or kind == _IDENTIFIER:
+                        result: Any = (
+                            (current.value,)
+                            if transform_func is None
+                            else transform_func(self, current.value)
+                        )
+                    elif kind == _DECLARE_CONST:
+                        result = (
+                            (current.symbol, current.sort)
+                            if transform_func is None
+                            else transform_func(self, current.symbol, current.sort)
+                        )
+                    elif kind == _SCRIPT:
+                        results = [r for r in results if r is not Discard]
+                        result = (
+                            results
+                            if transform_func is None
+                            else transform_func(self, *results)
+                        )
+                    elif transform_func is None:
+                        result = tuple(results)
+                    else:
+                        result = transform_func(self, *results)
+                    if not frames:
+                        return result
+                    kind, transform_func, children, index, results = frames.pop()
+                    results.append(result)
+                    continue
+                break
+
+
+AstNodeTransformer._build_dispatch_table()
 
 __all__ = ["AstNodeTransformer"]
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import io
+import math
+from typing import Any, List, TextIO
+
+import numpy as np
+
+from .parser import (
+    CORE_IDS,
+    Assert,
+    AstNode,
+    Constant,
+    DeclareConst,
+    FunctionApplication,
+    Identifier,
+    Script,
+)
+
+_SYMBOL_START = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ~!@$%^&*+=<>.?/_-"
+)
+_SYMBOL_CHARS = _SYMBOL_START | frozenset("0123456789")
+
+
+class _Marker:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+_START = _Marker("start")
+_OPEN = _Marker("open")
+_CLOSE = _Marker("close")
+_END = _Marker("end")
+_ATOM = _Marker("atom")
+
+_MINUS = CORE_IDS["-"]
+
+
+def format_symbol(symbol: str) -> str:
+    if symbol and symbol[0] in _SYMBOL_START and _SYMBOL_CHARS.issuperset(symbol):
+        return symbol
+    if "|" in symbol or "\\" in symbol:
+        raise ValueError(f"symbol cannot be written in VNN-LIB: {symbol!r}")
+    return f"|{symbol}|"
+
+
+def _is_negative(value: Any) -> bool:
+    if isinstance(value, float):
+        return math.copysign(1.0, value) < 0
+    return isinstance(value, int) and value < 0
+
+
+def format_constant(value: Any) -> str:
+    """Format a constant value as a canonical VNN-LIB literal.
+
+    Integers are written as numerals and reals as decimals in positional
+    notation, using the shortest digits that read back as the same value.
+    Negative numbers are formatted with a leading ``-``, which only
+    non-strict parsing accepts, so the writer writes negative constants as
+    ``(- x)`` unless it is not strict.
+    """
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    if isinstance(value, int):
+        return str(value)
+    if not math.isfinite(value):
+        raise ValueError(f"value cannot be written in VNN-LIB: {value!r}")
+    return np.format_float_positional(value, unique=True, trim="0")
+
+
+class VnnLibWriter:
+    """Writes an AST to a text file object as VNN-LIB, in chunks.
+
+    By default, each command is written on its own line. In minified mode,
+    all whitespace that is not required to separate tokens is removed.
+    Negative constants are written as ``(- x)`` in strict mode, and as
+    literals such as ``-0.5`` otherwise, so that a spec parsed with
+    ``strict=False`` is written back as text that parses to the same AST.
+    """
+
+    def __init__(
+        self,
+        file: TextIO,
+        minify: bool = False,
+        chunk_size: int = 8192,
+        strict: bool = True,
+    ):
+        self.file = file
+        self.minify = minify
+        self.chunk_size = chunk_size
+        self.strict = strict
+
+    def write(self, node: AstNode) -> None:
+        pretty = not self.minify
+        strict = self.strict
+        buffer: List[str] = []
+        # the kind of the previously written token, which determines whether
+        # whitespace is needed before the next one
+        previous = _START
+
+        stack: List[Any] = [node]
+        while stack:
+            item = stack.pop()
+            if item is _CLOSE:
+                buffer.append(")")
+                previous = _CLOSE
+                continue
+            if item is _END:
+                if pretty:
+                    buffer.append("\n")
+                previous = _START
+                continue
+            if isinstance(item, FunctionApplication):
+                tokens: List[Any] = [_OPEN, item.function, *item.terms, _CLOSE]
+            elif isinstance(item, (Identifier, Constant)):
+                tokens = [item]
+            elif isinstance(item, Assert):
+                tokens = [_OPEN, "assert", item.term, _CLOSE, _END]
+            elif isinstance(item, DeclareConst):
+                tokens = [
+                    _OPEN,
+                    "declare-const",
+                    format_symbol(item.symbol),
+                    format_symbol(item.sort),
+                    _CLOSE,
+                    _END,
+                ]
+            elif isinstance(item, Script):
+                stack.extend(reversed(item.commands))
+                continue
+            else:
+                raise TypeError(f"unexpected AST node: {item!r}")
+            for i, token in enumerate(tokens):
+                if token is _OPEN:
+                    if pretty and previous is not _OPEN and previous is not _START:
+                        buffer.append(" ")
+                    buffer.append("(")
+                    previous = _OPEN
+                    continue
+                if isinstance(token, Identifier):
+                    token = format_symbol(token.value)
+                elif isinstance(token, Constant):
+                    value = token.value
+                    if strict and not isinstance(value, str) and _is_negative(value):
+                        # SMT-LIB has no negative literals, so write (- x)
+                        negated = FunctionApplication(_MINUS, Constant(-value))
+                        stack.extend(reversed([negated, *tokens[i + 1 :]]))
+                        break
+                    token = format_constant(token.value)
+                elif not isinstance(token, str):
+                    # a nested command or term, finish writing it before the rest
+                    stack.extend(reversed(tokens[i:]))
+                    break
+                if previous is _ATOM or (pretty and previous is _CLOSE):
+                    buffer.append(" ")
+                buffer.append(token)
+                previous = _ATOM
+            if len(buffer) >= self.chunk_size:
+                self.file.write("".join(buffer))
+                buffer.clear()
+        self.file.write("".join(buffer))
+
+
+def dump(
+    node: AstNode, file: TextIO, minify: bool = False, strict: bool = True
+) -> None:
+    """Write an AST to a text file object as VNN-LIB."""
+    VnnLibWriter(file, minify=minify, strict=strict).write(node)
+
+
+def dumps(node: AstNode, minify: bool = False, strict: bool = True) -> str:
+    """Write an AST to a VNN-LIB string."""
+    file = io.StringIO()
+    dump(node, file, minify=minify, strict=strict)
+    return file.getvalue()
+
+
+__all__ = ["VnnLibWriter", "dump", "dumps", "format_constant", "format_symbol"]